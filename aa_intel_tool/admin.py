@@ -2,6 +2,9 @@
 Django admin integration
 """
 
+# Standard Library
+import json
+
 # Django
 from django.contrib import admin
 from django.utils import html, safestring
@@ -70,7 +73,7 @@ class ScanAdmin(BaseReadOnlyAdminMixin, admin.ModelAdmin):
     """
 
     list_display = ("hash", "scan_type", "created")
-    fields = ("_scan_type", "_raw_data")
+    fields = ("_scan_type", "_raw_data", "_parse_stats")
 
     ordering = ("-created",)
 
@@ -107,3 +110,19 @@ class ScanAdmin(BaseReadOnlyAdminMixin, admin.ModelAdmin):
         """
 
         return html.format_html("<pre>{}</pre>", obj.raw_data)
+
+    @admin.display(description=_("Parse statistics"))
+    def _parse_stats(self, obj) -> str:
+        """
+        Format the parse statistics, if they were stored with the scan
+
+        :param obj: The Scan object being displayed in the admin interface
+        :type obj: Scan
+        :return: A string containing the parse statistics as indented JSON within HTML <pre> tags, or a dash if none were stored
+        :rtype: str
+        """
+
+        if obj.parse_stats is None:
+            return "-"
+
+        return html.format_html("<pre>{}</pre>", json.dumps(obj.parse_stats, indent=4))
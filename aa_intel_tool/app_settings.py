@@ -151,6 +151,15 @@ class AppSettings:
         name="INTELTOOL_SCAN_RETENTION_TIME", default_value=30, required_type=int
     )
 
+    # Number of scans removed per batch (and transaction) by the housekeeping task
+    INTELTOOL_HOUSEKEEPING_BATCH_SIZE = _clean_setting(
+        name="INTELTOOL_HOUSEKEEPING_BATCH_SIZE",
+        default_value=1000,
+        min_value=1,
+        max_value=50000,
+        required_type=int,
+    )
+
     # Set the maximum number of pilots allowed per chat scan
     # Set to 0 for no limit.
     INTELTOOL_CHATSCAN_MAX_PILOTS = _clean_setting(
@@ -164,6 +173,108 @@ class AppSettings:
         name="INTELTOOL_DSCAN_GRID_SIZE", default_value=10000, required_type=int
     )
 
+    # Share the SDE type index between workers through Django's cache.
+    # Enabled by default
+    INTELTOOL_SDE_CACHE_USE_DJANGO_CACHE = _clean_setting(
+        name="INTELTOOL_SDE_CACHE_USE_DJANGO_CACHE",
+        default_value=True,
+        required_type=bool,
+    )
+
+    # Maximum number of concurrent ESI requests when fetching corporation and
+    # alliance details for new characters (chat scan and fleet composition)
+    INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS = _clean_setting(
+        name="INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS",
+        default_value=10,
+        min_value=1,
+        max_value=50,
+        required_type=int,
+    )
+
+    # Maximum number of corporations and alliances each worker keeps in memory.
+    # Set to 0 to only use Django's cache.
+    INTELTOOL_AFFILIATION_CACHE_MAX_SIZE = _clean_setting(
+        name="INTELTOOL_AFFILIATION_CACHE_MAX_SIZE",
+        default_value=10000,
+        required_type=int,
+    )
+
+    # Time in seconds for how long corporation and alliance details are cached
+    INTELTOOL_AFFILIATION_CACHE_TTL = _clean_setting(
+        name="INTELTOOL_AFFILIATION_CACHE_TTL",
+        default_value=86400,
+        min_value=60,
+        required_type=int,
+    )
+
+    # Time in seconds for how long names ESI couldn't resolve are skipped.
+    # Set to 0 to disable.
+    INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL = _clean_setting(
+        name="INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL",
+        default_value=900,
+        max_value=86400,
+        required_type=int,
+    )
+
+    # Compress the raw data and the processed sections of new scans in the database.
+    # Disabled by default
+    INTELTOOL_COMPRESS_SCAN_DATA = _clean_setting(
+        name="INTELTOOL_COMPRESS_SCAN_DATA",
+        default_value=False,
+        required_type=bool,
+    )
+
+    # Time in seconds in which pasting the same intel again returns the existing scan,
+    # instead of parsing it again. Disabled (0) by default.
+    INTELTOOL_DEDUPLICATION_WINDOW = _clean_setting(
+        name="INTELTOOL_DEDUPLICATION_WINDOW",
+        default_value=0,
+        max_value=3600,
+        required_type=int,
+    )
+
+    # Parse intel in a Celery task, instead of during the request. The scan page is
+    # shown right away and loads the results, once they are ready.
+    INTELTOOL_ASYNC_PARSING = _clean_setting(
+        name="INTELTOOL_ASYNC_PARSING",
+        default_value=False,
+        required_type=bool,
+    )
+
+    # Store the time and queries of each parse stage with the scan (always logged at
+    # debug level), to see where the time goes on real pastes
+    INTELTOOL_STORE_PARSE_STATS = _clean_setting(
+        name="INTELTOOL_STORE_PARSE_STATS",
+        default_value=False,
+        required_type=bool,
+    )
+
+    # Record metrics (scans parsed, parse latency, ESI requests, cache hits, …) in
+    # Django's cache and expose them in the Prometheus text format
+    INTELTOOL_METRICS_ENABLED = _clean_setting(
+        name="INTELTOOL_METRICS_ENABLED",
+        default_value=False,
+        required_type=bool,
+    )
+
+    # Bearer token the metrics endpoint requires. The metrics are not available
+    # without one, even when enabled.
+    INTELTOOL_METRICS_TOKEN = _clean_setting(
+        name="INTELTOOL_METRICS_TOKEN",
+        default_value="",
+        required_type=str,
+    )
+
+    # Time in hours in which characters must have been seen in a scan (chat list or
+    # fleet composition) for their affiliation to be refreshed by the
+    # refresh_affiliations task. Set to 0 to disable.
+    INTELTOOL_AFFILIATION_REFRESH_WINDOW = _clean_setting(
+        name="INTELTOOL_AFFILIATION_REFRESH_WINDOW",
+        default_value=24,
+        max_value=720,
+        required_type=int,
+    )
+
 
 class EVECategory(IntEnum):
     """
@@ -64,8 +64,11 @@ def register_urls():
         namespace="aa_intel_tool",
         base_url=r"^intel/",
         excluded_views=[
+            "aa_intel_tool.views.ajax.get_all_scan_data",
             "aa_intel_tool.views.ajax.get_scan_data",
+            "aa_intel_tool.views.ajax.get_scan_status",
             "aa_intel_tool.views.general.index",
             "aa_intel_tool.views.general.scan",
+            "aa_intel_tool.views.metrics.metrics",
         ],
     )
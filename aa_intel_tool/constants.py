@@ -45,7 +45,18 @@ class RegexPattern(Enum):
 
     CHATLIST = re.compile(pattern=r"(?im)^[a-zA-Z0-9\u0080-\uFFFF -_]{3,37}$")
     DSCAN = re.compile(
-        pattern=rf"(?im)^(\d+)[\t](.*)[\t](.*)[\t](-|(.*) ({DISTANCE_UNITS}))$",
+        pattern=rf"""(?im)
+            ^(?P<id>\d+)
+            \t(?P<name>.*)
+            \t(?P<type>.*)
+            \t(?:
+                -
+                |(?P<value>.*?)\s*(?:
+                    (?P<on_grid_unit>{DistanceUnits.ON_GRID.value})
+                    |(?P<off_grid_unit>{DistanceUnits.OFF_GRID.value})
+                )
+            )$
+        """,
         flags=re.VERBOSE,
     )
     FLEETCOMP = re.compile(
@@ -64,18 +75,21 @@ SUPPORTED_INTEL_TYPES = {
     "chatlist": {
         "name": _("Chat list"),
         "parser": aa_intel_tool.parser.module.chatlist.parse,
+        "structure_check": aa_intel_tool.parser.module.chatlist.has_line_structure,
         "pattern": RegexPattern.CHATLIST.value,
         "template": "aa_intel_tool/views/scan/chatlist.html",
     },
     "dscan": {
         "name": _("D-Scan"),
         "parser": aa_intel_tool.parser.module.dscan.parse,
+        "structure_check": aa_intel_tool.parser.module.dscan.has_line_structure,
         "pattern": RegexPattern.DSCAN.value,
         "template": "aa_intel_tool/views/scan/dscan.html",
     },
     "fleetcomp": {
         "name": _("Fleet composition"),
         "parser": aa_intel_tool.parser.module.fleetcomp.parse,
+        "structure_check": aa_intel_tool.parser.module.fleetcomp.has_line_structure,
         "pattern": RegexPattern.FLEETCOMP.value,
         "template": "aa_intel_tool/views/scan/fleetcomp.html",
     },
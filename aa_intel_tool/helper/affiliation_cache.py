@@ -0,0 +1,240 @@
+"""
+Bounded, TTL-based cache for corporation and alliance details
+"""
+
+# Standard Library
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+# Django
+from django.core.cache import cache
+
+# AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings
+from aa_intel_tool.helper.metrics import increment_cache_value
+
+# Prefix for all affiliation cache keys in Django's cache
+AFFILIATION_CACHE_KEY_PREFIX = "aa_intel_tool:affiliation_cache"
+
+
+class AffiliationInfo(NamedTuple):
+    """
+    Corporation or alliance details
+    """
+
+    name: str
+    ticker: str
+
+
+class AffiliationCache:
+    """
+    Two-level cache for corporation or alliance details
+
+    The first level is a process-local LRU cache, bounded by
+    INTELTOOL_AFFILIATION_CACHE_MAX_SIZE entries. The second level is Django's cache,
+    which is shared between all workers. Entries in both levels expire after
+    INTELTOOL_AFFILIATION_CACHE_TTL seconds.
+
+    With INTELTOOL_METRICS_ENABLED, hits and misses are counted in Django's cache, so
+    they are aggregated over all workers. See `stats()`.
+    """
+
+    def __init__(self, entity_type: str):
+        """
+        Initialize the cache
+
+        :param entity_type: The type of the cached entities (e.g. "corporation")
+        :type entity_type: str
+        """
+
+        self.entity_type = entity_type
+        self._entries: OrderedDict[int, tuple[float, AffiliationInfo]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_key(self, key: int | str) -> str:
+        """
+        Get the key in Django's cache
+
+        :param key: Entity ID or counter name
+        :type key: int | str
+        :return: The key in Django's cache
+        :rtype: str
+        """
+
+        return f"{AFFILIATION_CACHE_KEY_PREFIX}:{self.entity_type}:{key}"
+
+    def _increment(self, counter: str, delta: int) -> None:
+        """
+        Increment a counter in Django's cache, when metrics are enabled
+
+        :param counter: Name of the counter
+        :type counter: str
+        :param delta: Amount to increment the counter by
+        :type delta: int
+        :return: None
+        :rtype: None
+        """
+
+        if not AppSettings.INTELTOOL_METRICS_ENABLED or not delta:
+            return
+
+        increment_cache_value(cache_key=self._cache_key(key=counter), delta=delta)
+
+    def _store_locally(self, entity_id: int, expires: float, info: AffiliationInfo):
+        """
+        Store an entry in the process-local LRU cache
+
+        Must be called with the lock held.
+
+        :param entity_id: Entity ID
+        :type entity_id: int
+        :param expires: Expiry timestamp
+        :type expires: float
+        :param info: Corporation or alliance details
+        :type info: AffiliationInfo
+        :return: None
+        :rtype: None
+        """
+
+        max_size = AppSettings.INTELTOOL_AFFILIATION_CACHE_MAX_SIZE
+
+        if max_size == 0:
+            return
+
+        self._entries[entity_id] = (expires, info)
+        self._entries.move_to_end(entity_id)
+
+        # Evict the least recently used entries
+        while len(self._entries) > max_size:
+            self._entries.popitem(last=False)
+
+    def get_many(self, entity_ids: Iterable[int]) -> dict[int, AffiliationInfo]:
+        """
+        Get the cached details for the given entity IDs
+
+        :param entity_ids: Entity IDs
+        :type entity_ids: Iterable[int]
+        :return: Dictionary of entity ID => details, for all cached entity IDs
+        :rtype: dict[int, AffiliationInfo]
+        """
+
+        entity_ids = set(entity_ids)
+        now = time.time()
+        result = {}
+
+        with self._lock:
+            for entity_id in entity_ids:
+                entry = self._entries.get(entity_id)
+
+                if entry is None:
+                    continue
+
+                if entry[0] <= now:
+                    del self._entries[entity_id]
+
+                    continue
+
+                self._entries.move_to_end(entity_id)
+                result[entity_id] = entry[1]
+
+        missing_ids = entity_ids - result.keys()
+
+        if missing_ids:
+            shared_entries = cache.get_many(
+                keys=[self._cache_key(key=entity_id) for entity_id in missing_ids]
+            )
+
+            with self._lock:
+                for entity_id in missing_ids:
+                    entry = shared_entries.get(self._cache_key(key=entity_id))
+
+                    if entry is None or entry[0] <= now:
+                        continue
+
+                    self._store_locally(
+                        entity_id=entity_id, expires=entry[0], info=entry[1]
+                    )
+                    result[entity_id] = entry[1]
+
+        self._increment(counter="hits", delta=len(result))
+        self._increment(counter="misses", delta=len(entity_ids) - len(result))
+
+        return result
+
+    def get(self, entity_id: int) -> AffiliationInfo | None:
+        """
+        Get the cached details for the given entity ID
+
+        :param entity_id: Entity ID
+        :type entity_id: int
+        :return: The details, or None if not cached
+        :rtype: AffiliationInfo | None
+        """
+
+        return self.get_many(entity_ids=[entity_id]).get(entity_id)
+
+    def set(self, entity_id: int, info: AffiliationInfo) -> None:
+        """
+        Cache the details for the given entity ID
+
+        :param entity_id: Entity ID
+        :type entity_id: int
+        :param info: Corporation or alliance details
+        :type info: AffiliationInfo
+        :return: None
+        :rtype: None
+        """
+
+        ttl = AppSettings.INTELTOOL_AFFILIATION_CACHE_TTL
+        expires = time.time() + ttl
+
+        with self._lock:
+            self._store_locally(entity_id=entity_id, expires=expires, info=info)
+
+        cache.set(
+            key=self._cache_key(key=entity_id), value=(expires, info), timeout=ttl
+        )
+
+    def clear(self) -> None:
+        """
+        Clear the process-local cache and reset the counters
+
+        Entries in Django's cache expire on their own.
+
+        :return: None
+        :rtype: None
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+        cache.delete_many(
+            keys=[self._cache_key(key="hits"), self._cache_key(key="misses")]
+        )
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics
+
+        :return: Dictionary with the number of entries in the process-local cache,
+            its maximum size, and the hits and misses over all workers
+        :rtype: dict
+        """
+
+        counters = cache.get_many(
+            keys=[self._cache_key(key="hits"), self._cache_key(key="misses")]
+        )
+
+        return {
+            "size": len(self._entries),
+            "max_size": AppSettings.INTELTOOL_AFFILIATION_CACHE_MAX_SIZE,
+            "hits": counters.get(self._cache_key(key="hits"), 0),
+            "misses": counters.get(self._cache_key(key="misses"), 0),
+        }
+
+
+corporation_cache = AffiliationCache(entity_type="corporation")
+alliance_cache = AffiliationCache(entity_type="alliance")
@@ -0,0 +1,68 @@
+"""
+Compression of stored scan data
+"""
+
+# Standard Library
+import zlib
+
+# AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings
+
+# Prefix of compressed data. JSON can't start with a NUL byte, and Django's form
+# fields reject NUL characters in the raw data, so uncompressed data is never
+# mistaken for compressed data.
+COMPRESSION_MARKER = b"\x00zlib\x00"
+
+
+def compress(data: bytes) -> bytes:
+    """
+    Compress data with zlib
+
+    :param data: The data to compress
+    :type data: bytes
+    :return: The compressed data with our marker, or the data as it is if compressing doesn't make it smaller
+    :rtype: bytes
+    """
+
+    data = bytes(data)
+
+    if data.startswith(COMPRESSION_MARKER):
+        return data
+
+    compressed = COMPRESSION_MARKER + zlib.compress(data)
+
+    return compressed if len(compressed) < len(data) else data
+
+
+def compress_if_enabled(data: bytes) -> bytes:
+    """
+    Compress data for storage, if enabled with INTELTOOL_COMPRESS_SCAN_DATA
+
+    :param data: The data to compress
+    :type data: bytes
+    :return: The data to store
+    :rtype: bytes
+    """
+
+    if AppSettings.INTELTOOL_COMPRESS_SCAN_DATA:
+        return compress(data=data)
+
+    return bytes(data)
+
+
+def decompress(data: bytes | memoryview) -> bytes:
+    """
+    Decompress stored data, if it is compressed
+
+    :param data: The stored data
+    :type data: bytes | memoryview
+    :return: The uncompressed data
+    :rtype: bytes
+    """
+
+    data = bytes(data)
+
+    if data.startswith(COMPRESSION_MARKER):
+        return zlib.decompress(data[len(COMPRESSION_MARKER) :])
+
+    return data
@@ -3,12 +3,17 @@ Little helper functions to deal with Eve characters
 """
 
 # Standard Library
-from collections.abc import Iterable
+import hashlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any
 
 # Django
-from django.db import transaction
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 
 # Alliance Auth
 from allianceauth.eveonline.models import (
@@ -19,13 +24,240 @@ from allianceauth.eveonline.models import (
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings
+from aa_intel_tool.helper.affiliation_cache import (
+    AffiliationInfo,
+    alliance_cache,
+    corporation_cache,
+)
+from aa_intel_tool.helper.metrics import inc_counter
+from aa_intel_tool.helper.parse_stats import add_parse_count
+from aa_intel_tool.models import CharacterName
 from aa_intel_tool.providers.applogger import AppLogger
 from aa_intel_tool.providers.esi import ESIHandler
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
-temp_corp_data = {}
-temp_alliance_data = {}
+# Prefix for the Django cache keys of names ESI couldn't resolve
+UNRESOLVABLE_NAME_CACHE_KEY_PREFIX = "aa_intel_tool:unresolvable_name"
+
+# ESI's affiliation endpoint accepts up to 1000 IDs per request
+AFFILIATION_BATCH_SIZE = 1000
+
+# ESI caches affiliations for an hour, refreshing them more often is pointless
+AFFILIATION_CACHE_TIME = timedelta(hours=1)
+
+
+def clean_character_name(name: str) -> str:
+    """
+    Clean a pasted character name (strip and collapse whitespace)
+
+    :param name: Character name
+    :type name: str
+    :return: The cleaned character name
+    :rtype: str
+    """
+
+    return " ".join(name.split())
+
+
+def normalize_character_name(name: str) -> str:
+    """
+    Normalize a character name for lookups (strip and collapse whitespace, case fold)
+
+    EVE character names are unique regardless of case, so all variations of a
+    name normalize to the same string.
+
+    :param name: Character name
+    :type name: str
+    :return: The normalized character name
+    :rtype: str
+    """
+
+    return clean_character_name(name=name).casefold()
+
+
+def _unresolvable_name_cache_key(name: str) -> str:
+    """
+    Get the Django cache key for a name ESI couldn't resolve
+
+    The name is normalized (whitespace collapsed, case folded) and hashed, so the
+    key is independent of how the name was pasted and safe for all cache backends.
+
+    :param name: Character name
+    :type name: str
+    :return: The key in Django's cache
+    :rtype: str
+    """
+
+    digest = hashlib.md5(
+        normalize_character_name(name=name).encode(encoding="utf-8"),
+        usedforsecurity=False,
+    ).hexdigest()
+
+    return f"{UNRESOLVABLE_NAME_CACHE_KEY_PREFIX}:{digest}"
+
+
+def _cache_unresolvable_names(
+    names: Iterable[str], resolved_characters: list[dict[str, Any]]
+) -> None:
+    """
+    Remember the names ESI didn't resolve, so they are skipped for a while
+
+    :param names: Names that were sent to ESI
+    :type names: Iterable[str]
+    :param resolved_characters: Character data received from ESI, each containing at least a "name" key
+    :type resolved_characters: list[dict[str, Any]]
+    :return: None
+    :rtype: None
+    """
+
+    ttl = AppSettings.INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL
+
+    if not ttl:
+        return
+
+    resolved_keys = {
+        _unresolvable_name_cache_key(name=character["name"])
+        for character in resolved_characters
+    }
+    unresolvable_keys = {
+        _unresolvable_name_cache_key(name=name) for name in names
+    } - resolved_keys
+
+    if unresolvable_keys:
+        logger.debug(
+            f"{len(unresolvable_keys)} name(s) couldn't be resolved by ESI and "
+            f"will be skipped for {ttl} seconds."
+        )
+
+        cache.set_many(
+            data=dict.fromkeys(unresolvable_keys, True),
+            timeout=ttl,
+        )
+
+
+def _exclude_unresolvable_names(names: Iterable[str]) -> list[str]:
+    """
+    Exclude names ESI recently couldn't resolve
+
+    :param names: Names to check
+    :type names: Iterable[str]
+    :return: Names that are not known to be unresolvable
+    :rtype: list[str]
+    """
+
+    names = list(names)
+
+    if not names or not AppSettings.INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL:
+        return names
+
+    cache_keys = {name: _unresolvable_name_cache_key(name=name) for name in names}
+    unresolvable_keys = cache.get_many(keys=set(cache_keys.values()))
+
+    inc_counter(
+        name="aa_intel_tool_cache_requests_total",
+        value=len(unresolvable_keys),
+        cache="unresolvable_name",
+        result="hit",
+    )
+    inc_counter(
+        name="aa_intel_tool_cache_requests_total",
+        value=len(cache_keys) - len(unresolvable_keys),
+        cache="unresolvable_name",
+        result="miss",
+    )
+
+    if not unresolvable_keys:
+        return names
+
+    resolvable_names = [
+        name for name in names if cache_keys[name] not in unresolvable_keys
+    ]
+
+    logger.debug(
+        f"Skipping {len(names) - len(resolvable_names)} name(s) ESI recently "
+        "couldn't resolve."
+    )
+
+    return resolvable_names
+
+
+def _store_character_names(resolved_characters: list[dict[str, Any]]) -> None:
+    """
+    Remember the character IDs ESI resolved the names to
+
+    :param resolved_characters: Character data received from ESI, each containing at least "id" and "name" keys
+    :type resolved_characters: list[dict[str, Any]]
+    :return: None
+    :rtype: None
+    """
+
+    if not resolved_characters:
+        return
+
+    character_names = {
+        normalize_character_name(name=character["name"]): CharacterName(
+            normalized_name=normalize_character_name(name=character["name"]),
+            name=character["name"],
+            character_id=character["id"],
+        )
+        for character in resolved_characters
+    }
+
+    # MySQL doesn't support (and doesn't need) the unique fields of an upsert
+    CharacterName.objects.bulk_create(
+        objs=character_names.values(),
+        update_conflicts=True,
+        update_fields=["name", "character_id", "updated"],
+        unique_fields=(
+            ["normalized_name"]
+            if connection.features.supports_update_conflicts_with_target
+            else None
+        ),
+    )
+
+
+def _get_stored_character_ids(
+    names: Iterable[str],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Get the character IDs for names ESI already resolved before
+
+    :param names: Names to look up
+    :type names: Iterable[str]
+    :return: Character data for the known names (like ESI returns it, with "id" and "name" keys), and the names that are still unknown
+    :rtype: tuple[list[dict[str, Any]], list[str]]
+    """
+
+    names = list(names)
+
+    if not names:
+        return [], names
+
+    stored_characters = {
+        character_name.normalized_name: character_name
+        for character_name in CharacterName.objects.filter(
+            normalized_name__in={normalize_character_name(name=name) for name in names}
+        )
+    }
+
+    unknown_names = [
+        name
+        for name in names
+        if normalize_character_name(name=name) not in stored_characters
+    ]
+
+    if stored_characters:
+        logger.debug(
+            f"{len(stored_characters)} name(s) resolved from the database, "
+            f"{len(unknown_names)} name(s) need to be resolved by ESI."
+        )
+
+    return [
+        {"id": character_name.character_id, "name": character_name.name}
+        for character_name in stored_characters.values()
+    ], unknown_names
 
 
 def _create_alliance(alliance_ids: Iterable[int]) -> None:
@@ -95,66 +327,136 @@ def _create_corporation(corporation_ids: Iterable[int]) -> None:
             )
 
 
-def _get_corporation_info_from_affiliation(
-    affiliation_data: dict,
-) -> EveCorporationInfo | None:
+def _fetch_corporation_info(corporation_id: int) -> AffiliationInfo | None:
     """
-    Get corporation information from affiliation data
+    Fetch corporation information from ESI and cache it
 
-    :param affiliation_data: Affiliation data containing corporation ID
-    :type affiliation_data: dict
-    :return: EveCorporationInfo object for the corporation ID in the affiliation data, or None if corporation ID is not present
-    :rtype: EveCorporationInfo | None
+    :param corporation_id: Corporation ID
+    :type corporation_id: int
+    :return: AffiliationInfo for the corporation, or None if it couldn't be fetched
+    :rtype: AffiliationInfo | None
     """
 
-    corporation_id = affiliation_data.get("corporation_id")
-
-    if corporation_id in temp_corp_data:
-        logger.debug(
-            f"Corporation information for corporation ID {corporation_id} retrieved from temporary cache."
-        )
-
-        return temp_corp_data[corporation_id]
-
-    corp_info = ESIHandler.get_corporations_corporation_id(
+    esi_corp_info = ESIHandler.get_corporations_corporation_id(
         corporation_id=corporation_id, use_etag=False
     )
-    temp_corp_data[corporation_id] = corp_info
+
+    if esi_corp_info is None:
+        return None
+
+    corp_info = AffiliationInfo(name=esi_corp_info.name, ticker=esi_corp_info.ticker)
+    corporation_cache.set(entity_id=corporation_id, info=corp_info)
 
     return corp_info
 
 
-def _get_alliance_info_from_affiliation(
-    affiliation_data: dict,
-) -> EveAllianceInfo | None:
+def _fetch_alliance_info(alliance_id: int) -> AffiliationInfo | None:
     """
-    Get alliance information from affiliation data
+    Fetch alliance information from ESI and cache it
 
-    :param affiliation_data: Affiliation data containing alliance ID
-    :type affiliation_data: dict
-    :return: EveAllianceInfo object for the alliance ID in the affiliation data, or None if alliance ID is not present
-    :rtype: EveAllianceInfo | None
+    :param alliance_id: Alliance ID
+    :type alliance_id: int
+    :return: AffiliationInfo for the alliance, or None if it couldn't be fetched
+    :rtype: AffiliationInfo | None
     """
 
-    alliance_id = affiliation_data.get("alliance_id")
+    esi_alliance_info = ESIHandler.get_alliances_alliance_id(
+        alliance_id=alliance_id, use_etag=False
+    )
 
-    if not alliance_id:
+    if esi_alliance_info is None:
         return None
 
-    if alliance_id in temp_alliance_data:
-        logger.debug(
-            f"Alliance information for alliance ID {alliance_id} retrieved from temporary cache."
-        )
+    alliance_info = AffiliationInfo(
+        name=esi_alliance_info.name, ticker=esi_alliance_info.ticker
+    )
+    alliance_cache.set(entity_id=alliance_id, info=alliance_info)
 
-        return temp_alliance_data[alliance_id]
+    return alliance_info
 
-    alliance_info = ESIHandler.get_alliances_alliance_id(
-        alliance_id=alliance_id, use_etag=False
+
+def _run_in_worker_thread(
+    fetch: Callable[[int], AffiliationInfo | None], entity_id: int
+) -> AffiliationInfo | None:
+    """
+    Fetch corporation or alliance details in a worker thread
+
+    Database connections opened in a worker thread aren't closed at the end of the
+    request, so they are closed once the job is done.
+
+    :param fetch: The function to fetch the details with
+    :type fetch: Callable[[int], AffiliationInfo | None]
+    :param entity_id: Corporation or alliance ID
+    :type entity_id: int
+    :return: AffiliationInfo for the entity, or None if it couldn't be fetched
+    :rtype: AffiliationInfo | None
+    """
+
+    try:
+        return fetch(entity_id)
+    finally:
+        connections.close_all()
+
+
+def _fetch_affiliation_details(
+    affiliations: list[dict[str, Any]],
+) -> dict[str, dict[int, AffiliationInfo | None]]:
+    """
+    Get corporation and alliance details for the affiliations
+
+    The corporation and alliance IDs are deduplicated up front and looked up in the
+    affiliation cache. Only the missing ones are fetched from ESI, concurrently, with
+    at most INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS requests in flight.
+
+    :param affiliations: List of affiliation data containing corporation and alliance IDs
+    :type affiliations: list[dict[str, Any]]
+    :return: Dictionary with the keys "corporations" and "alliances", each a dictionary of ID => AffiliationInfo (None if it couldn't be fetched)
+    :rtype: dict[str, dict[int, AffiliationInfo | None]]
+    """
+
+    corporation_ids = {affiliation["corporation_id"] for affiliation in affiliations}
+    alliance_ids = {
+        affiliation["alliance_id"]
+        for affiliation in affiliations
+        if affiliation["alliance_id"]
+    }
+
+    affiliation_details = {
+        "corporations": corporation_cache.get_many(entity_ids=corporation_ids),
+        "alliances": alliance_cache.get_many(entity_ids=alliance_ids),
+    }
+
+    jobs = [
+        ("corporations", corporation_id, _fetch_corporation_info)
+        for corporation_id in corporation_ids
+        - affiliation_details["corporations"].keys()
+    ] + [
+        ("alliances", alliance_id, _fetch_alliance_info)
+        for alliance_id in alliance_ids - affiliation_details["alliances"].keys()
+    ]
+
+    if not jobs:
+        return affiliation_details
+
+    max_workers = min(AppSettings.INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS, len(jobs))
+
+    # Counted here, the worker threads don't see the parse statistics
+    add_parse_count(name="esi_calls", value=len(jobs))
+
+    logger.debug(
+        f"Fetching {len(jobs)} corporation(s) and alliance(s) from ESI "
+        f"with {max_workers} concurrent request(s)…"
     )
 
-    temp_alliance_data[alliance_id] = alliance_info
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda job: _run_in_worker_thread(fetch=job[2], entity_id=job[1]), jobs
+        )
 
-    return alliance_info
+        for (affiliation_type, entity_id, _fetch), info in zip(jobs, results):
+            affiliation_details[affiliation_type][entity_id] = info
+
+    return affiliation_details
 
 
 def _fetch_affiliations_with_retry(chunk: list[int]) -> list[dict[str, Any]]:
@@ -167,6 +469,8 @@ def _fetch_affiliations_with_retry(chunk: list[int]) -> list[dict[str, Any]]:
     :rtype: list[dict[str, Any]]
     """
 
+    add_parse_count(name="esi_calls")
+
     try:
         affiliations = ESIHandler.post_characters_affiliation(ids=chunk)
 
@@ -209,6 +513,8 @@ def _fetch_ids_with_retry(chunk: list[str]) -> list[dict[str, Any]]:
     :rtype: list[dict[str, Any]]
     """
 
+    add_parse_count(name="esi_calls")
+
     try:
         response = ESIHandler.post_universe_ids(names=chunk)
 
@@ -218,6 +524,15 @@ def _fetch_ids_with_retry(chunk: list[str]) -> list[dict[str, Any]]:
             response_as_dict = response.model_dump()
         except AttributeError:
             response_as_dict = {}
+        else:
+            # ESI answered, so every name it didn't return is unresolvable
+            _cache_unresolvable_names(
+                names=chunk,
+                resolved_characters=response_as_dict.get("characters") or [],
+            )
+            _store_character_names(
+                resolved_characters=response_as_dict.get("characters") or []
+            )
 
         logger.debug(f"ID information after model_dump: {response_as_dict}")
 
@@ -329,18 +644,23 @@ def create_characters(  # pylint: disable=too-many-locals
 
     logger.info(f"{len(character_ids_list)} EveCharacter object(s) need to be created…")
 
+    add_parse_count(name="esi_calls")
+
     factions_response = ESIHandler.get_universe_factions(use_etag=False)
     faction_id_to_name = {f.faction_id: f.name for f in factions_response}
 
+    # Get all corporation and alliance details at once
+    affiliation_details = _fetch_affiliation_details(affiliations=affiliations)
+
     for affiliation in affiliations:
         logger.debug(
             f"Processing affiliation for character ID {affiliation['character_id']}: {affiliation}"
         )
 
-        corp_info = _get_corporation_info_from_affiliation(affiliation_data=affiliation)
-        alliance_info = _get_alliance_info_from_affiliation(
-            affiliation_data=affiliation
+        corp_info = affiliation_details["corporations"].get(
+            affiliation["corporation_id"]
         )
+        alliance_info = affiliation_details["alliances"].get(affiliation["alliance_id"])
 
         characters_to_create.append(
             EveCharacter(
@@ -360,6 +680,7 @@ def create_characters(  # pylint: disable=too-many-locals
                     if affiliation["faction_id"]
                     else ""
                 ),
+                last_updated_affiliations=timezone.now(),
             )
         )
 
@@ -412,6 +733,9 @@ def fetch_character_ids_from_esi(characters_to_fetch: set[Any]) -> list:
     """
     Fetch character IDs from ESI
 
+    Names ESI resolved before are taken from the database (CharacterName), names
+    ESI recently couldn't resolve are skipped, see INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL.
+
     :param characters_to_fetch: Set of character IDs to fetch from ESI
     :type characters_to_fetch: set[Any]
     :return: List of character IDs fetched from ESI or None if no characters were fetched
@@ -419,7 +743,9 @@ def fetch_character_ids_from_esi(characters_to_fetch: set[Any]) -> list:
     """
 
     chunk_size = 500
-    fetched_characters = []
+    fetched_characters, characters_to_fetch = _get_stored_character_ids(
+        names=_exclude_unresolvable_names(names=characters_to_fetch)
+    )
 
     for loop_count, chunk in enumerate(
         [
@@ -454,3 +780,187 @@ def fetch_character_ids_from_esi(characters_to_fetch: set[Any]) -> list:
     )
 
     return fetched_characters
+
+
+def _update_affiliation(
+    eve_character: EveCharacter,
+    affiliation: dict[str, Any],
+    affiliation_details: dict[str, dict[int, AffiliationInfo | None]],
+    faction_id_to_name: dict[int, str],
+) -> None:
+    """
+    Update the affiliation of an EveCharacter object (without saving it)
+
+    :param eve_character: The EveCharacter object to update
+    :type eve_character: EveCharacter
+    :param affiliation: Affiliation data with corporation, alliance and faction ID
+    :type affiliation: dict[str, Any]
+    :param affiliation_details: Corporation and alliance details, see _fetch_affiliation_details
+    :type affiliation_details: dict[str, dict[int, AffiliationInfo | None]]
+    :param faction_id_to_name: Dictionary of faction ID => faction name
+    :type faction_id_to_name: dict[int, str]
+    :return: None
+    :rtype: None
+    """
+
+    corp_info = affiliation_details["corporations"].get(affiliation["corporation_id"])
+    alliance_info = affiliation_details["alliances"].get(affiliation["alliance_id"])
+
+    eve_character.corporation_id = affiliation["corporation_id"]
+    eve_character.corporation_name = corp_info.name if corp_info else ""
+    eve_character.corporation_ticker = corp_info.ticker if corp_info else ""
+    eve_character.alliance_id = affiliation["alliance_id"]
+    eve_character.alliance_name = alliance_info.name if alliance_info else ""
+    eve_character.alliance_ticker = alliance_info.ticker if alliance_info else ""
+    eve_character.faction_id = affiliation["faction_id"] or None
+    eve_character.faction_name = (
+        faction_id_to_name.get(affiliation["faction_id"], "")
+        if affiliation["faction_id"]
+        else ""
+    )
+
+
+def refresh_character_affiliations(character_ids: Iterable[int]) -> int:
+    """
+    Refresh the affiliation of EveCharacter objects from ESI
+
+    The characters are refreshed in batches of AFFILIATION_BATCH_SIZE, one ESI request
+    per batch. Characters refreshed within ESI's cache time are skipped. Only the
+    details of changed corporations and alliances are fetched.
+
+    :param character_ids: IDs of the characters to refresh
+    :type character_ids: Iterable[int]
+    :return: Number of characters whose affiliation changed
+    :rtype: int
+    """
+
+    character_ids = sorted(set(character_ids))
+    changed_characters = 0
+    faction_id_to_name = None
+
+    for idx in range(0, len(character_ids), AFFILIATION_BATCH_SIZE):
+        refreshed_at = timezone.now()
+        eve_characters = {
+            eve_character.character_id: eve_character
+            for eve_character in EveCharacter.objects.filter(
+                Q(last_updated_affiliations__isnull=True)
+                | Q(
+                    last_updated_affiliations__lt=refreshed_at - AFFILIATION_CACHE_TIME
+                ),
+                character_id__in=character_ids[idx : idx + AFFILIATION_BATCH_SIZE],
+            )
+        }
+
+        if not eve_characters:
+            continue
+
+        affiliations = [
+            {
+                "character_id": item.character_id,
+                "corporation_id": getattr(item, "corporation_id"),
+                "alliance_id": getattr(item, "alliance_id", None),
+                "faction_id": getattr(item, "faction_id", None),
+            }
+            for item in _fetch_affiliations_with_retry(chunk=list(eve_characters))
+            if item.character_id in eve_characters
+        ]
+        changed_affiliations = [
+            affiliation
+            for affiliation in affiliations
+            if (
+                affiliation["corporation_id"],
+                affiliation["alliance_id"],
+                affiliation["faction_id"] or None,
+            )
+            != (
+                eve_characters[affiliation["character_id"]].corporation_id,
+                eve_characters[affiliation["character_id"]].alliance_id,
+                eve_characters[affiliation["character_id"]].faction_id,
+            )
+        ]
+
+        logger.debug(
+            f"{len(changed_affiliations)} of {len(affiliations)} refreshed "
+            "affiliation(s) changed."
+        )
+
+        if changed_affiliations:
+            # The factions are only fetched once, and only when needed
+            if faction_id_to_name is None and any(
+                affiliation["faction_id"] for affiliation in changed_affiliations
+            ):
+                add_parse_count(name="esi_calls")
+
+                faction_id_to_name = {
+                    faction.faction_id: faction.name
+                    for faction in ESIHandler.get_universe_factions(use_etag=False)
+                    or []
+                }
+
+            affiliation_details = _fetch_affiliation_details(
+                affiliations=changed_affiliations
+            )
+
+            for affiliation in changed_affiliations:
+                eve_character = eve_characters[affiliation["character_id"]]
+
+                _update_affiliation(
+                    eve_character=eve_character,
+                    affiliation=affiliation,
+                    affiliation_details=affiliation_details,
+                    faction_id_to_name=faction_id_to_name or {},
+                )
+                eve_character.last_updated_affiliations = refreshed_at
+
+            with transaction.atomic():
+                EveCharacter.objects.bulk_update(
+                    objs=[
+                        eve_characters[affiliation["character_id"]]
+                        for affiliation in changed_affiliations
+                    ],
+                    fields=[
+                        "corporation_id",
+                        "corporation_name",
+                        "corporation_ticker",
+                        "alliance_id",
+                        "alliance_name",
+                        "alliance_ticker",
+                        "faction_id",
+                        "faction_name",
+                        "last_updated_affiliations",
+                    ],
+                )
+
+                alliance_ids = {
+                    affiliation["alliance_id"]
+                    for affiliation in changed_affiliations
+                    if affiliation["alliance_id"]
+                }
+                corporation_ids = {
+                    affiliation["corporation_id"]
+                    for affiliation in changed_affiliations
+                    if not affiliation["alliance_id"]
+                }
+
+                if alliance_ids:
+                    _create_alliance(alliance_ids)
+
+                if corporation_ids:
+                    _create_corporation(corporation_ids)
+
+            changed_characters += len(changed_affiliations)
+
+        # The unchanged characters only get their refresh time updated
+        changed_character_ids = {
+            affiliation["character_id"] for affiliation in changed_affiliations
+        }
+
+        EveCharacter.objects.filter(
+            character_id__in=[
+                affiliation["character_id"]
+                for affiliation in affiliations
+                if affiliation["character_id"] not in changed_character_ids
+            ]
+        ).update(last_updated_affiliations=refreshed_at)
+
+    return changed_characters
@@ -0,0 +1,225 @@
+"""
+Little helper functions to deal with Eve types
+"""
+
+# Standard Library
+import threading
+import time
+from collections.abc import Iterable
+from typing import NamedTuple
+
+# Third Party
+from eve_sde.models import EveSDE, ItemType
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings, EVECategory
+from aa_intel_tool.helper.parse_stats import add_parse_count, parse_stage
+from aa_intel_tool.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Cache key for the shared (Django cache) type index
+SDE_TYPE_INDEX_CACHE_KEY = "aa_intel_tool:sde_type_index"
+
+# Interval in seconds in which the SDE build number is re-checked
+SDE_VERSION_CHECK_INTERVAL = 300
+
+
+class EveTypeInfo(NamedTuple):
+    """
+    EVE type information
+
+    The field names match the ones of a named `values_list` on ItemType, so this can be
+    used as a drop-in replacement for the query results.
+    """
+
+    pk: int
+    name: str
+    group__pk: int
+    group__name: str
+    mass: float
+    group__category_id: int
+
+
+# Process-local index of all EVE types in the categories we care about.
+# The SDE only changes with game patches, so the index is loaded lazily on first use
+# and only rebuilt when the SDE build number changes.
+_type_index: dict | None = None
+_type_index_checked: float = 0.0
+_type_index_lock = threading.Lock()
+
+
+def _get_sde_build_number() -> int | None:
+    """
+    Get the build number of the currently imported SDE
+
+    :return: The SDE build number, or None if no SDE has been imported (yet)
+    :rtype: int | None
+    """
+
+    return EveSDE.objects.values_list("build_number", flat=True).first()
+
+
+def _build_type_index(build_number: int | None) -> dict:
+    """
+    Build the type index from the SDE tables
+
+    :param build_number: The SDE build number the index is built for
+    :type build_number: int | None
+    :return: The type index with the keys "build_number", "by_id" and "by_name"
+    :rtype: dict
+    """
+
+    by_id = {}
+    by_name = {}
+
+    eve_types = (
+        ItemType.objects.filter(
+            group__category_id__in=[category.value for category in EVECategory]
+        )
+        .order_by("pk")
+        .values_list(
+            "pk", "name", "group__pk", "group__name", "mass", "group__category_id"
+        )
+    )
+
+    for eve_type in eve_types:
+        eve_type_info = EveTypeInfo(*eve_type)
+
+        by_id[eve_type_info.pk] = eve_type_info
+        by_name.setdefault(eve_type_info.name, eve_type_info.pk)
+
+    logger.debug(
+        f"Built SDE type index with {len(by_id)} EVE type(s) for SDE build {build_number}."
+    )
+
+    return {"build_number": build_number, "by_id": by_id, "by_name": by_name}
+
+
+def _load_type_index(build_number: int | None) -> dict:
+    """
+    Load the type index, either from Django's cache or from the SDE tables
+
+    :param build_number: The SDE build number the index has to match
+    :type build_number: int | None
+    :return: The type index
+    :rtype: dict
+    """
+
+    if AppSettings.INTELTOOL_SDE_CACHE_USE_DJANGO_CACHE:
+        cached_index = cache.get(key=SDE_TYPE_INDEX_CACHE_KEY)
+
+        if cached_index and cached_index.get("build_number") == build_number:
+            logger.debug("SDE type index retrieved from Django cache.")
+
+            return cached_index
+
+    type_index = _build_type_index(build_number=build_number)
+
+    if AppSettings.INTELTOOL_SDE_CACHE_USE_DJANGO_CACHE:
+        cache.set(key=SDE_TYPE_INDEX_CACHE_KEY, value=type_index, timeout=None)
+
+    return type_index
+
+
+def get_type_index() -> dict:
+    """
+    Get the process-local type index, (re)loading it when needed
+
+    :return: The type index with the keys "build_number", "by_id" and "by_name"
+    :rtype: dict
+    """
+
+    global _type_index, _type_index_checked  # pylint: disable=global-statement
+
+    if (
+        _type_index is not None
+        and time.monotonic() - _type_index_checked < SDE_VERSION_CHECK_INTERVAL
+    ):
+        return _type_index
+
+    with _type_index_lock:
+        # Another thread might have refreshed the index while we were waiting
+        if (
+            _type_index is not None
+            and time.monotonic() - _type_index_checked < SDE_VERSION_CHECK_INTERVAL
+        ):
+            return _type_index
+
+        build_number = _get_sde_build_number()
+
+        if _type_index is None or _type_index["build_number"] != build_number:
+            _type_index = _load_type_index(build_number=build_number)
+
+        _type_index_checked = time.monotonic()
+
+    return _type_index
+
+
+def clear_type_index() -> None:
+    """
+    Clear the process-local and the shared type index
+
+    :return: None
+    :rtype: None
+    """
+
+    global _type_index, _type_index_checked  # pylint: disable=global-statement
+
+    with _type_index_lock:
+        _type_index = None
+        _type_index_checked = 0.0
+
+    cache.delete(key=SDE_TYPE_INDEX_CACHE_KEY)
+
+
+def get_eve_types(type_ids: Iterable[int]) -> list[EveTypeInfo]:
+    """
+    Get EVE type information for a list of type IDs
+
+    Type IDs that are not in one of the categories we care about are ignored.
+
+    :param type_ids: Iterable of EVE type IDs
+    :type type_ids: Iterable[int]
+    :return: List of EveTypeInfo objects for the known type IDs
+    :rtype: list[EveTypeInfo]
+    """
+
+    with parse_stage(name="sde"):
+        by_id = get_type_index()["by_id"]
+        eve_types = [by_id[type_id] for type_id in set(type_ids) if type_id in by_id]
+
+    add_parse_count(name="types", value=len(eve_types))
+
+    return eve_types
+
+
+def get_eve_types_by_name(names: Iterable[str]) -> list[EveTypeInfo]:
+    """
+    Get EVE type information for a list of type names
+
+    Type names that are not in one of the categories we care about are ignored.
+
+    :param names: Iterable of EVE type names
+    :type names: Iterable[str]
+    :return: List of EveTypeInfo objects for the known type names
+    :rtype: list[EveTypeInfo]
+    """
+
+    with parse_stage(name="sde"):
+        type_index = get_type_index()
+        eve_types = [
+            type_index["by_id"][type_index["by_name"][name]]
+            for name in set(names)
+            if name in type_index["by_name"]
+        ]
+
+    add_parse_count(name="types", value=len(eve_types))
+
+    return eve_types
@@ -0,0 +1,104 @@
+"""
+HTTP caching helper for scan results
+"""
+
+# Standard Library
+from collections.abc import Callable
+from functools import wraps
+
+# Django
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+# AA Intel Tool
+from aa_intel_tool import __version__
+from aa_intel_tool.app_settings import AppSettings
+
+# Scans never change once written, so browsers can keep them for a year,
+# unless they are removed earlier (see get_scan_cache_max_age)
+SCAN_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def get_scan_cache_max_age() -> int:
+    """
+    Get the time in seconds browsers may keep scan data
+
+    Scans are removed by the housekeeping task after INTELTOOL_SCAN_RETENTION_TIME
+    day(s), so they are not kept longer than that. Without a retention time, they
+    are kept for SCAN_CACHE_MAX_AGE.
+
+    :return: The max-age in seconds
+    :rtype: int
+    """
+
+    if AppSettings.INTELTOOL_SCAN_RETENTION_TIME > 0:
+        return min(
+            SCAN_CACHE_MAX_AGE, AppSettings.INTELTOOL_SCAN_RETENTION_TIME * 60 * 60 * 24
+        )
+
+    return SCAN_CACHE_MAX_AGE
+
+
+def scan_etag(scan_hash: str, *parts: str) -> str:
+    """
+    Get a strong ETag for a scan result
+
+    The ETag is derived from the scan hash alone (no database access needed), plus
+    the app version, so a new release with different templates or data formats
+    invalidates all cached results.
+
+    :param scan_hash: The scan hash
+    :type scan_hash: str
+    :param parts: Additional parts that identify the representation (e.g. the section)
+    :type parts: str
+    :return: The quoted ETag
+    :rtype: str
+    """
+
+    return '"' + "-".join((scan_hash, *parts, __version__)) + '"'
+
+
+def cache_scan_response(etag_func: Callable[..., str]) -> Callable:
+    """
+    Decorator for views that return immutable scan data
+
+    Answers a matching If-None-Match with a 304 before the view (and thus the
+    database) is touched. Successful responses get the ETag and a Cache-Control
+    header, unless the view already set one (e.g. `no-store` for missing data).
+    Scan data is behind the login, so only the user's browser may cache it, never a
+    shared cache (proxy, CDN).
+
+    Not meant for pages, they also render per-user content (menu, notifications,
+    messages), which the ETag doesn't cover.
+
+    :param etag_func: Function that returns the ETag, called with the view arguments
+    :type etag_func: Callable[..., str]
+    :return: The decorator
+    :rtype: Callable
+    """
+
+    def decorator(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+        conditional_view = condition(etag_func=etag_func)(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs) -> HttpResponse:
+            response = conditional_view(request, *args, **kwargs)
+
+            if response.status_code not in (200, 304) or response.has_header(
+                "Cache-Control"
+            ):
+                return response
+
+            patch_cache_control(
+                response,
+                private=True,
+                max_age=get_scan_cache_max_age(),
+                immutable=True,
+            )
+
+            return response
+
+        return inner
+
+    return decorator
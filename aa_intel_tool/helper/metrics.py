@@ -0,0 +1,323 @@
+"""
+Metrics in the Prometheus text format
+
+The metrics are kept in Django's cache, so they are shared by all web and Celery
+workers. Nothing is recorded unless INTELTOOL_METRICS_ENABLED is set.
+"""
+
+# Standard Library
+from itertools import product
+from typing import NamedTuple
+
+# Django
+from django.core.cache import cache
+
+# AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings
+
+# Prefix for all metric keys in Django's cache
+METRICS_CACHE_KEY_PREFIX = "aa_intel_tool:metrics"
+
+# Histogram sums are stored as integers, in thousandths of the observed unit
+HISTOGRAM_SUM_SCALE = 1000
+
+PARSED_SCAN_TYPES = ("dscan", "fleetcomp", "chatlist")
+ESI_OPERATIONS = (
+    "GetAlliancesAllianceId",
+    "GetCorporationsCorporationId",
+    "GetUniverseFactions",
+    "PostCharactersAffiliation",
+    "PostUniverseIds",
+)
+ESI_RESULTS = ("ok", "not_modified", "content_type_error", "error")
+CACHE_RESULTS = ("hit", "miss")
+
+
+class Counter(NamedTuple):
+    """
+    Definition of a counter
+    """
+
+    help_text: str
+    labels: dict[str, tuple[str, ...]]
+
+
+class Histogram(NamedTuple):
+    """
+    Definition of a histogram
+    """
+
+    help_text: str
+    labels: dict[str, tuple[str, ...]]
+    buckets: tuple[float, ...]
+
+
+COUNTERS = {
+    "aa_intel_tool_scans_parsed_total": Counter(
+        help_text="Scans parsed, by scan type",
+        labels={"scan_type": PARSED_SCAN_TYPES},
+    ),
+    "aa_intel_tool_scan_parse_errors_total": Counter(
+        help_text="Pastes that could not be parsed",
+        labels={},
+    ),
+    "aa_intel_tool_esi_requests_total": Counter(
+        help_text="ESI requests, by operation and result",
+        labels={"operation": ESI_OPERATIONS, "result": ESI_RESULTS},
+    ),
+    "aa_intel_tool_cache_requests_total": Counter(
+        help_text="Cache lookups, by cache and result",
+        labels={
+            "cache": ("scan_digest", "unresolvable_name"),
+            "result": CACHE_RESULTS,
+        },
+    ),
+    "aa_intel_tool_housekeeping_deleted_rows_total": Counter(
+        help_text="Rows (scans and their sections) removed by the housekeeping task",
+        labels={},
+    ),
+}
+
+HISTOGRAMS = {
+    "aa_intel_tool_parse_duration_seconds": Histogram(
+        help_text="Time to parse a scan, by scan type",
+        labels={"scan_type": PARSED_SCAN_TYPES},
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    ),
+    "aa_intel_tool_scan_lines": Histogram(
+        help_text="Lines per parsed scan, by scan type",
+        labels={"scan_type": PARSED_SCAN_TYPES},
+        buckets=(10, 50, 100, 250, 500, 1000, 2500, 5000),
+    ),
+}
+
+
+def _cache_key(name: str, labels: dict[str, str], suffix: str = "") -> str:
+    """
+    Get the key of a metric in Django's cache
+
+    :param name: The metric name
+    :type name: str
+    :param labels: The label values, by label name
+    :type labels: dict[str, str]
+    :param suffix: Suffix for the parts of a histogram (e.g. "sum")
+    :type suffix: str
+    :return: The key in Django's cache
+    :rtype: str
+    """
+
+    label_values = ",".join(f"{key}={labels[key]}" for key in sorted(labels))
+
+    return f"{METRICS_CACHE_KEY_PREFIX}:{name}:{label_values}:{suffix}"
+
+
+def increment_cache_value(cache_key: str, delta: int) -> None:
+    """
+    Increment a value in Django's cache, creating it when it doesn't exist yet
+
+    :param cache_key: The key in Django's cache
+    :type cache_key: str
+    :param delta: Amount to increment the value by
+    :type delta: int
+    :return: None
+    :rtype: None
+    """
+
+    try:
+        cache.incr(key=cache_key, delta=delta)
+    except ValueError:
+        # The value doesn't exist yet
+        if not cache.add(key=cache_key, value=delta, timeout=None):
+            cache.incr(key=cache_key, delta=delta)
+
+
+def inc_counter(name: str, value: int = 1, **labels: str) -> None:
+    """
+    Increment a counter
+
+    :param name: The counter name, see COUNTERS
+    :type name: str
+    :param value: Amount to increment the counter by
+    :type value: int
+    :param labels: The label values, by label name
+    :type labels: str
+    :return: None
+    :rtype: None
+    """
+
+    if not AppSettings.INTELTOOL_METRICS_ENABLED or not value:
+        return
+
+    increment_cache_value(cache_key=_cache_key(name=name, labels=labels), delta=value)
+
+
+def observe_histogram(name: str, value: float, **labels: str) -> None:
+    """
+    Record an observation in a histogram
+
+    Only the matching bucket is incremented, the buckets are made cumulative when
+    the metrics are rendered.
+
+    :param name: The histogram name, see HISTOGRAMS
+    :type name: str
+    :param value: The observed value
+    :type value: float
+    :param labels: The label values, by label name
+    :type labels: str
+    :return: None
+    :rtype: None
+    """
+
+    if not AppSettings.INTELTOOL_METRICS_ENABLED:
+        return
+
+    bucket = next(
+        (str(bucket) for bucket in HISTOGRAMS[name].buckets if value <= bucket),
+        "+Inf",
+    )
+
+    increment_cache_value(
+        cache_key=_cache_key(name=name, labels=labels, suffix=bucket), delta=1
+    )
+    increment_cache_value(
+        cache_key=_cache_key(name=name, labels=labels, suffix="count"), delta=1
+    )
+    increment_cache_value(
+        cache_key=_cache_key(name=name, labels=labels, suffix="sum"),
+        delta=round(value * HISTOGRAM_SUM_SCALE),
+    )
+
+
+def _label_sets(labels: dict[str, tuple[str, ...]]) -> list[dict[str, str]]:
+    """
+    Get all combinations of the label values
+
+    :param labels: The possible label values, by label name
+    :type labels: dict[str, tuple[str, ...]]
+    :return: List of label values, by label name
+    :rtype: list[dict[str, str]]
+    """
+
+    return [
+        dict(zip(labels, label_values)) for label_values in product(*labels.values())
+    ]
+
+
+def _format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    """
+    Format a sample in the Prometheus text format
+
+    :param name: The sample name
+    :type name: str
+    :param labels: The label values, by label name
+    :type labels: dict[str, str]
+    :param value: The sample value
+    :type value: float
+    :return: The formatted sample
+    :rtype: str
+    """
+
+    label_values = ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+    return f"{name}{{{label_values}}} {value}" if labels else f"{name} {value}"
+
+
+def render_metrics() -> str:
+    """
+    Render all metrics in the Prometheus text format
+
+    :return: The metrics
+    :rtype: str
+    """
+
+    # AA Intel Tool
+    from aa_intel_tool.helper.affiliation_cache import (  # pylint: disable=import-outside-toplevel
+        alliance_cache,
+        corporation_cache,
+    )
+
+    cache_keys = []
+
+    for name, counter in COUNTERS.items():
+        cache_keys += [
+            _cache_key(name=name, labels=labels)
+            for labels in _label_sets(counter.labels)
+        ]
+
+    for name, histogram in HISTOGRAMS.items():
+        for labels in _label_sets(histogram.labels):
+            cache_keys += [
+                _cache_key(name=name, labels=labels, suffix=suffix)
+                for suffix in (*map(str, histogram.buckets), "+Inf", "count", "sum")
+            ]
+
+    values = cache.get_many(keys=cache_keys)
+    lines = []
+
+    for name, counter in COUNTERS.items():
+        lines += [f"# HELP {name} {counter.help_text}", f"# TYPE {name} counter"]
+        lines += [
+            _format_sample(
+                name=name,
+                labels=labels,
+                value=values.get(_cache_key(name=name, labels=labels), 0),
+            )
+            for labels in _label_sets(counter.labels)
+        ]
+
+    # The affiliation caches count their hits and misses themselves
+    name = "aa_intel_tool_affiliation_cache_requests_total"
+    lines += [
+        f"# HELP {name} Affiliation cache lookups, by cache and result",
+        f"# TYPE {name} counter",
+    ]
+
+    for affiliation_cache in (corporation_cache, alliance_cache):
+        stats = affiliation_cache.stats()
+
+        lines += [
+            _format_sample(
+                name=name,
+                labels={"cache": affiliation_cache.entity_type, "result": result},
+                value=stats[stats_key],
+            )
+            for result, stats_key in (("hit", "hits"), ("miss", "misses"))
+        ]
+
+    for name, histogram in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {histogram.help_text}", f"# TYPE {name} histogram"]
+
+        for labels in _label_sets(histogram.labels):
+            cumulative_count = 0
+
+            for bucket in (*map(str, histogram.buckets), "+Inf"):
+                cumulative_count += values.get(
+                    _cache_key(name=name, labels=labels, suffix=bucket), 0
+                )
+                lines.append(
+                    _format_sample(
+                        name=f"{name}_bucket",
+                        labels={**labels, "le": bucket},
+                        value=cumulative_count,
+                    )
+                )
+
+            lines += [
+                _format_sample(
+                    name=f"{name}_sum",
+                    labels=labels,
+                    value=values.get(
+                        _cache_key(name=name, labels=labels, suffix="sum"), 0
+                    )
+                    / HISTOGRAM_SUM_SCALE,
+                ),
+                _format_sample(
+                    name=f"{name}_count",
+                    labels=labels,
+                    value=values.get(
+                        _cache_key(name=name, labels=labels, suffix="count"), 0
+                    ),
+                ),
+            ]
+
+    return "\n".join(lines) + "\n"
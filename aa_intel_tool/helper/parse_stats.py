@@ -0,0 +1,190 @@
+"""
+Per-stage timings and counters for parsing intel
+"""
+
+# Standard Library
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Django
+from django.db import connection
+
+# Stage for the time and queries outside any named stage
+OTHER_STAGE = "other"
+
+
+class ParseStats:
+    """
+    Durations, query counts and counters of parsing one paste
+
+    Stages are exclusive: while a nested stage runs, the time and queries are only
+    recorded for the nested stage, so all stages add up to the total.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, float | int]] = {}
+        self.counts: dict[str, int] = {}
+        self._stage = OTHER_STAGE
+        self._stage_started = time.perf_counter()
+
+    def _get_stage(self, name: str) -> dict[str, float | int]:
+        """
+        Get the record of a stage, created on first use
+
+        :param name: The stage name
+        :type name: str
+        :return: The record with the duration in ms and the number of queries
+        :rtype: dict[str, float | int]
+        """
+
+        return self.stages.setdefault(name, {"ms": 0.0, "queries": 0})
+
+    def switch_stage(self, name: str) -> str:
+        """
+        Record the time of the current stage, and continue with another one
+
+        :param name: The stage to continue with
+        :type name: str
+        :return: The previous stage
+        :rtype: str
+        """
+
+        now = time.perf_counter()
+        previous_stage = self._stage
+
+        self._get_stage(previous_stage)["ms"] += (now - self._stage_started) * 1000
+        self._stage = name
+        self._stage_started = now
+
+        return previous_stage
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter
+
+        :param name: The counter name
+        :type name: str
+        :param value: The value to add
+        :type value: int
+        :return: None
+        :rtype: None
+        """
+
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def count_query(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: dict
+    ) -> Any:
+        """
+        Database execute wrapper, counting the queries for the current stage
+
+        :param execute: The next callable in the wrapper chain
+        :type execute: Callable
+        :param sql: The SQL statement
+        :type sql: str
+        :param params: The parameters of the SQL statement
+        :type params: Any
+        :param many: Whether it is an executemany call
+        :type many: bool
+        :param context: The execution context
+        :type context: dict
+        :return: The result of the query
+        :rtype: Any
+        """
+
+        self._get_stage(self._stage)["queries"] += 1
+
+        return execute(sql, params, many, context)
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the statistics as a JSON serializable dict
+
+        :return: The statistics
+        :rtype: dict[str, Any]
+        """
+
+        stages = {
+            name: {"ms": round(stage["ms"], 2), "queries": stage["queries"]}
+            for name, stage in self.stages.items()
+        }
+
+        return {
+            "total_ms": round(sum(stage["ms"] for stage in self.stages.values()), 2),
+            "stages": stages,
+            "counts": dict(self.counts),
+        }
+
+
+_parse_stats: ContextVar[ParseStats | None] = ContextVar("parse_stats", default=None)
+
+
+@contextmanager
+def collect_parse_stats() -> Iterator[ParseStats]:
+    """
+    Collect the statistics of everything parsed within this context
+
+    Only queries of the current thread's default database connection are counted.
+
+    :return: The statistics, complete when the context is left
+    :rtype: Iterator[ParseStats]
+    """
+
+    parse_stats = ParseStats()
+    token = _parse_stats.set(parse_stats)
+
+    try:
+        with connection.execute_wrapper(parse_stats.count_query):
+            yield parse_stats
+    finally:
+        parse_stats.switch_stage(OTHER_STAGE)
+        _parse_stats.reset(token)
+
+
+@contextmanager
+def parse_stage(name: str) -> Iterator[None]:
+    """
+    Record the time and queries within this context for the given stage
+
+    Does nothing, when no statistics are collected.
+
+    :param name: The stage name (e.g. "detect", "sde", "esi", "db_write")
+    :type name: str
+    :return: None
+    :rtype: Iterator[None]
+    """
+
+    parse_stats = _parse_stats.get()
+
+    if parse_stats is None:
+        yield
+
+        return
+
+    previous_stage = parse_stats.switch_stage(name)
+
+    try:
+        yield
+    finally:
+        parse_stats.switch_stage(previous_stage)
+
+
+def add_parse_count(name: str, value: int = 1) -> None:
+    """
+    Add to a counter of the statistics, when they are collected
+
+    :param name: The counter name (e.g. "lines", "esi_calls")
+    :type name: str
+    :param value: The value to add
+    :type value: int
+    :return: None
+    :rtype: None
+    """
+
+    parse_stats = _parse_stats.get()
+
+    if parse_stats is not None:
+        parse_stats.count(name=name, value=value)
@@ -0,0 +1,114 @@
+"""
+Compress (or decompress) the stored data of existing scans
+"""
+
+# Django
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import models
+
+# AA Intel Tool
+from aa_intel_tool.helper.compression import compress, decompress
+from aa_intel_tool.models import Scan, ScanData
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Compress (or decompress) the stored data of existing scans
+    """
+
+    help = (
+        "Compress the raw data and the processed sections of existing scans "
+        "(or decompress them with --decompress) and report the bytes saved."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add arguments
+
+        :param parser: The argument parser
+        :type parser: CommandParser
+        :return: None
+        :rtype: None
+        """
+
+        parser.add_argument(
+            "--decompress",
+            action="store_true",
+            help="Decompress the stored data instead, e.g. before a downgrade.",
+        )
+
+    def _convert(
+        self, model: type[models.Model], field_name: str, decompress_data: bool
+    ) -> None:
+        """
+        Convert the stored data of all rows of a model in batches and report the result
+
+        :param model: The model
+        :type model: type[models.Model]
+        :param field_name: The name of the binary field holding the data
+        :type field_name: str
+        :param decompress_data: Whether to decompress instead of compress
+        :type decompress_data: bool
+        :return: None
+        :rtype: None
+        """
+
+        convert = decompress if decompress_data else compress
+        rows = bytes_before = bytes_after = 0
+        batch = []
+
+        for obj in (
+            model.objects.only("pk", field_name)
+            .order_by()
+            .iterator(chunk_size=BATCH_SIZE)
+        ):
+            stored_data = bytes(getattr(obj, field_name))
+            converted_data = convert(data=stored_data)
+
+            rows += 1
+            bytes_before += len(stored_data)
+            bytes_after += len(converted_data)
+
+            if converted_data != stored_data:
+                setattr(obj, field_name, converted_data)
+                batch.append(obj)
+
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, [field_name])
+                batch = []
+
+        model.objects.bulk_update(batch, [field_name])
+
+        saved = bytes_before - bytes_after
+        percentage = saved / bytes_before * 100 if bytes_before else 0
+
+        self.stdout.write(
+            f"{model._meta.verbose_name_plural}: {rows:,} row(s), "
+            f"{bytes_before:,} » {bytes_after:,} bytes "
+            f"({saved:,} bytes saved, {percentage:.1f} %)"
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Compress (or decompress) the stored data
+
+        :param args: Positional arguments (not used)
+        :type args: tuple
+        :param options: The command options, "decompress" is used
+        :type options: dict
+        :return: None
+        :rtype: None
+        """
+
+        self._convert(
+            model=Scan,
+            field_name="raw_data_bytes",
+            decompress_data=options["decompress"],
+        )
+        self._convert(
+            model=ScanData,
+            field_name="processed_data_json",
+            decompress_data=options["decompress"],
+        )
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+# Standard Library
+import json
+import zlib
+
+# Django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+def serialize_processed_data(apps, schema_editor):
+    """
+    Store the processed data of all existing scans as serialized JSON
+
+    :param apps: The app registry with the historical models of this migration
+    :type apps: django.apps.registry.Apps
+    :param schema_editor: The schema editor of the database
+    :type schema_editor: django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    :return: None
+    :rtype: None
+    """
+
+    ScanData = apps.get_model("aa_intel_tool", "ScanData")
+    batch = []
+
+    for scan_data in ScanData.objects.only("pk", "processed_data").iterator(
+        chunk_size=1000
+    ):
+        scan_data.processed_data_json = json.dumps(
+            scan_data.processed_data, cls=DjangoJSONEncoder
+        ).encode(encoding="utf-8")
+        batch.append(scan_data)
+
+        if len(batch) == 1000:
+            ScanData.objects.bulk_update(batch, ["processed_data_json"])
+            batch = []
+
+    ScanData.objects.bulk_update(batch, ["processed_data_json"])
+
+
+def deserialize_processed_data(apps, schema_editor):
+    """
+    Restore the processed data of all existing scans from the serialized JSON
+
+    :param apps: The app registry with the historical models of this migration
+    :type apps: django.apps.registry.Apps
+    :param schema_editor: The schema editor of the database
+    :type schema_editor: django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    :return: None
+    :rtype: None
+    """
+
+    ScanData = apps.get_model("aa_intel_tool", "ScanData")
+    batch = []
+
+    for scan_data in ScanData.objects.only("pk", "processed_data_json").iterator(
+        chunk_size=1000
+    ):
+        processed_data_json = bytes(scan_data.processed_data_json)
+
+        # Compressed by a later version (see 0005_scan_raw_data_bytes)
+        if processed_data_json.startswith(b"\x00zlib\x00"):
+            processed_data_json = zlib.decompress(processed_data_json[6:])
+
+        scan_data.processed_data = json.loads(processed_data_json)
+        batch.append(scan_data)
+
+        if len(batch) == 1000:
+            ScanData.objects.bulk_update(batch, ["processed_data"])
+            batch = []
+
+    ScanData.objects.bulk_update(batch, ["processed_data"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("aa_intel_tool", "0002_alter_scan_raw_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scandata",
+            name="processed_data_json",
+            field=models.BinaryField(
+                default=b"{}", verbose_name="Processed scan data (JSON)"
+            ),
+        ),
+        migrations.RunPython(
+            code=serialize_processed_data, reverse_code=deserialize_processed_data
+        ),
+    ]
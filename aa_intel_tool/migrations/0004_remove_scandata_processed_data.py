@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+# Django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("aa_intel_tool", "0003_scandata_processed_data_json"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="scandata",
+            name="processed_data",
+        ),
+    ]
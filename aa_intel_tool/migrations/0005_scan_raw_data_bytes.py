@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+# Standard Library
+import zlib
+
+# Django
+from django.db import migrations, models
+
+
+def encode_raw_data(apps, schema_editor):
+    """
+    Store the raw data of all existing scans UTF-8 encoded
+
+    Existing scans are not compressed here, use the
+    `aa_intel_tool_compress_scans` management command for that.
+
+    :param apps: The app registry with the historical models of this migration
+    :type apps: django.apps.registry.Apps
+    :param schema_editor: The schema editor of the database
+    :type schema_editor: django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    :return: None
+    :rtype: None
+    """
+
+    Scan = apps.get_model("aa_intel_tool", "Scan")
+    batch = []
+
+    for scan in Scan.objects.only("pk", "raw_data").iterator(chunk_size=1000):
+        scan.raw_data_bytes = scan.raw_data.encode(encoding="utf-8")
+        batch.append(scan)
+
+        if len(batch) == 1000:
+            Scan.objects.bulk_update(batch, ["raw_data_bytes"])
+            batch = []
+
+    Scan.objects.bulk_update(batch, ["raw_data_bytes"])
+
+
+def decode_raw_data(apps, schema_editor):
+    """
+    Restore the raw data of all existing scans from the UTF-8 encoded data
+
+    :param apps: The app registry with the historical models of this migration
+    :type apps: django.apps.registry.Apps
+    :param schema_editor: The schema editor of the database
+    :type schema_editor: django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    :return: None
+    :rtype: None
+    """
+
+    Scan = apps.get_model("aa_intel_tool", "Scan")
+    batch = []
+
+    for scan in Scan.objects.only("pk", "raw_data_bytes").iterator(chunk_size=1000):
+        raw_data_bytes = bytes(scan.raw_data_bytes)
+
+        if raw_data_bytes.startswith(b"\x00zlib\x00"):
+            raw_data_bytes = zlib.decompress(raw_data_bytes[6:])
+
+        scan.raw_data = raw_data_bytes.decode(encoding="utf-8")
+        batch.append(scan)
+
+        if len(batch) == 1000:
+            Scan.objects.bulk_update(batch, ["raw_data"])
+            batch = []
+
+    Scan.objects.bulk_update(batch, ["raw_data"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("aa_intel_tool", "0004_remove_scandata_processed_data"),
+    ]
+
+    operations = [
+        # A default is needed to add the field back when migrating backwards
+        migrations.AlterField(
+            model_name="scan",
+            name="raw_data",
+            field=models.TextField(default="", verbose_name="Scan raw data"),
+        ),
+        migrations.AddField(
+            model_name="scan",
+            name="raw_data_bytes",
+            field=models.BinaryField(default=b"", verbose_name="Scan raw data (UTF-8)"),
+        ),
+        migrations.RunPython(code=encode_raw_data, reverse_code=decode_raw_data),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+# Django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("aa_intel_tool", "0005_scan_raw_data_bytes"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="scan",
+            name="raw_data",
+        ),
+    ]
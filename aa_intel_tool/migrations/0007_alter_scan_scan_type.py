@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_intel_tool", "0006_remove_scan_raw_data"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="scan",
+            name="scan_type",
+            field=models.CharField(
+                choices=[
+                    ("invalid", "Invalid scan data"),
+                    ("pending", "Pending"),
+                    ("dscan", "D-Scan"),
+                    ("fleetcomp", "Fleet composition"),
+                    ("chatlist", "Chat list"),
+                ],
+                default="invalid",
+                max_length=9,
+                verbose_name="Scan type",
+            ),
+        ),
+    ]
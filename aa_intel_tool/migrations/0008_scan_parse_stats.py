@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:42
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_intel_tool", "0007_alter_scan_scan_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scan",
+            name="parse_stats",
+            field=models.JSONField(
+                blank=True, default=None, null=True, verbose_name="Parse statistics"
+            ),
+        ),
+    ]
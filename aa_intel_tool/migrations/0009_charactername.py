@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:00
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("aa_intel_tool", "0008_scan_parse_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CharacterName",
+            fields=[
+                (
+                    "normalized_name",
+                    models.CharField(
+                        max_length=254,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Normalized character name",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=254, verbose_name="Character name"),
+                ),
+                (
+                    "character_id",
+                    models.PositiveBigIntegerField(
+                        db_index=True, verbose_name="Character ID"
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(auto_now=True, verbose_name="Last update"),
+                ),
+            ],
+            options={
+                "verbose_name": "Character name",
+                "verbose_name_plural": "Character names",
+                "default_permissions": (),
+            },
+        ),
+    ]
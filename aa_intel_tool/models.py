@@ -2,23 +2,35 @@
 The models
 """
 
+# Standard Library
+import json
+from typing import Any
+
 # Django
-from django.db import models, transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
 
+# AA Intel Tool
+from aa_intel_tool.helper.compression import compress_if_enabled, decompress
+
 
 class Scan(models.Model):
     """
     The scans
     """
 
+    # Attempts to insert a new scan with a fresh hash, before giving up
+    HASH_ATTEMPTS = 3
+
     class Type(models.TextChoices):
         """
         The choices for Scan.type
         """
 
         INVALID = "invalid", _("Invalid scan data")
+        PENDING = "pending", _("Pending")
         DSCAN = "dscan", _("D-Scan")
         FLEETCOMP = "fleetcomp", _("Fleet composition")
         CHATLIST = "chatlist", _("Chat list")
@@ -37,7 +49,11 @@ class Scan(models.Model):
         verbose_name=_("Creation date/time"),
     )
 
-    raw_data = models.TextField(verbose_name=_("Scan raw data"))
+    # The raw data is stored UTF-8 encoded, compressed if enabled with
+    # INTELTOOL_COMPRESS_SCAN_DATA
+    raw_data_bytes = models.BinaryField(
+        default=b"", verbose_name=_("Scan raw data (UTF-8)")
+    )
 
     scan_type = models.CharField(
         max_length=9,
@@ -46,6 +62,11 @@ class Scan(models.Model):
         verbose_name=_("Scan type"),
     )
 
+    # Time and queries of each parse stage, if INTELTOOL_STORE_PARSE_STATS is enabled
+    parse_stats = models.JSONField(
+        blank=True, default=None, null=True, verbose_name=_("Parse statistics")
+    )
+
     class Meta:  # pylint: disable=too-few-public-methods
         """
         Meta definitions
@@ -58,11 +79,40 @@ class Scan(models.Model):
     def __str__(self) -> str:
         return str(self.pk)
 
-    @transaction.atomic()
+    @property
+    def raw_data(self) -> str:
+        """
+        The raw data, decompressed and decoded
+
+        :return: The raw data
+        :rtype: str
+        """
+
+        return decompress(data=self.raw_data_bytes).decode(encoding="utf-8")
+
+    @raw_data.setter
+    def raw_data(self, raw_data: str) -> None:
+        """
+        Set the raw data
+
+        :param raw_data: The raw data
+        :type raw_data: str
+        :return: None
+        :rtype: None
+        """
+
+        self.raw_data_bytes = compress_if_enabled(
+            data=raw_data.encode(encoding="utf-8")
+        )
+
     def save(self, *args, **kwargs):
         """
         Generates the scan hash on save
 
+        A new scan is saved with a single INSERT. The primary key constraint takes
+        care of the (very unlikely) hash collision, in which case the INSERT is
+        retried with a new hash.
+
         :param args: Positional arguments passed to the save method, which may include various parameters related to the saving process, such as update_fields or force_insert, depending on the context in which the save method is called
         :type args: tuple
         :param kwargs: Keyword arguments passed to the save method, which may include various parameters related to the saving process, such as update_fields or force_insert, depending on the context in which the save method is called
@@ -71,30 +121,37 @@ class Scan(models.Model):
         :rtype: None
         """
 
-        if self._state.adding is True:
-            self.hash = Scan.generate_scan_hash()
+        # Existing scans keep their hash, unless it was emptied
+        if self._state.adding is False and self.hash != "":
+            super().save(*args, **kwargs)
+
+            return
 
-        super().save(*args, **kwargs)
+        kwargs["force_insert"] = True
 
-        if self.hash == "":
+        for attempt in range(1, Scan.HASH_ATTEMPTS + 1):
             self.hash = Scan.generate_scan_hash()
-            self.save()
+
+            try:
+                # Savepoint, so a collision doesn't break an outer transaction
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == Scan.HASH_ATTEMPTS:
+                    raise
+            else:
+                return
 
     @staticmethod
     def generate_scan_hash():
         """
         Get a random string we can use as hash
 
-        :return: A unique random string to be used as the scan hash, ensuring that it does not collide with existing hashes in the Scan model
+        :return: A random string to be used as the scan hash
         :rtype: str
         """
 
-        scan_hash = get_random_string(length=30)
-
-        while Scan.objects.filter(hash=scan_hash).exists():  # pylint: disable=no-member
-            scan_hash = get_random_string(length=30)
-
-        return scan_hash
+        return get_random_string(length=30)
 
 
 class ScanData(models.Model):
@@ -139,8 +196,11 @@ class ScanData(models.Model):
         verbose_name=_("Scan section"),
     )
 
-    processed_data = models.JSONField(
-        default=dict, verbose_name=_("Processed scan data")
+    # The processed data is stored as serialized JSON, so it can be sent to the
+    # browser as it is, without decoding and encoding it again on every request.
+    # It is compressed if enabled with INTELTOOL_COMPRESS_SCAN_DATA.
+    processed_data_json = models.BinaryField(
+        default=b"{}", verbose_name=_("Processed scan data (JSON)")
     )
 
     class Meta:  # pylint: disable=too-few-public-methods
@@ -153,3 +213,74 @@ class ScanData(models.Model):
         verbose_name_plural = _("Scan data")
 
         unique_together = ("scan", "section")
+
+    @staticmethod
+    def serialize(data: Any) -> bytes:
+        """
+        Serialize processed data the way it is stored
+
+        :param data: The processed data
+        :type data: Any
+        :return: The data as UTF-8 encoded JSON
+        :rtype: bytes
+        """
+
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(encoding="utf-8")
+
+    @property
+    def processed_data(self) -> Any:
+        """
+        The processed data, decompressed and decoded
+
+        :return: The processed data
+        :rtype: Any
+        """
+
+        return json.loads(decompress(data=self.processed_data_json))
+
+    @processed_data.setter
+    def processed_data(self, data: Any) -> None:
+        """
+        Set the processed data
+
+        :param data: The processed data
+        :type data: Any
+        :return: None
+        :rtype: None
+        """
+
+        self.processed_data_json = compress_if_enabled(data=self.serialize(data=data))
+
+
+class CharacterName(models.Model):
+    """
+    Character names ESI resolved to character IDs, so they don't have to be
+    resolved again
+    """
+
+    # See aa_intel_tool.helper.eve_character.normalize_character_name
+    normalized_name = models.CharField(
+        primary_key=True,
+        max_length=254,
+        verbose_name=_("Normalized character name"),
+    )
+
+    name = models.CharField(max_length=254, verbose_name=_("Character name"))
+
+    character_id = models.PositiveBigIntegerField(
+        db_index=True, verbose_name=_("Character ID")
+    )
+
+    updated = models.DateTimeField(auto_now=True, verbose_name=_("Last update"))
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """
+        Meta definitions
+        """
+
+        default_permissions = ()
+        verbose_name = _("Character name")
+        verbose_name_plural = _("Character names")
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.character_id})"
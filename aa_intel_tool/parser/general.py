@@ -3,46 +3,106 @@ General parser functions
 """
 
 # Standard Library
+import hashlib
 import re
 
 # Django
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Intel Tool
+from aa_intel_tool import __version__
+from aa_intel_tool.app_settings import AppSettings
 from aa_intel_tool.constants import SUPPORTED_INTEL_TYPES
 from aa_intel_tool.exceptions import ParserError
+from aa_intel_tool.helper.metrics import inc_counter, observe_histogram
+from aa_intel_tool.helper.parse_stats import (
+    ParseStats,
+    add_parse_count,
+    collect_parse_stats,
+    parse_stage,
+)
+from aa_intel_tool.models import Scan
+from aa_intel_tool.parser.helper.db import target_scan
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
+# Number of lines from the beginning of the scan data used to narrow down the intel type
+INTEL_TYPE_SAMPLE_SIZE = 10
 
-def check_intel_type(scan_data: list) -> str:
+# Prefix for the Django cache keys of recently parsed intel
+SCAN_DIGEST_CACHE_KEY_PREFIX = "aa_intel_tool:scan_digest"
+
+# Prefix for the Django cache keys of the errors of scans parsed in the background
+SCAN_ERROR_CACHE_KEY_PREFIX = "aa_intel_tool:scan_error"
+
+# Time in seconds the error of a scan parsed in the background is kept
+SCAN_ERROR_CACHE_TTL = 60 * 60
+
+
+def _get_intel_type_candidates(scan_data: list) -> list:
     """
-    Check which intel type we have
+    Get the intel types that are possible for the given scan data
+
+    Only a small sample from the beginning of the scan data is checked, and only
+    against the cheap structural checks (tab count, leading integer, skills column)
+    of the intel types. No regex is involved at this stage.
+
+    :param scan_data: List of strings to get the intel type candidates for
+    :type scan_data: list
+    :return: List of intel types, in the order of SUPPORTED_INTEL_TYPES
+    :rtype: list
+    """
+
+    sample = scan_data[:INTEL_TYPE_SAMPLE_SIZE]
+
+    return [
+        intel_type
+        for intel_type, intel_type_attributes in SUPPORTED_INTEL_TYPES.items()
+        if all(intel_type_attributes["structure_check"](line) for line in sample)
+    ]
+
+
+def match_intel_type(scan_data: list) -> tuple[str, list[re.Match]]:
+    """
+    Detect the intel type and match every line against its pattern
+
+    Each line is matched at most once for the detected intel type, and the matches
+    are returned, so the parser doesn't need to match them again.
 
     :param scan_data: List of strings to check for intel type patterns
     :type scan_data: list
-    :return: Intel type as a string
-    :rtype: str
+    :return: Tuple with the intel type as a string and the list of matched lines
+    :rtype: tuple[str, list[re.Match]]
     """
 
     logger.info(msg="Checking intel type…")
     logger.info(msg=f"Supported intel types: {list(SUPPORTED_INTEL_TYPES.keys())}")
 
-    for intel_type, intel_type_attributes in SUPPORTED_INTEL_TYPES.items():
+    for intel_type in _get_intel_type_candidates(scan_data=scan_data):
+        intel_type_attributes = SUPPORTED_INTEL_TYPES[intel_type]
+
         logger.info(msg=f"Checking for intel type: {intel_type_attributes['name']}")
         logger.info(msg=f"Using pattern: {intel_type_attributes['pattern']}")
 
-        if all(
-            re.match(pattern=intel_type_attributes["pattern"], string=string)
-            for string in scan_data
-        ):
+        match_line = intel_type_attributes["pattern"].match
+        scan_lines = []
+
+        for string in scan_data:
+            line = match_line(string)
+
+            if line is None:
+                break
+
+            scan_lines.append(line)
+        else:
             logger.info(msg=f"Detected intel type: {intel_type_attributes['name']}")
 
-            return intel_type
+            return intel_type, scan_lines
 
     raise ParserError(
         message=str(
@@ -53,13 +113,170 @@ def check_intel_type(scan_data: list) -> str:
     )
 
 
+def check_intel_type(scan_data: list) -> str:
+    """
+    Check which intel type we have
+
+    :param scan_data: List of strings to check for intel type patterns
+    :type scan_data: list
+    :return: Intel type as a string
+    :rtype: str
+    """
+
+    intel_type, _scan_lines = match_intel_type(scan_data=scan_data)
+
+    return intel_type
+
+
+def _get_scan_digest_cache_key(scan_data: list) -> str:
+    """
+    Get the Django cache key for the digest of the given scan data
+
+    The scan data is normalized (surrounding whitespace and empty lines removed), so
+    the same paste gets the same digest, no matter where it was copied from. The app
+    version is part of the digest, so a new parser never returns scans of an old one.
+
+    :param scan_data: List of strings with the scan data
+    :type scan_data: list
+    :return: The key in Django's cache
+    :rtype: str
+    """
+
+    normalized_scan_data = "\n".join(
+        stripped_line for line in scan_data if (stripped_line := line.strip())
+    )
+    digest = hashlib.sha256(
+        f"{__version__}\n{normalized_scan_data}".encode(encoding="utf-8")
+    ).hexdigest()
+
+    return f"{SCAN_DIGEST_CACHE_KEY_PREFIX}:{digest}"
+
+
+def _get_recent_scan_hash(cache_key: str) -> str | None:
+    """
+    Get the hash of the scan recently parsed from the same data
+
+    :param cache_key: The Django cache key for the digest of the scan data
+    :type cache_key: str
+    :return: The scan hash, or None if there is no such scan (anymore)
+    :rtype: str | None
+    """
+
+    scan_hash = cache.get(key=cache_key)
+
+    inc_counter(
+        name="aa_intel_tool_cache_requests_total",
+        cache="scan_digest",
+        result="miss" if scan_hash is None else "hit",
+    )
+
+    if scan_hash is None:
+        return None
+
+    # pylint: disable=no-member
+    if (
+        not Scan.objects.filter(pk=scan_hash)
+        .exclude(scan_type=Scan.Type.INVALID)
+        .exists()
+    ):
+        cache.delete(key=cache_key)
+
+        return None
+
+    return scan_hash
+
+
+def _record_parse_stats(
+    scan_hash: str, intel_type: str, parse_stats: ParseStats
+) -> None:
+    """
+    Log the parse statistics of a scan, store them with the scan if enabled, and
+    add them to the metrics
+
+    :param scan_hash: Hash of the parsed Scan object
+    :type scan_hash: str
+    :param intel_type: The detected intel type
+    :type intel_type: str
+    :param parse_stats: The parse statistics
+    :type parse_stats: ParseStats
+    :return: None
+    :rtype: None
+    """
+
+    stats = parse_stats.as_dict()
+
+    logger.debug(msg=f"Parse statistics for scan {scan_hash}: {stats}")
+
+    inc_counter(name="aa_intel_tool_scans_parsed_total", scan_type=intel_type)
+    observe_histogram(
+        name="aa_intel_tool_parse_duration_seconds",
+        value=stats["total_ms"] / 1000,
+        scan_type=intel_type,
+    )
+    observe_histogram(
+        name="aa_intel_tool_scan_lines",
+        value=stats["counts"].get("lines", 0),
+        scan_type=intel_type,
+    )
+
+    if AppSettings.INTELTOOL_STORE_PARSE_STATS:
+        Scan.objects.filter(pk=scan_hash).update(  # pylint: disable=no-member
+            parse_stats=stats
+        )
+
+
+def _parse_to_scan(new_scan: Scan, scan_data: list) -> Scan:
+    """
+    Parse the scan data, and save the parsed sections to the given scan
+
+    The time and queries of each stage (intel type detection, parsing, SDE and ESI
+    lookups, DB writes) are recorded, see _record_parse_stats.
+
+    :param new_scan: The scan the parsed sections are saved to
+    :type new_scan: Scan
+    :param scan_data: List of strings with the scan data
+    :type scan_data: list
+    :return: The Scan object returned by the parser
+    :rtype: Scan
+    """
+
+    token = target_scan.set(new_scan)
+
+    try:
+        with collect_parse_stats() as parse_stats:
+            add_parse_count(name="lines", value=len(scan_data))
+
+            with parse_stage(name="detect"):
+                intel_type, scan_lines = match_intel_type(scan_data=scan_data)
+
+            with parse_stage(name="parse"):
+                new_scan = SUPPORTED_INTEL_TYPES[intel_type]["parser"](
+                    scan_data=scan_lines
+                )
+    except Exception:
+        inc_counter(name="aa_intel_tool_scan_parse_errors_total")
+
+        raise
+    finally:
+        target_scan.reset(token)
+
+    _record_parse_stats(
+        scan_hash=new_scan.hash, intel_type=intel_type, parse_stats=parse_stats
+    )
+
+    return new_scan
+
+
 def parse_intel(form_data: str) -> str:
     """
     Parse intel
 
+    If the same data was parsed within INTELTOOL_DEDUPLICATION_WINDOW seconds, the
+    existing scan is returned instead, without parsing the data again.
+
     :param form_data: Raw intel data as a string
     :type form_data: str
-    :return: Hash of the created Scan object
+    :return: Hash of the created (or existing) Scan object
     :rtype: str
     """
     scan_data = form_data.splitlines()
@@ -67,14 +284,120 @@ def parse_intel(form_data: str) -> str:
     if not scan_data:
         raise ParserError(message=str(_("No data to parse…")))
 
+    deduplication_window = AppSettings.INTELTOOL_DEDUPLICATION_WINDOW
+
+    if deduplication_window:
+        cache_key = _get_scan_digest_cache_key(scan_data=scan_data)
+        scan_hash = _get_recent_scan_hash(cache_key=cache_key)
+
+        if scan_hash is not None:
+            logger.debug(f"Same intel was parsed recently, returning scan {scan_hash}")
+
+            return scan_hash
+
+    # The parser saves its data to this scan, so it is created with a single INSERT
+    new_scan = Scan()
+    new_scan.raw_data = form_data
+
     try:
-        intel_type = check_intel_type(scan_data=scan_data)
-        new_scan = SUPPORTED_INTEL_TYPES[intel_type]["parser"](scan_data=scan_data)
+        new_scan = _parse_to_scan(new_scan=new_scan, scan_data=scan_data)
     except ParserError as exc:
         # Re-raise the Exception
         raise ParserError(message=exc.message) from exc
 
+    if deduplication_window:
+        cache.set(key=cache_key, value=new_scan.hash, timeout=deduplication_window)
+
+    return new_scan.hash
+
+
+def queue_intel(form_data: str) -> tuple[str, bool]:
+    """
+    Create a pending scan for the intel, which is parsed in the background
+
+    If the same data was parsed (or queued) within INTELTOOL_DEDUPLICATION_WINDOW
+    seconds, the existing scan is returned instead.
+
+    :param form_data: Raw intel data as a string
+    :type form_data: str
+    :return: Hash of the pending (or existing) Scan object, and whether it was created
+    :rtype: tuple[str, bool]
+    """
+
+    scan_data = form_data.splitlines()
+
+    if not scan_data:
+        raise ParserError(message=str(_("No data to parse…")))
+
+    deduplication_window = AppSettings.INTELTOOL_DEDUPLICATION_WINDOW
+
+    if deduplication_window:
+        cache_key = _get_scan_digest_cache_key(scan_data=scan_data)
+        scan_hash = _get_recent_scan_hash(cache_key=cache_key)
+
+        if scan_hash is not None:
+            logger.debug(f"Same intel was parsed recently, returning scan {scan_hash}")
+
+            return scan_hash, False
+
+    new_scan = Scan(scan_type=Scan.Type.PENDING)
     new_scan.raw_data = form_data
     new_scan.save()
 
-    return new_scan.hash
+    if deduplication_window:
+        cache.set(key=cache_key, value=new_scan.hash, timeout=deduplication_window)
+
+    return new_scan.hash, True
+
+
+def parse_pending_scan(scan_hash: str) -> None:
+    """
+    Parse the intel of a pending scan
+
+    The parsed sections are saved to the pending scan, which gets the intel type as
+    scan type. If the intel can't be parsed, the scan is marked as invalid and the
+    error is kept for a while, so the scan page can show it.
+
+    :param scan_hash: Hash of the pending Scan object
+    :type scan_hash: str
+    :return: None
+    :rtype: None
+    """
+
+    new_scan = Scan.objects.filter(  # pylint: disable=no-member
+        pk=scan_hash, scan_type=Scan.Type.PENDING
+    ).first()
+
+    if new_scan is None:
+        logger.debug(msg=f"Scan {scan_hash} is not pending (anymore), skipping…")
+
+        return
+
+    try:
+        _parse_to_scan(new_scan=new_scan, scan_data=new_scan.raw_data.splitlines())
+
+    # Catching every exception, the scan must not stay pending forever
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.info(msg=f"Scan {scan_hash} could not be parsed ({exc})")
+
+        Scan.objects.filter(pk=scan_hash).update(  # pylint: disable=no-member
+            scan_type=Scan.Type.INVALID
+        )
+        cache.set(
+            key=f"{SCAN_ERROR_CACHE_KEY_PREFIX}:{scan_hash}",
+            value=str(exc),
+            timeout=SCAN_ERROR_CACHE_TTL,
+        )
+
+
+def get_scan_error(scan_hash: str) -> str | None:
+    """
+    Get the error of a scan that could not be parsed in the background
+
+    :param scan_hash: Hash of the Scan object
+    :type scan_hash: str
+    :return: The error, or None if there is none (anymore)
+    :rtype: str | None
+    """
+
+    return cache.get(key=f"{SCAN_ERROR_CACHE_KEY_PREFIX}:{scan_hash}")
@@ -2,36 +2,57 @@
 DB helper for our parser
 """
 
+# Standard Library
+from contextvars import ContextVar
+
+# Django
+from django.db import transaction
+
 # AA Intel Tool
+from aa_intel_tool.helper.parse_stats import parse_stage
 from aa_intel_tool.models import Scan, ScanData
 
+# The scan the parsed data is saved to, instead of a new, empty scan. Either a new
+# scan with the raw data, or a pending scan, when intel is parsed in the background.
+target_scan: ContextVar[Scan | None] = ContextVar("target_scan", default=None)
+
 
 def safe_scan_to_db(scan_type: Scan.Type, parsed_data: dict) -> Scan:
     """
     Saving scan data to the DB
 
+    The scan and all its sections are saved in one transaction, with a fixed number
+    of queries. When a target scan is set, the data is saved to it.
+
     :param scan_type: The type of the scan being saved
     :type scan_type: Scan.Type
     :param parsed_data: The parsed data to be saved, structured as a dict with section names as keys and dicts with 'section' and 'data' as values
     :type parsed_data: dict
-    :return: The created Scan object
+    :return: The created (or target) Scan object
     :rtype: Scan
     """
 
-    # Creating a new Scan object and saving it
-    new_scan = Scan.objects.create(scan_type=scan_type)
-
-    # Creating and saving the associated ScanData objects
-    ScanData.objects.bulk_create(
-        [
-            ScanData(
-                scan=new_scan,
-                section=scan_data["section"],
-                processed_data=scan_data["data"],
-            )
-            for scan_data in parsed_data.values()
-        ]
-    )
+    new_scan = target_scan.get() or Scan()
+    new_scan.scan_type = scan_type
+
+    with parse_stage(name="db_write"), transaction.atomic():
+        # Saving the Scan object, a pending scan only gets its scan type
+        if new_scan._state.adding:  # pylint: disable=protected-access
+            new_scan.save()
+        else:
+            new_scan.save(update_fields=["scan_type"])
+
+        # Creating and saving the associated ScanData objects
+        ScanData.objects.bulk_create(
+            [
+                ScanData(
+                    scan=new_scan,
+                    section=scan_data["section"],
+                    processed_data=scan_data["data"],
+                )
+                for scan_data in parsed_data.values()
+            ]
+        )
 
     # Return the Scan object
     return new_scan
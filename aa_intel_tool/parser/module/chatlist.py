@@ -3,7 +3,9 @@ Chat list parser
 """
 
 # Standard Library
+import re
 from collections import defaultdict
+from collections.abc import Iterable
 
 # Django
 from django.db.models import QuerySet
@@ -20,63 +22,189 @@ from aa_intel_tool.app_settings import AppSettings
 from aa_intel_tool.exceptions import ParserError
 from aa_intel_tool.helper.data_structure import dict_to_list
 from aa_intel_tool.helper.eve_character import (
+    clean_character_name,
     create_characters,
     fetch_character_ids_from_esi,
+    normalize_character_name,
 )
-from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.helper.parse_stats import add_parse_count, parse_stage
+from aa_intel_tool.models import CharacterName, Scan, ScanData
 from aa_intel_tool.parser.helper.db import safe_scan_to_db
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
 
-def _get_character_info(scan_data: list) -> QuerySet[EveCharacter]:
+def has_line_structure(line: str) -> bool:
     """
-    Get Eve character information and affiliation from a list of character names
+    Cheap structural check if a line can be a chat list line
+
+    A chat list line is a single character name, so it has between 3 and 37 characters
+    and no tabs.
+
+    :param line: A line of the scan data
+    :type line: str
+    :return: True if the line can be a chat list line, False otherwise
+    :rtype: bool
+    """
+
+    return 3 <= len(line) <= 37 and "\t" not in line
+
+
+def _index_by_normalized_name(
+    eve_characters: Iterable[EveCharacter],
+) -> dict[str, EveCharacter]:
+    """
+    Index EveCharacter objects by their normalized name
+
+    :param eve_characters: EveCharacter objects to index
+    :type eve_characters: Iterable[EveCharacter]
+    :return: Dictionary of normalized name => EveCharacter
+    :rtype: dict[str, EveCharacter]
+    """
+
+    return {
+        normalize_character_name(name=eve_character.character_name): eve_character
+        for eve_character in eve_characters
+    }
+
+
+def _unique_characters(eve_characters: Iterable[EveCharacter]) -> list[EveCharacter]:
+    """
+    Drop repeated characters, a character can be requested by more than one name
+    (e.g. before and after a rename)
+
+    :param eve_characters: EveCharacter objects
+    :type eve_characters: Iterable[EveCharacter]
+    :return: List of EveCharacter objects, each character once
+    :rtype: list[EveCharacter]
+    """
+
+    return list(
+        {
+            eve_character.character_id: eve_character
+            for eve_character in eve_characters
+        }.values()
+    )
+
+
+def _get_characters_by_name(scan_data: list) -> dict[str, EveCharacter]:
+    """
+    Get Eve character information and affiliation from a list of character names,
+    keyed by the normalized name as requested
+
+    The names are normalized (whitespace collapsed, case folded), so known characters
+    are found locally, no matter how they were pasted. Names pasted in another case
+    than they are stored in (or old names of renamed characters) are found through
+    CharacterName. The known characters are fetched in one query, only the missing
+    names are resolved through ESI.
+
+    The key is the requested name, not the current name of the character, which
+    differs for renamed characters.
 
     :param scan_data: List of character names to get information for
     :type scan_data: list
-    :return: QuerySet of EveCharacter objects matching the character names in the scan data
-    :rtype: QuerySet[EveCharacter]
+    :return: Dictionary of normalized requested name => EveCharacter, for all names that could be resolved
+    :rtype: dict[str, EveCharacter]
     """
 
+    add_parse_count(name="characters", value=len(scan_data))
+
+    # Normalized name => cleaned name, as pasted
+    character_names = {}
+
+    for name in scan_data:
+        character_names.setdefault(
+            normalize_character_name(name=name), clean_character_name(name=name)
+        )
+
     # Excluding corporation_id=1000001 (Doomheim) to potentially force an update here…
-    eve_characters = EveCharacter.objects.filter(character_name__in=scan_data).exclude(
-        corporation_id=1000001
+    eve_characters = _index_by_normalized_name(
+        EveCharacter.objects.filter(
+            character_name__in=list(character_names.values())
+        ).exclude(corporation_id=1000001)
     )
 
-    # Check if we have to bother ESI or if we have all characters already
-    if len(scan_data) != eve_characters.count():
-        existing_character_names = set(
-            eve_characters.values_list("character_name", flat=True)
+    # Names pasted in another case than they are stored in, resolved to their
+    # character IDs through the (indexed) normalized names ESI resolved before
+    missing_names = character_names.keys() - eve_characters.keys()
+
+    if missing_names:
+        character_ids_by_name = dict(
+            CharacterName.objects.filter(normalized_name__in=missing_names).values_list(
+                "normalized_name", "character_id"
+            )
         )
 
-        characters_to_fetch = set(scan_data) - existing_character_names
+        if character_ids_by_name:
+            characters_by_id = {
+                eve_character.character_id: eve_character
+                for eve_character in EveCharacter.objects.filter(
+                    character_id__in=set(character_ids_by_name.values())
+                ).exclude(corporation_id=1000001)
+            }
+
+            # Keyed by the requested name, the character might have been renamed
+            eve_characters.update(
+                {
+                    normalized_name: characters_by_id[character_id]
+                    for normalized_name, character_id in character_ids_by_name.items()
+                    if character_id in characters_by_id
+                }
+            )
+
+    # Check if we have to bother ESI or if we have all characters already
+    characters_to_fetch = {
+        character_names[normalized_name]
+        for normalized_name in character_names.keys() - eve_characters.keys()
+    }
+
+    if characters_to_fetch:
         logger.debug(
             f"{len(characters_to_fetch)} character(s) need to be fetched from ESI"
         )
 
-        fetched_characters = fetch_character_ids_from_esi(
-            characters_to_fetch=characters_to_fetch
-        )
+        with parse_stage(name="esi"):
+            fetched_characters = fetch_character_ids_from_esi(
+                characters_to_fetch=characters_to_fetch
+            )
 
+        add_parse_count(name="characters_fetched", value=len(fetched_characters))
         logger.debug(f"Fetched character data from ESI: {fetched_characters}")
 
         if len(fetched_characters) > 0:
-            new_eve_characters = create_characters(
-                character_data_from_esi=fetched_characters
-            )
+            with parse_stage(name="esi"):
+                new_eve_characters = list(
+                    create_characters(character_data_from_esi=fetched_characters)
+                )
 
             logger.debug(
                 f"Created {len(new_eve_characters)} new EveCharacter object(s) from ESI data."
             )
 
             # Combine existing and new characters
-            eve_characters = eve_characters | new_eve_characters
+            eve_characters.update(_index_by_normalized_name(new_eve_characters))
 
     return eve_characters
 
 
+def _get_character_info(scan_data: list) -> list[EveCharacter]:
+    """
+    Get Eve character information and affiliation from a list of character names
+
+    See `_get_characters_by_name()`.
+
+    :param scan_data: List of character names to get information for
+    :type scan_data: list
+    :return: List of EveCharacter objects matching the character names in the scan data, each character once
+    :rtype: list[EveCharacter]
+    """
+
+    return _unique_characters(
+        eve_characters=_get_characters_by_name(scan_data=scan_data).values()
+    )
+
+
 def _get_unaffiliated_alliance_info() -> dict:
     """
     Get the alliance_info dict for characters that are in no alliance
@@ -199,13 +327,15 @@ def _parse_character_info(eve_character: EveCharacter) -> dict:
     }
 
 
-def _parse_chatscan_data(eve_characters: QuerySet[EveCharacter]) -> dict:
+def _parse_chatscan_data(
+    eve_characters: QuerySet[EveCharacter] | list[EveCharacter],
+) -> dict:
     """
     Parse the chat scan data and return character information,
     corporation information and alliance information for each character
 
-    :param eve_characters: A QuerySet of EveCharacter objects to parse the information from
-    :type eve_characters: QuerySet[EveCharacter]
+    :param eve_characters: A QuerySet or list of EveCharacter objects to parse the information from
+    :type eve_characters: QuerySet[EveCharacter] | list[EveCharacter]
     :return: A dict with three keys: 'pilots', 'corporations' and 'alliances'. Each key contains a list of dicts with the respective information for each character, corporation and alliance in the chat scan.
     :rtype: dict
     """
@@ -248,17 +378,22 @@ def _parse_chatscan_data(eve_characters: QuerySet[EveCharacter]) -> dict:
 
 
 def parse(
-    scan_data: list, safe_to_db: bool = True, ignore_limit: bool = False
+    scan_data: list,
+    safe_to_db: bool = True,
+    ignore_limit: bool = False,
+    eve_characters: list[EveCharacter] | None = None,
 ) -> Scan | dict:
     """
     Parse chat list
 
-    :param scan_data: List of character names to parse the chat list for
+    :param scan_data: List of character names to parse the chat list for, either as string or as already matched line
     :type scan_data: list
     :param safe_to_db: Whether the parsed data is safe to be saved to the database (i.e. whether it has been validated and cleaned). If True, the parsed data will be saved to the database and a Scan object will be returned. If False, the parsed data will not be saved to the database and a dict with the parsed data will be returned instead.
     :type safe_to_db: bool
     :param ignore_limit: Whether to ignore the maximum allowed number of pilots in a chat scan. If True, the parser will not check if the number of pilots in the scan exceeds the maximum allowed number and will parse the data regardless. If False, the parser will check if the number of pilots in the scan exceeds the maximum allowed number and will throw a ParserError if it does.
     :type ignore_limit: bool
+    :param eve_characters: Already resolved EveCharacter objects for the character names. If None, they will be resolved here.
+    :type eve_characters: list[EveCharacter] | None
     :return: A Scan object containing the parsed chat list data if safe_to_db is True, or a dict with the parsed chat list data if safe_to_db is False
     :rtype: Scan | dict
     """
@@ -267,6 +402,10 @@ def parse(
     if not AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN:
         raise ParserError(message=str(_("The chat list module is currently disabled.")))
 
+    scan_data = [
+        entry.group() if isinstance(entry, re.Match) else entry for entry in scan_data
+    ]
+
     logger.debug(msg=f"{len(scan_data)} name(s) to work through…")
 
     pilots_in_scan = len(scan_data)
@@ -290,7 +429,9 @@ def parse(
             ).format(max_allowed_pilots=max_allowed_pilots)
         )
 
-    eve_characters = _get_character_info(scan_data=scan_data)
+    if eve_characters is None:
+        eve_characters = _get_character_info(scan_data=scan_data)
+
     logger.debug(msg=f"Got {len(eve_characters)} EveCharacter object(s) back from AA…")
 
     # Parse the data
@@ -6,11 +6,7 @@ D-Scan parser
 import re
 from collections import defaultdict
 
-# Third Party
-from eve_sde.models import ItemType
-
 # Django
-from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
@@ -21,36 +17,34 @@ from allianceauth.services.hooks import get_extension_logger
 from aa_intel_tool.app_settings import AppSettings, EVECategory, UpwellStructureId
 from aa_intel_tool.exceptions import ParserError
 from aa_intel_tool.helper.data_structure import dict_to_list
+from aa_intel_tool.helper.eve_type import get_eve_types
 from aa_intel_tool.models import Scan, ScanData
 from aa_intel_tool.parser.helper.db import safe_scan_to_db
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
+# Thousands separators used by the different client languages (e.g. "1,234 km",
+# "1.234 km", "444 141 км"), so the distance value can be converted with a single
+# str.translate() call.
+_DISTANCE_SEPARATORS = str.maketrans("", "", " .,\u00a0\u202f'")
+
 
-def _is_on_grid(distance: str) -> bool:
+def has_line_structure(line: str) -> bool:
     """
-    Determine if something is "on grid" or not
+    Cheap structural check if a line can be a D-Scan line
 
-    :param distance: The distance string from the D-Scan entry (e.g. "0 m", "12.345 km", "100 km", "Local (0 m)")
-    :type distance: str
-    :return: True if the distance is within the grid size, False otherwise
+    A D-Scan line starts with the numeric item ID and has at least 3 tabs.
+
+    :param line: A line of the scan data
+    :type line: str
+    :return: True if the line can be a D-Scan line, False otherwise
     :rtype: bool
     """
 
-    # AA Intel Tool
-    from aa_intel_tool.constants import (  # pylint: disable=import-outside-toplevel
-        RegexPattern,
-    )
-
-    # Check if we have a distance
-    match = re.search(pattern=RegexPattern.LOCALISED_ON_GRID.value, string=distance)
+    item_id, _tab, rest = line.partition("\t")
 
-    # Check if the distance is within the grid size
-    return (
-        bool(match)
-        and int(re.sub(r"\D", "", distance)) <= AppSettings.INTELTOOL_DSCAN_GRID_SIZE
-    )
+    return item_id.isdecimal() and rest.count("\t") >= 2
 
 
 def _get_type_info_dict(eve_type: tuple) -> dict:
@@ -77,7 +71,27 @@ def _get_type_info_dict(eve_type: tuple) -> dict:
     }
 
 
-def _get_ships(eve_types: QuerySet, counter: dict) -> dict:
+def _get_eve_types_by_category(eve_types: list) -> dict:
+    """
+    Partition the eve_types by their category ID
+
+    eve_type[5] = Category ID
+
+    :param eve_types: A list containing the eve_types of the D-Scan
+    :type eve_types: list
+    :return: A dictionary with the category ID as key and a list of eve_types as value
+    :rtype: dict
+    """
+
+    eve_types_by_category = defaultdict(list)
+
+    for eve_type in eve_types:
+        eve_types_by_category[eve_type[5]].append(eve_type)
+
+    return eve_types_by_category
+
+
+def _get_ships(eve_types: list, counter: dict) -> dict:
     """
     Get the ships
     This will be the content of the following tables in the D-Scan view:
@@ -86,8 +100,8 @@ def _get_ships(eve_types: QuerySet, counter: dict) -> dict:
     » Off Grid
     » Ship Types
 
-    :param eve_types: A queryset containing the eve_types of the ships in the D-Scan
-    :type eve_types: QuerySet
+    :param eve_types: A list containing the eve_types of the ships in the D-Scan
+    :type eve_types: list
     :param counter: A dictionary containing the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid"
     :type counter: dict
     :return: A dictionary containing the ship information for the D-Scan tables
@@ -124,10 +138,10 @@ def _get_ships(eve_types: QuerySet, counter: dict) -> dict:
     #   - eve_type[2] = Group ID
     #   - eve_type[3] = Group Name
     #   - eve_type[4] = Mass
-    eve_types_ships = eve_types.filter(group__category_id__exact=EVECategory.SHIP)
-
+    #   - eve_type[5] = Category ID
+    #
     # Loop through all ships types
-    for eve_type in list(eve_types_ships):
+    for eve_type in eve_types:
         # Info for "All Ships" table
         if eve_type[0] in counter["all"]:
             _add_ship_info(
@@ -172,13 +186,13 @@ def _get_ships(eve_types: QuerySet, counter: dict) -> dict:
 
 
 def _get_upwell_structures_on_grid(
-    eve_types: QuerySet, counter: dict, ansiblex_destination: str = None
+    eve_types: list, counter: dict, ansiblex_destination: str = None
 ) -> list:
     """
     Get all Upwell structures that are on grid
 
-    :param eve_types: A queryset containing the eve_types of the structures in the D-Scan
-    :type eve_types: QuerySet
+    :param eve_types: A list containing the eve_types of the structures in the D-Scan
+    :type eve_types: list
     :param counter: A dictionary containing the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid"
     :type counter: dict
     :param ansiblex_destination: The destination system of the Ansiblex Jump Gate, if it is present in the D-Scan
@@ -187,10 +201,6 @@ def _get_upwell_structures_on_grid(
     :rtype: list
     """
 
-    eve_types_structures = eve_types.filter(
-        group__category_id__exact=EVECategory.STRUCTURE
-    )
-
     upwell_structures = {
         eve_type[1]: {
             **_get_type_info_dict(eve_type=eve_type),
@@ -202,63 +212,55 @@ def _get_upwell_structures_on_grid(
                 else eve_type[1]
             ),
         }
-        for eve_type in list(eve_types_structures)
+        for eve_type in eve_types
         if eve_type[0] in counter["ongrid"]
     }
 
     return dict_to_list(input_dict=upwell_structures)
 
 
-def _get_deployables_on_grid(eve_types: QuerySet, counter: dict) -> list:
+def _get_deployables_on_grid(eve_types: list, counter: dict) -> list:
     """
     Get all deployables that are on grid
 
-    :param eve_types: A queryset containing the eve_types of the deployables in the D-Scan
-    :type eve_types: QuerySet
+    :param eve_types: A list containing the eve_types of the deployables in the D-Scan
+    :type eve_types: list
     :param counter: A dictionary containing the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid"
     :type counter: dict
     :return: A list containing the deployables that are on grid in the D-Scan
     :rtype: list
     """
 
-    eve_types_deployables = eve_types.filter(
-        group__category_id__exact=EVECategory.DEPLOYABLE
-    )
-
     deployables = {
         eve_type[1]: {
             **_get_type_info_dict(eve_type=eve_type),
             "count": counter["ongrid"][eve_type[0]],
         }
-        for eve_type in list(eve_types_deployables)
+        for eve_type in eve_types
         if eve_type[0] in counter["ongrid"]
     }
 
     return dict_to_list(input_dict=deployables)
 
 
-def _get_starbases_on_grid(eve_types: QuerySet, counter: dict) -> list:
+def _get_starbases_on_grid(eve_types: list, counter: dict) -> list:
     """
     Get all starbases and starbase modules that are on grid
 
-    :param eve_types: A queryset containing the eve_types of the starbases and starbase modules in the D-Scan
-    :type eve_types: QuerySet
+    :param eve_types: A list containing the eve_types of the starbases and starbase modules in the D-Scan
+    :type eve_types: list
     :param counter: A dictionary containing the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid"
     :type counter: dict
     :return: A list containing the starbases and starbase modules that are on grid in the D-Scan
     :rtype: list
     """
 
-    eve_types_starbase = eve_types.filter(
-        group__category_id__exact=EVECategory.STARBASE
-    )
-
     starbases = {
         eve_type[1]: {
             **_get_type_info_dict(eve_type=eve_type),
             "count": counter["ongrid"][eve_type[0]],
         }
-        for eve_type in list(eve_types_starbase)
+        for eve_type in eve_types
         if eve_type[0] in counter["ongrid"]
     }
 
@@ -280,14 +282,25 @@ def _get_ansiblex_jumpgate_destination(ansiblex_name: str) -> str:
     )[1]
 
 
-def _get_scan_details(scan_data: list) -> tuple:
+def _tokenize(scan_data: list) -> list[tuple]:
     """
-    Split the D-Scan data into more convenient parts
+    Tokenize the D-Scan data in a single pass
 
-    :param scan_data: A list containing the lines of the D-Scan data
+    Every line is matched once against the pre-compiled D-Scan pattern, which splits it
+    into its parts and already tells us if the distance unit is an "on grid" one.
+
+    Token:
+      - token[0] = Item ID
+      - token[1] = Name
+      - token[2] = Ship Class / Structure Type
+      - token[3] = Distance value (without unit), or None if not available (e.g. "-")
+      - token[4] = Distance unit, or None if not available
+      - token[5] = On grid (True/False)
+
+    :param scan_data: A list containing the lines of the D-Scan data, either as string or as already matched line
     :type scan_data: list
-    :return: A tuple containing the Ansiblex Jump Gate destination system (if present), a counter dictionary with the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid", and a dictionary containing lists of eve_type IDs for "all", "ongrid" and "offgrid"
-    :rtype: tuple
+    :return: A list of tuples, one per D-Scan line
+    :rtype: list[tuple]
     """
 
     # AA Intel Tool
@@ -295,39 +308,86 @@ def _get_scan_details(scan_data: list) -> tuple:
         RegexPattern,
     )
 
-    ansiblex_destination = None
-    counter = defaultdict(lambda: defaultdict(int))
-    eve_ids = defaultdict(list)
+    match_line = RegexPattern.DSCAN.value.match
+    grid_size = AppSettings.INTELTOOL_DSCAN_GRID_SIZE
+    tokens = []
 
-    # Let's split this list up
-    #
-    # line.group(1) => Item ID
-    # line.group(2) => Name
-    # line.group(3) => Ship Class / Structure Type
-    # line.group(4) => Distance
-    #
-    # Loop through all lines
     for entry in scan_data:
         # Apparently you can copy/paste a tab into the ship name, which will cause the split by tab to fail.
         # The regex is detecting the D-Scan correctly though. But splitting by tab might put the ship class as distance.
         # See https://github.com/ppfeufer/aa-intel-tool/issues/82
         #
-        # This is why we use re.search() to get the parts of the D-Scan entry, instead of re-split()
+        # This is why we use the regex to get the parts of the D-Scan entry, instead of str.split()
         #
         # Thanks CCP for sanitizing your inputs! 😂
-        line = re.search(pattern=RegexPattern.DSCAN.value, string=entry)
-        entry_id = int(line.group(1))
+        line = entry if isinstance(entry, re.Match) else match_line(entry)
+
+        if line is None:
+            raise ParserError(
+                message=str(
+                    _(
+                        "No suitable parser found. Input is not a supported intel type or malformed…"
+                    )
+                )
+            )
+
+        entry_id, name, eve_type, value, on_grid_unit, off_grid_unit = line.groups()
+        distance = None
+
+        if value is not None:
+            digits = value.translate(_DISTANCE_SEPARATORS)
+
+            # Fall back to stripping everything that isn't a digit
+            if not digits.isdecimal():
+                digits = "".join(filter(str.isdecimal, value))
+
+            if digits:
+                distance = int(digits)
+
+        tokens.append(
+            (
+                int(entry_id),
+                name,
+                eve_type,
+                distance,
+                on_grid_unit or off_grid_unit,
+                on_grid_unit is not None
+                and distance is not None
+                and distance <= grid_size,
+            )
+        )
+
+    return tokens
+
+
+def _get_scan_details(scan_data: list) -> tuple:
+    """
+    Split the D-Scan data into more convenient parts
+
+    :param scan_data: A list containing the lines of the D-Scan data
+    :type scan_data: list
+    :return: A tuple containing the Ansiblex Jump Gate destination system (if present), a counter dictionary with the counts of each eve_type in the D-Scan, split by "all", "ongrid" and "offgrid", and a dictionary containing lists of eve_type IDs for "all", "ongrid" and "offgrid"
+    :rtype: tuple
+    """
+
+    ansiblex_destination = None
+    counter = defaultdict(lambda: defaultdict(int))
+    eve_ids = defaultdict(list)
 
+    # Loop through all tokenized lines
+    for entry_id, name, _eve_type, _distance, _unit, on_grid in _tokenize(
+        scan_data=scan_data
+    ):
         counter["all"][entry_id] += 1
 
         # Check if the entry is "on grid" or not
-        if _is_on_grid(distance=line.group(4)):
+        if on_grid:
             counter["ongrid"][entry_id] += 1
 
             # If it is an Ansiblex Jump Gate, get its destination system
             if entry_id == UpwellStructureId.ANSIBLEX_JUMP_GATE:
                 ansiblex_destination = _get_ansiblex_jumpgate_destination(
-                    ansiblex_name=line.group(2)
+                    ansiblex_name=name
                 )
 
             eve_ids["ongrid"].append(entry_id)
@@ -357,21 +417,28 @@ def parse(scan_data: list) -> Scan:
     parsed_data = {}
     ansiblex_destination, counter, eve_ids = _get_scan_details(scan_data=scan_data)
 
-    eve_types = ItemType.objects.filter(id__in=set(eve_ids["all"])).values_list(
-        "pk", "name", "group__pk", "group__name", "mass", named=True
-    )
+    # Resolve all eve_types from the SDE type index and partition them by category
+    eve_types = get_eve_types(type_ids=eve_ids["all"])
 
-    logger.debug(f"EVE Types for D-Scan: {list(eve_types)}")
+    logger.debug(f"EVE Types for D-Scan: {eve_types}")
+
+    eve_types_by_category = _get_eve_types_by_category(eve_types=eve_types)
 
     # Parse the data parts
-    ships = _get_ships(eve_types=eve_types, counter=counter)
+    ships = _get_ships(
+        eve_types=eve_types_by_category[EVECategory.SHIP], counter=counter
+    )
     upwell_structures = _get_upwell_structures_on_grid(
-        eve_types=eve_types,
+        eve_types=eve_types_by_category[EVECategory.STRUCTURE],
         counter=counter,
         ansiblex_destination=ansiblex_destination,
     )
-    deployables = _get_deployables_on_grid(eve_types=eve_types, counter=counter)
-    starbases = _get_starbases_on_grid(eve_types=eve_types, counter=counter)
+    deployables = _get_deployables_on_grid(
+        eve_types=eve_types_by_category[EVECategory.DEPLOYABLE], counter=counter
+    )
+    starbases = _get_starbases_on_grid(
+        eve_types=eve_types_by_category[EVECategory.STARBASE], counter=counter
+    )
 
     # Add parsed data when available
     sections = {
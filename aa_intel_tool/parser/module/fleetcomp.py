@@ -5,30 +5,72 @@ Fleet composition parser
 # Standard Library
 import re
 
-# Third Party
-from eve_sde.models import ItemType
-
 # Django
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
 from allianceauth.eveonline.evelinks import eveimageserver, evewho, zkillboard
+from allianceauth.eveonline.models import EveCharacter
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Intel Tool
 from aa_intel_tool.app_settings import AppSettings
 from aa_intel_tool.exceptions import ParserError
 from aa_intel_tool.helper.data_structure import dict_to_list
+from aa_intel_tool.helper.eve_character import normalize_character_name
+from aa_intel_tool.helper.eve_type import get_eve_types_by_name
 from aa_intel_tool.models import Scan, ScanData
 from aa_intel_tool.parser.helper.db import safe_scan_to_db
-from aa_intel_tool.parser.module.chatlist import _get_character_info
+from aa_intel_tool.parser.module.chatlist import (
+    _get_characters_by_name,
+    _unique_characters,
+)
 from aa_intel_tool.parser.module.chatlist import parse as parse_pilots
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
+# Valid skill levels in the skills column (FC - WC - SC)
+SKILL_LEVELS = frozenset("012345")
+
+
+def _is_skills_column(column: str) -> bool:
+    """
+    Check if a column is the skills column (e.g. "5 - 5 - 5")
+
+    :param column: A column of a fleet composition line
+    :type column: str
+    :return: True if the column is the skills column, False otherwise
+    :rtype: bool
+    """
+
+    skill_levels = column.split(" - ")
+
+    return len(skill_levels) == 3 and all(
+        skill_level in SKILL_LEVELS for skill_level in skill_levels
+    )
+
+
+def has_line_structure(line: str) -> bool:
+    """
+    Cheap structural check if a line can be a fleet composition line
 
-def get_fleet_composition(pilots: dict, ships: dict) -> dict:
+    A fleet composition line has the skills column after at least 5 other columns.
+
+    :param line: A line of the scan data
+    :type line: str
+    :return: True if the line can be a fleet composition line, False otherwise
+    :rtype: bool
+    """
+
+    return any(_is_skills_column(column=column) for column in line.split("\t")[5:])
+
+
+def get_fleet_composition(
+    pilots: dict,
+    ships: dict,
+    characters_by_name: dict[str, EveCharacter] | None = None,
+) -> dict:
     """
     Get the fleet composition
 
@@ -36,17 +78,20 @@ def get_fleet_composition(pilots: dict, ships: dict) -> dict:
     :type pilots: dict
     :param ships: Dictionary of ships with their respective class and type counts
     :type ships: dict
+    :param characters_by_name: Already resolved EveCharacter objects for the pilots, keyed by the normalized pilot name. If None, they will be resolved here.
+    :type characters_by_name: dict[str, EveCharacter] | None
     :return: Dictionary with fleet composition details
     :rtype: dict
     """
 
-    # Get ship class details from DB
-    ship_class_details = ItemType.objects.filter(name__in=ships["class"]).values_list(
-        "pk", "name", "group__pk", "group__name", "mass", named=True
-    )
+    # Get ship class details from the SDE type index, indexed by ship class name
+    ship_class_details = {
+        ship_class.name: ship_class
+        for ship_class in get_eve_types_by_name(names=ships["class"])
+    }
 
     # Build ship class and type dictionaries
-    for ship_class in list(ship_class_details):
+    for ship_class in ship_class_details.values():
         # Build ship class dict
         ships["class"][ship_class.name].update(
             {
@@ -68,17 +113,25 @@ def get_fleet_composition(pilots: dict, ships: dict) -> dict:
         )
 
     # Pilots
-    pilot_details = _get_character_info(scan_data=list(pilots))
+    if characters_by_name is None:
+        characters_by_name = _get_characters_by_name(scan_data=list(pilots))
+
+    # The pilots are resolved by their normalized name
+    pilots_by_name = {
+        normalize_character_name(name=name): pilot for name, pilot in pilots.items()
+    }
 
     # Build pilots dictionary
-    for pilot in list(pilot_details):
-        pilot_ship_class = next(
-            ship_class
-            for ship_class in ship_class_details
-            if ship_class.name == pilots[pilot.character_name]["ship"]
-        )
+    # Joined on the pasted name, the current name differs for renamed pilots
+    for normalized_name, pilot in characters_by_name.items():
+        pilot_info = pilots_by_name.get(normalized_name)
+
+        if pilot_info is None:
+            continue
 
-        pilots[pilot.character_name].update(
+        pilot_ship_class = ship_class_details[pilot_info["ship"]]
+
+        pilot_info.update(
             {
                 "id": pilot.character_id,
                 "portrait": pilot.portrait_url_32,
@@ -96,16 +149,21 @@ def get_fleet_composition(pilots: dict, ships: dict) -> dict:
     }
 
 
-def parse_line(line) -> list:
+def parse_line(line: str | re.Match) -> list:
     """
     Parse a line from the fleet composition scan
 
-    :param line: A line from the fleet composition scan
-    :type line: str
+    :param line: A line from the fleet composition scan, either as string or as already matched line
+    :type line: str | re.Match
     :return: A list containing the parsed line data
     :rtype: list
     """
 
+    # Already matched lines come with their columns as regex groups
+    # (group 7 is the optional tab + wing name, group 8 the wing name itself)
+    if isinstance(line, re.Match):
+        return [*line.group(1, 2, 3, 4, 5, 6), line.group(8) or ""]
+
     # Let's split this list up
     #
     # line[0] => Pilot Name
@@ -150,9 +208,21 @@ def handle_fleet_composition_and_participation(pilots: dict, ships: dict) -> tup
     :rtype: tuple
     """
 
-    fleet_composition = get_fleet_composition(pilots=pilots, ships=ships)
+    # Resolve the pilots only once, for both the fleet composition and the participation
+    characters_by_name = _get_characters_by_name(scan_data=list(pilots))
+
+    fleet_composition = get_fleet_composition(
+        pilots=pilots, ships=ships, characters_by_name=characters_by_name
+    )
     participation = (
-        parse_pilots(scan_data=list(set(pilots)), safe_to_db=False, ignore_limit=True)
+        parse_pilots(
+            scan_data=list(pilots),
+            safe_to_db=False,
+            ignore_limit=True,
+            eve_characters=_unique_characters(
+                eve_characters=characters_by_name.values()
+            ),
+        )
         if AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN
         else None
     )
@@ -164,7 +234,7 @@ def parse(scan_data: list) -> Scan:
     """
     Parse the fleet composition scan
 
-    :param scan_data: List of lines from the fleet composition scan
+    :param scan_data: List of lines from the fleet composition scan, either as string or as already matched line
     :type scan_data: list
     :return: Scan object containing the parsed fleet composition data
     :rtype: Scan
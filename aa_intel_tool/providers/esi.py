@@ -21,6 +21,7 @@ from aa_intel_tool import (
     __github_url__,
     __version__,
 )
+from aa_intel_tool.helper.metrics import inc_counter
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
@@ -83,6 +84,7 @@ class ESIHandler:
         )
 
         response: Response | None = None
+        result = "ok"
 
         try:
             # Call operation.result differently depending on whether the caller
@@ -115,16 +117,25 @@ class ESIHandler:
             )
 
             esi_result = None
+            result = "not_modified"
         except ContentTypeError:
             logger.warning(
                 msg="ESI returned gibberish (ContentTypeError) - Skipping update."
             )
 
             esi_result = None
+            result = "content_type_error"
         except (HTTPClientError, RequestError) as exc:
             logger.error(msg=f"Error while fetching data from ESI: {str(exc)}")
 
             esi_result = None
+            result = "error"
+
+        inc_counter(
+            name="aa_intel_tool_esi_requests_total",
+            operation=operation.operation.operationId,
+            result=result,
+        )
 
         # If caller requested the raw response, return a tuple (result, response)
         if return_response:
@@ -1,4 +1,4 @@
-/* global _getAaIntelToolJsSettings, _toggleChatscanStickyHighlight, bootstrapTooltip, fetchGet, pilotInfoPanel, corporationInfoPanel, allianceInfoPanel, _removeSearchFromColumnControl, DataTable */
+/* global _getAaIntelToolJsSettings, _toggleChatscanStickyHighlight, bootstrapTooltip, fetchScanData, pilotInfoPanel, corporationInfoPanel, allianceInfoPanel, _removeSearchFromColumnControl, DataTable */
 
 $(document).ready(() => {
     'use strict';
@@ -30,7 +30,7 @@ $(document).ready(() => {
      * Create the DataTable.
      *
      * @param table
-     * @param url
+     * @param section
      * @param loadingClass
      * @param emptyClass
      * @param containerClass
@@ -45,7 +45,7 @@ $(document).ready(() => {
      */
     const createDataTable = ({
         table,
-        url,
+        section,
         loadingClass,
         emptyClass,
         containerClass,
@@ -58,7 +58,8 @@ $(document).ready(() => {
         columnDefs,
         order
     }) => {
-        fetchGet({url})
+        fetchScanData(settings.url.getScanData)
+            .then((data) => data[section] || {})
             .then((tableData) => {
                 $(`div.${loadingClass}`).addClass('d-none');
 
@@ -112,7 +113,7 @@ $(document).ready(() => {
     // Create the alliances DataTable.
     createDataTable({
         table: elements.alliancesTable,
-        url: settings.url.getAllianceList,
+        section: 'alliancelist',
         loadingClass: 'aa-intel-loading-table-info-alliance-participation-list',
         emptyClass: 'aa-intel-empty-table-info-alliance-participation-list',
         containerClass: 'table-local-scan-alliances',
@@ -130,7 +131,7 @@ $(document).ready(() => {
     // Create the corporations DataTable.
     createDataTable({
         table: elements.corporationsTable,
-        url: settings.url.getCorporationList,
+        section: 'corporationlist',
         loadingClass: 'aa-intel-loading-table-info-corporation-participation-list',
         emptyClass: 'aa-intel-empty-table-info-corporation-participation-list',
         containerClass: 'table-local-scan-corporations',
@@ -151,7 +152,7 @@ $(document).ready(() => {
     // Create the pilots DataTable.
     createDataTable({
         table: elements.pilotsTable,
-        url: settings.url.getPilotList,
+        section: 'pilotlist',
         loadingClass: 'aa-intel-loading-table-info-pilot-participation-list',
         emptyClass: 'aa-intel-empty-table-info-pilot-participation-list',
         containerClass: 'table-local-scan-pilots',
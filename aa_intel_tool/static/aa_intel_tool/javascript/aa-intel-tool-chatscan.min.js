@@ -1,2 +1,4 @@
-$(document).ready(()=>{'use strict';const a=_getAaIntelToolJsSettings(),t={pilotsTable:$('table.aa-intel-pilot-participation-list'),corporationsTable:$('table.aa-intel-corporation-participation-list'),alliancesTable:$('table.aa-intel-alliance-participation-list'),pilotsTotalCount:$('span#aa-intel-pilots-count'),corporationsTotalCount:$('span#aa-intel-corporations-count'),alliancesTotalCount:$('span#aa-intel-alliances-count')},l=[[1,'desc'],[0,'asc']],i=[{target:0,createdCell:a=>$(a).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:a=>$(a).addClass('text-end'),columnControl:_removeSearchFromColumnControl(a.dataTables.columnControl,1)}],o=({table:t,url:o,loadingClass:e,emptyClass:n,containerClass:r,columns:s,rowClass:c,totalCountElement:p,rowAttributes:d,highlightType:C,tooltipSelector:u,columnDefs:g,order:m})=>{fetchGet({url:o}).then(o=>{if($(`div.${e}`).addClass('d-none'),!o||0===Object.keys(o).length)return void $(`div.${n}`).removeClass('d-none');$(`div.${r}`).removeClass('d-none');new DataTable(t,{...a.dataTables,data:o,paging:!1,language:a.language.dataTables,lengthChange:!1,columns:s,order:m||l,columnDefs:g||i,createdRow:(a,t)=>{if(p){const a=parseInt(p.html())||0;p.html(a+1)}$(a).addClass(c),d&&Object.entries(d(t)).forEach(([t,l])=>{$(a).attr(t,l)})},initComplete:()=>{_toggleChatscanStickyHighlight({element:$(`.${c}`),type:C}),u&&bootstrapTooltip({selector:u})}})}).catch(a=>console.error(`Error fetching data for ${c}:`,a))};o({table:t.alliancesTable,url:a.url.getAllianceList,loadingClass:'aa-intel-loading-table-info-alliance-participation-list',emptyClass:'aa-intel-empty-table-info-alliance-participation-list',containerClass:'table-local-scan-alliances',columns:[{data:a=>`${allianceInfoPanel(a)}<span class="d-none">${a.ticker||''}</span>`},{data:'count'}],rowClass:'aa-intel-alliance-participation-item',totalCountElement:t.alliancesTotalCount,rowAttributes:a=>({'data-alliance-id':a.id}),highlightType:'alliance',tooltipSelector:'.aa-intel-alliance-participation-list'}),o({table:t.corporationsTable,url:a.url.getCorporationList,loadingClass:'aa-intel-loading-table-info-corporation-participation-list',emptyClass:'aa-intel-empty-table-info-corporation-participation-list',containerClass:'table-local-scan-corporations',columns:[{data:a=>`${corporationInfoPanel(a)}<span class="d-none">${a.ticker||''}, ${a.alliance&&a.alliance.name||''}, ${a.alliance&&a.alliance.ticker||''}</span>`},{data:'count'}],rowClass:'aa-intel-corporation-participation-item',totalCountElement:t.corporationsTotalCount,rowAttributes:a=>({'data-corporation-id':a.id,'data-alliance-id':a.alliance&&a.alliance.id||''}),highlightType:'corporation',tooltipSelector:'.aa-intel-corporation-participation-list'}),o({table:t.pilotsTable,url:a.url.getPilotList,loadingClass:'aa-intel-loading-table-info-pilot-participation-list',emptyClass:'aa-intel-empty-table-info-pilot-participation-list',containerClass:'table-local-scan-pilots',columns:[{data:a=>pilotInfoPanel(a)},{data:a=>`${corporationInfoPanel(a.corporation||{},!0)}${a.corporation&&a.corporation.ticker||''}<span class="d-none">${a.corporation&&a.corporation.name||''}</span>`},{data:a=>`${allianceInfoPanel(a.alliance||{},!0)}${a.alliance&&a.alliance.ticker||''}<span class="d-none">${a.alliance&&a.alliance.name||''}</span>`}],order:[[0,'asc']],columnDefs:[{target:0,createdCell:a=>$(a).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:125},{target:2,width:125}],rowClass:'aa-intel-pilot-participation-item',totalCountElement:t.pilotsTotalCount,rowAttributes:a=>({'data-character-id':a.id,'data-corporation-id':a.corporation&&a.corporation.id||'','data-alliance-id':a.alliance&&a.alliance.id||''}),highlightType:'pilot',tooltipSelector:'.aa-intel-pilot-participation-list'})});
+$(document).ready(()=>{'use strict';const settings=_getAaIntelToolJsSettings();const elements={pilotsTable:$('table.aa-intel-pilot-participation-list'),corporationsTable:$('table.aa-intel-corporation-participation-list'),alliancesTable:$('table.aa-intel-alliance-participation-list'),pilotsTotalCount:$('span#aa-intel-pilots-count'),corporationsTotalCount:$('span#aa-intel-corporations-count'),alliancesTotalCount:$('span#aa-intel-alliances-count')};const defaultOrder=[[1,'desc'],[0,'asc']];const defaultColumnDefs=[{target:0,createdCell:(td)=>$(td).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:(td)=>$(td).addClass('text-end'),columnControl:_removeSearchFromColumnControl(settings.dataTables.columnControl,1)}];const createDataTable=({table,section,loadingClass,emptyClass,containerClass,columns,rowClass,totalCountElement,rowAttributes,highlightType,tooltipSelector,columnDefs,order})=>{fetchScanData(settings.url.getScanData).then((data)=>data[section]||{}).then((tableData)=>{$(`div.${loadingClass}`).addClass('d-none');if(!tableData||Object.keys(tableData).length===0){$(`div.${emptyClass}`).removeClass('d-none');return;}
+$(`div.${containerClass}`).removeClass('d-none');const dt=new DataTable(table,{...settings.dataTables,data:tableData,paging:false,language:settings.language.dataTables,lengthChange:false,columns:columns,order:order||defaultOrder,columnDefs:columnDefs||defaultColumnDefs,createdRow:(row,data)=>{if(totalCountElement){const currentTotal=parseInt(totalCountElement.html())||0;totalCountElement.html(currentTotal+1);}
+$(row).addClass(rowClass);if(rowAttributes){Object.entries(rowAttributes(data)).forEach(([key,value])=>{$(row).attr(key,value);});}},initComplete:()=>{_toggleChatscanStickyHighlight({element:$(`.${rowClass}`),type:highlightType});if(tooltipSelector){bootstrapTooltip({selector:tooltipSelector});}}});}).catch((error)=>console.error(`Error fetching data for ${rowClass}:`,error));};createDataTable({table:elements.alliancesTable,section:'alliancelist',loadingClass:'aa-intel-loading-table-info-alliance-participation-list',emptyClass:'aa-intel-empty-table-info-alliance-participation-list',containerClass:'table-local-scan-alliances',columns:[{data:(data)=>`${allianceInfoPanel(data)}<span class="d-none">${(data.ticker||'')}</span>`},{data:'count'}],rowClass:'aa-intel-alliance-participation-item',totalCountElement:elements.alliancesTotalCount,rowAttributes:(data)=>({'data-alliance-id':data.id}),highlightType:'alliance',tooltipSelector:'.aa-intel-alliance-participation-list'});createDataTable({table:elements.corporationsTable,section:'corporationlist',loadingClass:'aa-intel-loading-table-info-corporation-participation-list',emptyClass:'aa-intel-empty-table-info-corporation-participation-list',containerClass:'table-local-scan-corporations',columns:[{data:(data)=>`${corporationInfoPanel(data)}<span class="d-none">${(data.ticker||'')}, ${(data.alliance&&data.alliance.name)||''}, ${(data.alliance&&data.alliance.ticker)||''}</span>`},{data:'count'}],rowClass:'aa-intel-corporation-participation-item',totalCountElement:elements.corporationsTotalCount,rowAttributes:(data)=>({'data-corporation-id':data.id,'data-alliance-id':(data.alliance&&data.alliance.id)||''}),highlightType:'corporation',tooltipSelector:'.aa-intel-corporation-participation-list'});createDataTable({table:elements.pilotsTable,section:'pilotlist',loadingClass:'aa-intel-loading-table-info-pilot-participation-list',emptyClass:'aa-intel-empty-table-info-pilot-participation-list',containerClass:'table-local-scan-pilots',columns:[{data:(data)=>pilotInfoPanel(data)},{data:(data)=>`${corporationInfoPanel((data.corporation||{}),true)}${((data.corporation&&data.corporation.ticker)||'')}<span class="d-none">${((data.corporation&&data.corporation.name)||'')}</span>`},{data:(data)=>`${allianceInfoPanel((data.alliance||{}),true)}${((data.alliance&&data.alliance.ticker)||'')}<span class="d-none">${((data.alliance&&data.alliance.name)||'')}</span>`}],order:[[0,'asc']],columnDefs:[{target:0,createdCell:(td)=>$(td).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:125},{target:2,width:125}],rowClass:'aa-intel-pilot-participation-item',totalCountElement:elements.pilotsTotalCount,rowAttributes:(data)=>({'data-character-id':data.id,'data-corporation-id':(data.corporation&&data.corporation.id)||'','data-alliance-id':(data.alliance&&data.alliance.id)||''}),highlightType:'pilot',tooltipSelector:'.aa-intel-pilot-participation-list'});});
 //# sourceMappingURL=aa-intel-tool-chatscan.min.js.map
\ No newline at end of file
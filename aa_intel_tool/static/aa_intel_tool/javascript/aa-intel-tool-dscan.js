@@ -1,4 +1,4 @@
-/* global _getAaIntelToolJsSettings, numberFormatter, bootstrapTooltip, fetchGet, shipInfoPanel, _toggleDscanStickyHighlight, DataTable, _removeSearchFromColumnControl */
+/* global _getAaIntelToolJsSettings, numberFormatter, bootstrapTooltip, fetchScanData, shipInfoPanel, _toggleDscanStickyHighlight, DataTable, _removeSearchFromColumnControl */
 
 $(document).ready(() => {
     'use strict';
@@ -36,13 +36,16 @@ $(document).ready(() => {
         }
     ];
 
+    // Fetch all sections of the scan at once, each table picks its own section
+    const scanData = fetchScanData(settings.url.getScanData);
+
     /**
      * Create the DataTable.
      *
      * @param key
      * @param loadingKey
      * @param tableEl
-     * @param url
+     * @param section
      * @param containerSelector
      * @param extraSelectors
      * @param rowItemClass
@@ -61,7 +64,7 @@ $(document).ready(() => {
         key,
         loadingKey,
         tableEl,
-        url,
+        section,
         containerSelector,
         extraSelectors,
         rowItemClass,
@@ -76,7 +79,8 @@ $(document).ready(() => {
         highlightOnly,
         order
     }) => {
-        fetchGet({url: url})
+        scanData
+            .then((data) => data[section] || {})
             .then((tableData) => {
                 if (!tableData) {
                     return;
@@ -178,7 +182,7 @@ $(document).ready(() => {
         key: 'all',
         loadingKey: 'all',
         tableEl: elements.shipClassesAllTable,
-        url: settings.url.getShipClassesAll,
+        section: 'shiplist',
         containerSelector: 'div.table-dscan-ship-classes-all',
         rowItemClass: 'aa-intel-shipclass-all-item',
         extraRowClass: null,
@@ -198,7 +202,7 @@ $(document).ready(() => {
         key: 'ongrid',
         loadingKey: 'ongrid',
         tableEl: elements.shipClassesOngridTable,
-        url: settings.url.getShipClassesOngrid,
+        section: 'shiplist_on_grid',
         containerSelector: 'div.table-dscan-ship-classes-ongrid',
         rowItemClass: 'aa-intel-shipclass-ongrid-item',
         idAttr: 'data-shipclass-id',
@@ -217,7 +221,7 @@ $(document).ready(() => {
         key: 'offgrid',
         loadingKey: 'offgrid',
         tableEl: elements.shipClassesOffgridTable,
-        url: settings.url.getShipClassesOffgrid,
+        section: 'shiplist_off_grid',
         containerSelector: 'div.table-dscan-ship-classes-offgrid',
         rowItemClass: 'aa-intel-shipclass-offgrid-item',
         idAttr: 'data-shipclass-id',
@@ -236,7 +240,7 @@ $(document).ready(() => {
         key: 'ship-types',
         loadingKey: 'ship-types',
         tableEl: elements.shipTypesTable,
-        url: settings.url.getShipTypes,
+        section: 'shiptypes',
         containerSelector: 'div.table-dscan-ship-types',
         rowItemClass: 'aa-intel-shiptype-item',
         idAttr: 'data-shiptype-id',
@@ -252,7 +256,7 @@ $(document).ready(() => {
         key: 'upwell-structures',
         loadingKey: 'upwell-structures',
         tableEl: elements.upwellStructuresTable,
-        url: settings.url.getStructuresOnGrid,
+        section: 'structures_on_grid',
         containerSelector: 'div#aa-intel-dscan-row-interesting-on-grid',
         extraSelectors: ['div.col-aa-intel-upwell-structures'],
         rowItemClass: 'aa-intel-structuretype-item',
@@ -271,7 +275,7 @@ $(document).ready(() => {
         key: 'deployables',
         loadingKey: 'deployables',
         tableEl: elements.deployablesTable,
-        url: settings.url.getDeployablesOnGrid,
+        section: 'deployables_on_grid',
         containerSelector: 'div#aa-intel-dscan-row-interesting-on-grid',
         extraSelectors: ['div.col-aa-intel-deployables'],
         rowItemClass: 'aa-intel-deployabletype-item',
@@ -290,7 +294,7 @@ $(document).ready(() => {
         key: 'starbases',
         loadingKey: 'starbases',
         tableEl: elements.starbasesTable,
-        url: settings.url.getStarbasesOnGrid,
+        section: 'starbases_on_grid',
         containerSelector: 'div#aa-intel-dscan-row-interesting-on-grid',
         extraSelectors: ['div.col-aa-intel-starbases'],
         rowItemClass: 'aa-intel-starbasetype-item',
@@ -1,2 +1,12 @@
-$(document).ready(()=>{'use strict';const a=_getAaIntelToolJsSettings(),t={shipClassesAllTable:$('table.aa-intel-dscan-ship-classes-all-list'),dscanCountAll:$('span#aa-intel-dscan-all-count'),dscanMassAll:$('span#aa-intel-dscan-all-mass'),shipClassesOngridTable:$('table.aa-intel-dscan-ship-classes-ongrid-list'),dscanCountOngrid:$('span#aa-intel-dscan-ongrid-count'),dscanMassOnGrid:$('span#aa-intel-dscan-ongrid-mass'),shipClassesOffgridTable:$('table.aa-intel-dscan-ship-classes-offgrid-list'),dscanCountOffgrid:$('span#aa-intel-dscan-offgrid-count'),dscanMassOffGrid:$('span#aa-intel-dscan-offgrid-mass'),shipTypesTable:$('table.aa-intel-dscan-ship-types-list'),upwellStructuresTable:$('table.aa-intel-dscan-upwell-structures-list'),dscanCountUpwellStructures:$('span#aa-intel-dscan-upwell-structures-count'),deployablesTable:$('table.aa-intel-dscan-deployables-list'),dscanCountDeployables:$('span#aa-intel-dscan-deployables-count'),starbasesTable:$('table.aa-intel-dscan-starbases-list'),dscanCountStarbases:$('span#aa-intel-dscan-starbases-count')},e=[[1,'desc'],[0,'asc']],s=[{target:0,createdCell:a=>$(a).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:a=>$(a).addClass('text-end'),columnControl:_removeSearchFromColumnControl(a.dataTables.columnControl,1)}],l=({key:t,loadingKey:l,tableEl:n,url:i,containerSelector:d,extraSelectors:o,rowItemClass:r,extraRowClass:c,idAttr:p,typeIdAttr:u,countEl:g,massEl:h,columns:b,tooltipSelector:y,highlightType:m,highlightOnly:f,order:C})=>{fetchGet({url:i}).then(i=>{if(!i)return;if($(`div.aa-intel-loading-table-info-${l||t}`).addClass('d-none'),0===Object.keys(i).length)return void $(`div.aa-intel-empty-table-info-${l||t}`).removeClass('d-none');d&&$(d).removeClass('d-none'),o&&o.forEach(a=>$(a).removeClass('d-none'));new DataTable(n,{...a.dataTables,data:i,paging:!1,language:a.language.dataTables,lengthChange:!1,columns:b,order:C||e,columnDefs:s,createdRow:(t,e)=>{if(g){const a=parseInt(g.html())||0;g.html(a+(e.count||0))}if(h){const t=(parseInt(h.data('mass'))||0)+(e.mass||0);h.data('mass',t),h.html(numberFormatter({value:t,locales:a.language.django}))}r&&$(t).addClass(r),p&&$(t).attr(p,e.id),u&&void 0!==e.type_id&&$(t).attr(u,e.type_id),c&&$(t).addClass(c)},initComplete:()=>{if(r){const a=`.${r.split(' ').join('.')}`,t=$(a);_toggleDscanStickyHighlight({element:t,type:m||'shipclass',highlightOnly:!!f})}y&&bootstrapTooltip({selector:y})}})}).catch(a=>{console.error(`Error fetching ${t} data:`,a)})};l({key:'all',loadingKey:'all',tableEl:t.shipClassesAllTable,url:a.url.getShipClassesAll,containerSelector:'div.table-dscan-ship-classes-all',rowItemClass:'aa-intel-shipclass-all-item',extraRowClass:null,idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:t.dscanCountAll,massEl:t.dscanMassAll,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-all-list'}),l({key:'ongrid',loadingKey:'ongrid',tableEl:t.shipClassesOngridTable,url:a.url.getShipClassesOngrid,containerSelector:'div.table-dscan-ship-classes-ongrid',rowItemClass:'aa-intel-shipclass-ongrid-item',idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:t.dscanCountOngrid,massEl:t.dscanMassOnGrid,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-ongrid-list'}),l({key:'offgrid',loadingKey:'offgrid',tableEl:t.shipClassesOffgridTable,url:a.url.getShipClassesOffgrid,containerSelector:'div.table-dscan-ship-classes-offgrid',rowItemClass:'aa-intel-shipclass-offgrid-item',idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:t.dscanCountOffgrid,massEl:t.dscanMassOffGrid,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-offgrid-list'}),l({key:'ship-types',loadingKey:'ship-types',tableEl:t.shipTypesTable,url:a.url.getShipTypes,containerSelector:'div.table-dscan-ship-types',rowItemClass:'aa-intel-shiptype-item',idAttr:'data-shiptype-id',columns:[{data:'name'},{data:'count'}],highlightType:'shiptype'}),l({key:'upwell-structures',loadingKey:'upwell-structures',tableEl:t.upwellStructuresTable,url:a.url.getStructuresOnGrid,containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-upwell-structures'],rowItemClass:'aa-intel-structuretype-item',idAttr:'data-structuretype-id',countEl:t.dscanCountUpwellStructures,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],highlightOnly:!0,tooltipSelector:'.aa-intel-dscan-upwell-structures-list'}),l({key:'deployables',loadingKey:'deployables',tableEl:t.deployablesTable,url:a.url.getDeployablesOnGrid,containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-deployables'],rowItemClass:'aa-intel-deployabletype-item',idAttr:'data-deployabletype-id',countEl:t.dscanCountDeployables,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],highlightOnly:!0,tooltipSelector:'.aa-intel-dscan-deployables-list'}),l({key:'starbases',loadingKey:'starbases',tableEl:t.starbasesTable,url:a.url.getStarbasesOnGrid,containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-starbases'],rowItemClass:'aa-intel-starbasetype-item',idAttr:'data-starbasetype-id',countEl:t.dscanCountStarbases,columns:[{data:a=>shipInfoPanel(a)},{data:'count'}],highlightOnly:!0,tooltipSelector:'.aa-intel-dscan-starbases-list'})});
+$(document).ready(()=>{'use strict';const settings=_getAaIntelToolJsSettings();const elements={shipClassesAllTable:$('table.aa-intel-dscan-ship-classes-all-list'),dscanCountAll:$('span#aa-intel-dscan-all-count'),dscanMassAll:$('span#aa-intel-dscan-all-mass'),shipClassesOngridTable:$('table.aa-intel-dscan-ship-classes-ongrid-list'),dscanCountOngrid:$('span#aa-intel-dscan-ongrid-count'),dscanMassOnGrid:$('span#aa-intel-dscan-ongrid-mass'),shipClassesOffgridTable:$('table.aa-intel-dscan-ship-classes-offgrid-list'),dscanCountOffgrid:$('span#aa-intel-dscan-offgrid-count'),dscanMassOffGrid:$('span#aa-intel-dscan-offgrid-mass'),shipTypesTable:$('table.aa-intel-dscan-ship-types-list'),upwellStructuresTable:$('table.aa-intel-dscan-upwell-structures-list'),dscanCountUpwellStructures:$('span#aa-intel-dscan-upwell-structures-count'),deployablesTable:$('table.aa-intel-dscan-deployables-list'),dscanCountDeployables:$('span#aa-intel-dscan-deployables-count'),starbasesTable:$('table.aa-intel-dscan-starbases-list'),dscanCountStarbases:$('span#aa-intel-dscan-starbases-count')};const defaultOrder=[[1,'desc'],[0,'asc']];const columnsDefs=[{target:0,createdCell:(td)=>$(td).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:(td)=>$(td).addClass('text-end'),columnControl:_removeSearchFromColumnControl(settings.dataTables.columnControl,1)}];const scanData=fetchScanData(settings.url.getScanData);const createDataTable=({key,loadingKey,tableEl,section,containerSelector,extraSelectors,rowItemClass,extraRowClass,idAttr,typeIdAttr,countEl,massEl,columns,tooltipSelector,highlightType,highlightOnly,order})=>{scanData.then((data)=>data[section]||{}).then((tableData)=>{if(!tableData){return;}
+$(`div.aa-intel-loading-table-info-${loadingKey||key}`).addClass('d-none');if(Object.keys(tableData).length===0){$(`div.aa-intel-empty-table-info-${loadingKey||key}`).removeClass('d-none');return;}
+if(containerSelector){$(containerSelector).removeClass('d-none');}
+if(extraSelectors){extraSelectors.forEach(s=>$(s).removeClass('d-none'));}
+const dt=new DataTable(tableEl,{...settings.dataTables,data:tableData,paging:false,language:settings.language.dataTables,lengthChange:false,columns:columns,order:order||defaultOrder,columnDefs:columnsDefs,createdRow:(row,data)=>{if(countEl){const currentTotal=parseInt(countEl.html())||0;countEl.html(currentTotal+(data.count||0));}
+if(massEl){const currentMass=parseInt(massEl.data('mass'))||0;const newMass=currentMass+(data.mass||0);massEl.data('mass',newMass);massEl.html(numberFormatter({value:newMass,locales:settings.language.django}));}
+if(rowItemClass){$(row).addClass(rowItemClass);}
+if(idAttr){$(row).attr(idAttr,data.id);}
+if(typeIdAttr&&data.type_id!==undefined){$(row).attr(typeIdAttr,data.type_id);}
+if(extraRowClass){$(row).addClass(extraRowClass);}},initComplete:()=>{if(rowItemClass){const selector=`.${rowItemClass.split(' ').join('.')}`;const el=$(selector);_toggleDscanStickyHighlight({element:el,type:highlightType||'shipclass',highlightOnly:!!highlightOnly});}
+if(tooltipSelector){bootstrapTooltip({selector:tooltipSelector});}}});}).catch((error)=>{console.error(`Error fetching ${key} data:`,error);});};createDataTable({key:'all',loadingKey:'all',tableEl:elements.shipClassesAllTable,section:'shiplist',containerSelector:'div.table-dscan-ship-classes-all',rowItemClass:'aa-intel-shipclass-all-item',extraRowClass:null,idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:elements.dscanCountAll,massEl:elements.dscanMassAll,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-all-list'});createDataTable({key:'ongrid',loadingKey:'ongrid',tableEl:elements.shipClassesOngridTable,section:'shiplist_on_grid',containerSelector:'div.table-dscan-ship-classes-ongrid',rowItemClass:'aa-intel-shipclass-ongrid-item',idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:elements.dscanCountOngrid,massEl:elements.dscanMassOnGrid,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-ongrid-list'});createDataTable({key:'offgrid',loadingKey:'offgrid',tableEl:elements.shipClassesOffgridTable,section:'shiplist_off_grid',containerSelector:'div.table-dscan-ship-classes-offgrid',rowItemClass:'aa-intel-shipclass-offgrid-item',idAttr:'data-shipclass-id',typeIdAttr:'data-shiptype-id',countEl:elements.dscanCountOffgrid,massEl:elements.dscanMassOffGrid,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],tooltipSelector:'.aa-intel-dscan-ship-classes-offgrid-list'});createDataTable({key:'ship-types',loadingKey:'ship-types',tableEl:elements.shipTypesTable,section:'shiptypes',containerSelector:'div.table-dscan-ship-types',rowItemClass:'aa-intel-shiptype-item',idAttr:'data-shiptype-id',columns:[{data:'name'},{data:'count'}],highlightType:'shiptype'});createDataTable({key:'upwell-structures',loadingKey:'upwell-structures',tableEl:elements.upwellStructuresTable,section:'structures_on_grid',containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-upwell-structures'],rowItemClass:'aa-intel-structuretype-item',idAttr:'data-structuretype-id',countEl:elements.dscanCountUpwellStructures,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],highlightOnly:true,tooltipSelector:'.aa-intel-dscan-upwell-structures-list'});createDataTable({key:'deployables',loadingKey:'deployables',tableEl:elements.deployablesTable,section:'deployables_on_grid',containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-deployables'],rowItemClass:'aa-intel-deployabletype-item',idAttr:'data-deployabletype-id',countEl:elements.dscanCountDeployables,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],highlightOnly:true,tooltipSelector:'.aa-intel-dscan-deployables-list'});createDataTable({key:'starbases',loadingKey:'starbases',tableEl:elements.starbasesTable,section:'starbases_on_grid',containerSelector:'div#aa-intel-dscan-row-interesting-on-grid',extraSelectors:['div.col-aa-intel-starbases'],rowItemClass:'aa-intel-starbasetype-item',idAttr:'data-starbasetype-id',countEl:elements.dscanCountStarbases,columns:[{data:(d)=>shipInfoPanel(d)},{data:'count'}],highlightOnly:true,tooltipSelector:'.aa-intel-dscan-starbases-list'});});
 //# sourceMappingURL=aa-intel-tool-dscan.min.js.map
\ No newline at end of file
@@ -1,4 +1,4 @@
-/* global fetchGet, _getAaIntelToolJsSettings, numberFormatter, bootstrapTooltip, shipInfoPanel, pilotInfoPanel, _toggleFleetcompStickyHighlight, _removeSearchFromColumnControl */
+/* global fetchScanData, _getAaIntelToolJsSettings, numberFormatter, bootstrapTooltip, shipInfoPanel, pilotInfoPanel, _toggleFleetcompStickyHighlight, _removeSearchFromColumnControl */
 
 $(document).ready(() => {
     'use strict';
@@ -29,7 +29,7 @@ $(document).ready(() => {
      * Create a data table.
      *
      * @param {jQuery | HTMLElement} tableElement The table element.
-     * @param {string} url The URL to fetch data from.
+     * @param {string} section The scan data section to show.
      * @param {string} loadingClass The class of the loading div.
      * @param {string} emptyClass The class of the empty div.
      * @param containerClass
@@ -41,7 +41,7 @@ $(document).ready(() => {
      */
     const createDataTable = ({
         tableElement,
-        url,
+        section,
         loadingClass,
         emptyClass,
         containerClass,
@@ -51,7 +51,8 @@ $(document).ready(() => {
         createdRowCallback,
         initCompleteCallback
     }) => {
-        fetchGet({url})
+        fetchScanData(settings.url.getScanData)
+            .then((data) => data[section] || {})
             .then((tableData) => {
                 $(`div.${loadingClass}`).addClass('d-none');
 
@@ -85,7 +86,7 @@ $(document).ready(() => {
     // Create Ship Classes DataTable
     createDataTable({
         tableElement: elements.shipClassesTable,
-        url: settings.url.getShipClasses,
+        section: 'shiplist',
         loadingClass: 'aa-intel-loading-table-info-ship-classes',
         emptyClass: 'aa-intel-empty-table-info-ship-classes',
         containerClass: 'table-dscan-ship-classes-ship-classes',
@@ -120,7 +121,7 @@ $(document).ready(() => {
     // Create Ship Types DataTable
     createDataTable({
         tableElement: elements.shipTypesTable,
-        url: settings.url.getShipTypes,
+        section: 'shiptypes',
         loadingClass: 'aa-intel-loading-table-info-ship-types',
         emptyClass: 'aa-intel-empty-table-info-ship-types',
         containerClass: 'table-dscan-ship-types',
@@ -145,7 +146,7 @@ $(document).ready(() => {
     // Create Fleet Composition Pilot Ships DataTable
     createDataTable({
         tableElement: elements.fleetcompositionTable,
-        url: settings.url.getFleetComposition,
+        section: 'fleetcomposition',
         loadingClass: 'aa-intel-loading-table-info-fleetcomp-pilot-ships',
         emptyClass: 'aa-intel-empty-table-info-fleetcomp-pilot-ships',
         containerClass: 'table-fleetcomp-pilot-ships',
@@ -1,2 +1,3 @@
-$(document).ready(()=>{'use strict';const a=_getAaIntelToolJsSettings(),e={shipClassesTable:$('table.aa-intel-dscan-ship-classes-ship-classes-list'),shipClassesMass:$('span#aa-intel-dscan-ship-classes-mass'),shipTypesTable:$('table.aa-intel-dscan-ship-types-list'),fleetcompositionTable:$('table.aa-intel-fleetcomp-pilot-ships-list'),pilotsCount:$('span#aa-intel-fleet-participation-count')},s=[[1,'desc'],[0,'asc']],t=[{target:0,createdCell:a=>$(a).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:a=>$(a).addClass('text-end'),columnControl:_removeSearchFromColumnControl(a.dataTables.columnControl,1)}],l=({tableElement:e,url:l,loadingClass:i,emptyClass:p,containerClass:n,order:o,columns:d,columnDefs:c,createdRowCallback:h,initCompleteCallback:m})=>{fetchGet({url:l}).then(l=>{$(`div.${i}`).addClass('d-none'),l&&0!==Object.keys(l).length?($(`div.${n}`).removeClass('d-none'),e.DataTable({...a.dataTables,data:l,paging:!1,language:a.language.dataTables,lengthChange:!1,columns:d,order:o||s,columnDefs:c||t,createdRow:h,initComplete:m})):$(`div.${p}`).removeClass('d-none')}).catch(a=>console.error(`Error fetching data for ${n}:`,a))};l({tableElement:e.shipClassesTable,url:a.url.getShipClasses,loadingClass:'aa-intel-loading-table-info-ship-classes',emptyClass:'aa-intel-empty-table-info-ship-classes',containerClass:'table-dscan-ship-classes-ship-classes',columns:[{data:a=>`${shipInfoPanel(a)}<span class="d-none">${a.type_name}</span>`},{data:'count'}],createdRowCallback:(s,t)=>{const l=e.shipClassesMass.data('mass')||0,i=parseInt(l)+t.mass;e.shipClassesMass.data('mass',i),e.shipClassesMass.html(numberFormatter({value:i,locales:a.language.django})),$(s).addClass(`aa-intel-shipclass-item aa-intel-shipclass-id-${t.id} aa-intel-shiptype-id-${t.type_id}`).attr('data-shipclass-id',t.id).attr('data-shiptype-id',t.type_id)},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-shipclass-item'),type:'shipclass'}),bootstrapTooltip({selector:'.aa-intel-dscan-ship-classes-ship-classes-list'})}}),l({tableElement:e.shipTypesTable,url:a.url.getShipTypes,loadingClass:'aa-intel-loading-table-info-ship-types',emptyClass:'aa-intel-empty-table-info-ship-types',containerClass:'table-dscan-ship-types',columns:[{data:'name'},{data:'count'}],createdRowCallback:(a,e)=>{$(a).addClass(`aa-intel-shiptype-item aa-intel-shiptype-id-${e.id}`).attr('data-shiptype-id',e.id)},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-shiptype-item'),type:'shiptype'}),bootstrapTooltip({selector:'.aa-intel-dscan-ship-types-list'})}}),l({tableElement:e.fleetcompositionTable,url:a.url.getFleetComposition,loadingClass:'aa-intel-loading-table-info-fleetcomp-pilot-ships',emptyClass:'aa-intel-empty-table-info-fleetcomp-pilot-ships',containerClass:'table-fleetcomp-pilot-ships',columns:[{data:a=>pilotInfoPanel(a)},{data:'ship'},{data:'solarsystem'}],order:[[0,'asc']],columnDefs:[{target:0,createdCell:a=>$(a).addClass('fix-eve-image-position')}],createdRowCallback:(a,s)=>{const t=e.pilotsCount.html(),l=parseInt(t)+1;e.pilotsCount.html(l),$(a).addClass(`aa-intel-pilotship-item aa-intel-shipclass-id-${s.ship_id} aa-intel-shiptype-id-${s.ship_type_id}`).attr('data-shipclass-id',s.ship_id).attr('data-shiptype-id',s.ship_type_id)},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-pilotship-item'),type:'shiptype'}),bootstrapTooltip({selector:'.aa-intel-fleetcomp-pilot-ships-list'})}})});
+$(document).ready(()=>{'use strict';const settings=_getAaIntelToolJsSettings();const elements={shipClassesTable:$('table.aa-intel-dscan-ship-classes-ship-classes-list'),shipClassesMass:$('span#aa-intel-dscan-ship-classes-mass'),shipTypesTable:$('table.aa-intel-dscan-ship-types-list'),fleetcompositionTable:$('table.aa-intel-fleetcomp-pilot-ships-list'),pilotsCount:$('span#aa-intel-fleet-participation-count')};const defaultOrder=[[1,'desc'],[0,'asc']];const defaultColumnDefs=[{target:0,createdCell:(td)=>$(td).addClass('text-ellipsis fix-eve-image-position')},{target:1,width:35,createdCell:(td)=>$(td).addClass('text-end'),columnControl:_removeSearchFromColumnControl(settings.dataTables.columnControl,1)}];const createDataTable=({tableElement,section,loadingClass,emptyClass,containerClass,order,columns,columnDefs,createdRowCallback,initCompleteCallback})=>{fetchScanData(settings.url.getScanData).then((data)=>data[section]||{}).then((tableData)=>{$(`div.${loadingClass}`).addClass('d-none');if(!tableData||Object.keys(tableData).length===0){$(`div.${emptyClass}`).removeClass('d-none');return;}
+$(`div.${containerClass}`).removeClass('d-none');tableElement.DataTable({...settings.dataTables,data:tableData,paging:false,language:settings.language.dataTables,lengthChange:false,columns:columns,order:order||defaultOrder,columnDefs:columnDefs||defaultColumnDefs,createdRow:createdRowCallback,initComplete:initCompleteCallback});}).catch((error)=>console.error(`Error fetching data for ${containerClass}:`,error));};createDataTable({tableElement:elements.shipClassesTable,section:'shiplist',loadingClass:'aa-intel-loading-table-info-ship-classes',emptyClass:'aa-intel-empty-table-info-ship-classes',containerClass:'table-dscan-ship-classes-ship-classes',columns:[{data:(data)=>`${shipInfoPanel(data)}<span class="d-none">${data.type_name}</span>`},{data:'count'}],createdRowCallback:(row,data)=>{const currentMass=elements.shipClassesMass.data('mass')||0;const newMass=parseInt(currentMass)+data.mass;elements.shipClassesMass.data('mass',newMass);elements.shipClassesMass.html(numberFormatter({value:newMass,locales:settings.language.django}));$(row).addClass(`aa-intel-shipclass-item aa-intel-shipclass-id-${data.id} aa-intel-shiptype-id-${data.type_id}`).attr('data-shipclass-id',data.id).attr('data-shiptype-id',data.type_id);},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-shipclass-item'),type:'shipclass'});bootstrapTooltip({selector:'.aa-intel-dscan-ship-classes-ship-classes-list'});}});createDataTable({tableElement:elements.shipTypesTable,section:'shiptypes',loadingClass:'aa-intel-loading-table-info-ship-types',emptyClass:'aa-intel-empty-table-info-ship-types',containerClass:'table-dscan-ship-types',columns:[{data:'name'},{data:'count'}],createdRowCallback:(row,data)=>{$(row).addClass(`aa-intel-shiptype-item aa-intel-shiptype-id-${data.id}`).attr('data-shiptype-id',data.id);},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-shiptype-item'),type:'shiptype'});bootstrapTooltip({selector:'.aa-intel-dscan-ship-types-list'});}});createDataTable({tableElement:elements.fleetcompositionTable,section:'fleetcomposition',loadingClass:'aa-intel-loading-table-info-fleetcomp-pilot-ships',emptyClass:'aa-intel-empty-table-info-fleetcomp-pilot-ships',containerClass:'table-fleetcomp-pilot-ships',columns:[{data:(data)=>pilotInfoPanel(data)},{data:'ship'},{data:'solarsystem'}],order:[[0,'asc']],columnDefs:[{target:0,createdCell:(td)=>$(td).addClass('fix-eve-image-position')}],createdRowCallback:(row,data)=>{const currentTotal=elements.pilotsCount.html();const newTotal=parseInt(currentTotal)+1;elements.pilotsCount.html(newTotal);$(row).addClass(`aa-intel-pilotship-item aa-intel-shipclass-id-${data.ship_id} aa-intel-shiptype-id-${data.ship_type_id}`).attr('data-shipclass-id',data.ship_id).attr('data-shiptype-id',data.ship_type_id);},initCompleteCallback:()=>{_toggleFleetcompStickyHighlight({element:$('.aa-intel-pilotship-item'),type:'shiptype'});bootstrapTooltip({selector:'.aa-intel-fleetcomp-pilot-ships-list'});}});});
 //# sourceMappingURL=aa-intel-tool-fleetcomposition.min.js.map
\ No newline at end of file
@@ -0,0 +1,51 @@
+/* global _getAaIntelToolJsSettings, fetchGet */
+
+$(document).ready(() => {
+    'use strict';
+
+    const settings = _getAaIntelToolJsSettings();
+    const pollInterval = 2000;
+    const maxAttempts = 150; // Give up after 5 minutes
+    let attempts = 0;
+
+    /**
+     * Poll again, or give up and show an error once the scan has been
+     * pending for too long (e.g. no Celery worker picked it up).
+     */
+    const scheduleNextPoll = () => {
+        attempts++;
+
+        if (attempts >= maxAttempts) {
+            $('div.aa-intel-pending-scan-info').addClass('d-none');
+            $('div.aa-intel-pending-scan-timeout').removeClass('d-none');
+
+            return;
+        }
+
+        setTimeout(pollScanStatus, pollInterval);
+    };
+
+    /**
+     * Poll the scan status until the scan is no longer pending,
+     * then reload the page to show the results (or the error).
+     */
+    const pollScanStatus = () => {
+        fetchGet({url: settings.url.getScanStatus})
+            .then((data) => {
+                if (data.status === 'pending') {
+                    scheduleNextPoll();
+
+                    return;
+                }
+
+                window.location.reload();
+            })
+            .catch((error) => {
+                console.error('Error fetching scan status:', error);
+
+                scheduleNextPoll();
+            });
+    };
+
+    setTimeout(pollScanStatus, pollInterval);
+});
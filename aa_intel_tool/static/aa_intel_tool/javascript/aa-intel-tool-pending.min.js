@@ -0,0 +1,4 @@
+$(document).ready(()=>{'use strict';const settings=_getAaIntelToolJsSettings();const pollInterval=2000;const maxAttempts=150;let attempts=0;const scheduleNextPoll=()=>{attempts++;if(attempts>=maxAttempts){$('div.aa-intel-pending-scan-info').addClass('d-none');$('div.aa-intel-pending-scan-timeout').removeClass('d-none');return;}
+setTimeout(pollScanStatus,pollInterval);};const pollScanStatus=()=>{fetchGet({url:settings.url.getScanStatus}).then((data)=>{if(data.status==='pending'){scheduleNextPoll();return;}
+window.location.reload();}).catch((error)=>{console.error('Error fetching scan status:',error);scheduleNextPoll();});};setTimeout(pollScanStatus,pollInterval);});
+//# sourceMappingURL=aa-intel-tool-pending.min.js.map
\ No newline at end of file
@@ -1,4 +1,4 @@
-/* global _getAaIntelToolJsSettings, ClipboardJS, bootstrap, addFleetcompositionHighlight, removeFleetcompositionHighlight, changeFleetcompositionStickyHighlight, addDscanHighlight, removeDscanHighlight, changeDscanStickyHighlight, addChatscanHighlight, removeChatscanHighlight, changeChatscanStickyHighlight */
+/* global _getAaIntelToolJsSettings, fetchGet, ClipboardJS, bootstrap, addFleetcompositionHighlight, removeFleetcompositionHighlight, changeFleetcompositionStickyHighlight, addDscanHighlight, removeDscanHighlight, changeDscanStickyHighlight, addChatscanHighlight, removeChatscanHighlight, changeChatscanStickyHighlight */
 
 /* jshint -W097 */
 'use strict';
@@ -338,6 +338,29 @@ const shipInfoPanel = (shipData) => { // eslint-disable-line no-unused-vars
     return _infoPanel({imageData: imageData, eveData: shipData.name});
 };
 
+/**
+ * Pending scan data requests, keyed by URL
+ *
+ * @type {Object<string, Promise>}
+ * @private
+ */
+const _scanDataRequests = {};
+
+/**
+ * Fetch the data of all sections of a scan.
+ * Every table on the page shares the same request.
+ *
+ * @param {string} url The URL to fetch the scan data from
+ * @returns {Promise<Object>} The scan data, keyed by section
+ */
+const fetchScanData = (url) => { // eslint-disable-line no-unused-vars
+    if (!_scanDataRequests[url]) {
+        _scanDataRequests[url] = fetchGet({url: url});
+    }
+
+    return _scanDataRequests[url];
+};
+
 $(document).ready(() => {
     const elementCopyToClipboard = $('button#btn-copy-permalink-to-clipboard');
 
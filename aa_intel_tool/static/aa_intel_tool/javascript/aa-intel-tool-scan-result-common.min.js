@@ -1,2 +1,8 @@
-'use strict';const aaIntelToolJsSettings=_getAaIntelToolJsSettings(),_toggleScanStickyHighlight=({element:e,type:t,scanType:a,excludeLinkElement:n='aa-intel-information-link',highlightOnly:l=!1})=>{const i={fleetcomposition:{add:'function'==typeof addFleetcompositionHighlight?addFleetcompositionHighlight:null,remove:'function'==typeof removeFleetcompositionHighlight?removeFleetcompositionHighlight:null,change:'function'==typeof changeFleetcompositionStickyHighlight?changeFleetcompositionStickyHighlight:null},dscan:{add:'function'==typeof addDscanHighlight?addDscanHighlight:null,remove:'function'==typeof removeDscanHighlight?removeDscanHighlight:null,change:'function'==typeof changeDscanStickyHighlight?changeDscanStickyHighlight:null},chatscan:{add:'function'==typeof addChatscanHighlight?addChatscanHighlight:null,remove:'function'==typeof removeChatscanHighlight?removeChatscanHighlight:null,change:'function'==typeof changeChatscanStickyHighlight?changeChatscanStickyHighlight:null}}[a],o=l?e=>e.addClass('aa-intel-highlight'):e=>i.add(t,e),s=l?e=>e.removeClass('aa-intel-highlight'):e=>i.remove(t,e);e.mouseenter(e=>{o($(e.currentTarget))}).mouseleave(e=>{s($(e.currentTarget))}),l||e.click(e=>{$(e.target).hasClass(n)?e.stopPropagation():i.change(t,$(e.currentTarget))})},_toggleFleetcompStickyHighlight=e=>{_toggleScanStickyHighlight({...e,scanType:'fleetcomposition'})},_toggleDscanStickyHighlight=e=>{_toggleScanStickyHighlight({...e,scanType:'dscan'})},_toggleChatscanStickyHighlight=e=>{_toggleScanStickyHighlight({...e,scanType:'chatscan'})},bootstrapTooltip=({selector:e='body',namespace:t='aa-intel-tool'})=>{document.querySelectorAll(`${e} [data-bs-tooltip="${t}"]`).forEach(e=>new bootstrap.Tooltip(e))},_eveImageHtml=({eveId:e,eveName:t,imageSource:a,imageSize:n=32})=>`<img class="eve-image rounded" data-eveid="${e}" src="${a}" alt="${t}" title="${t}" data-bs-tooltip="aa-intel-tool" loading="lazy" width="${n}" height="${n}">`,_externalLinkHtml=({serviceName:e,href:t})=>`<a class="aa-intel-information-link" href="${t}" target="_blank" rel="noopener noreferer">${e}</a>`,_eveWhoLinkHtml=e=>_externalLinkHtml({serviceName:'evewho',href:e}),_zkillboardLinkHtml=e=>_externalLinkHtml({serviceName:'zkillboard',href:e}),_dotlanLinkHtml=e=>_externalLinkHtml({serviceName:'dotlan',href:e}),_infoPanel=({imageData:e,eveData:t,additionalInfo:a='',logoOnly:n=!1})=>{const l=`<span class="aa-intel-eve-image-wrapper">${e}</span>`;if(n)return l;return`${l}<span class="aa-intel-eve-information-wrapper">${`<span class="aa-intel-eve-name-wrapper">${t}</span>`}${a?`<span class="aa-intel-additional-information-wrapper"><small>${a}</small></span>`:''}</span>`},pilotInfoPanel=e=>{const t=_eveImageHtml({eveId:e.id,eveName:e.name,imageSource:e.portrait}),a=`${_eveWhoLinkHtml(e.evewho)} | ${_zkillboardLinkHtml(e.zkillboard)}`;return _infoPanel({imageData:t,eveData:e.name,additionalInfo:a})},corporationInfoPanel=(e,t=!1)=>{const a=_eveImageHtml({eveId:e.id,eveName:e.name,imageSource:e.logo}),n=e.id>=1e6&&e.id<=2e6?`(${aaIntelToolJsSettings.translation.scanData.npcCorp})`:`${_dotlanLinkHtml(e.dotlan)} | ${_zkillboardLinkHtml(e.zkillboard)}`;return _infoPanel({imageData:a,eveData:e.name,additionalInfo:n,logoOnly:t})},allianceInfoPanel=(e,t=!1)=>{const a=e.name||aaIntelToolJsSettings.translation.scanData.unaffiliated;if(t&&1===e.id)return'';const n=_eveImageHtml({eveId:e.id,eveName:a,imageSource:e.logo}),l=e.id>1?`${_dotlanLinkHtml(e.dotlan)} | ${_zkillboardLinkHtml(e.zkillboard)}`:aaIntelToolJsSettings.translation.scanData.noAlliance;return _infoPanel({imageData:n,eveData:a,additionalInfo:l,logoOnly:t})},shipInfoPanel=e=>{const t=_eveImageHtml({eveId:e.id,eveName:e.name,imageSource:e.image});return _infoPanel({imageData:t,eveData:e.name})};$(document).ready(()=>{const e=$('button#btn-copy-permalink-to-clipboard');ClipboardJS.isSupported()||e.remove();const t=({element:e,closeAfter:t=10})=>{e.fadeTo(1e3*t,500).slideUp(500,()=>{e.remove()})},a=({message:e,element:a,type:n})=>{const l='success'===n?'alert-success':'alert-danger',i=`alert-message-${n}`,o='success'===n?10:9999;a.html(`<div class="alert ${l} alert-dismissible ${i} d-flex align-items-center fade show">${e}<button type="button" class="btn-close" data-bs-dismiss="alert" aria-label="Close"></button></div>`),t({element:$(`.${i}`),closeAfter:o})},n=({message:e,element:t})=>a({message:e,element:t,type:'success'}),l=({message:e,element:t})=>a({message:e,element:t,type:'error'}),i=e=>{const t=new ClipboardJS(e),a=({success:e,e:a})=>{const i=e?'success':'error',o=aaIntelToolJsSettings.translation.copyToClipboard.permalink.text[i];(e?n:l)({message:o,element:$('.aa-intel-copy-result')}),e&&a&&a.clearSelection(),t.destroy()};t.on('success',e=>a({success:!0,e:e})).on('error',()=>a({success:!1}))};e.click(()=>{i(`#${e.attr('id')}`)})});const _removeSearchFromColumnControl=(e,t=1)=>{const a=JSON.parse(JSON.stringify(e));return a[t]&&(a[t].content=[]),a};
+'use strict';const aaIntelToolJsSettings=_getAaIntelToolJsSettings();const _toggleScanStickyHighlight=({element,type,scanType,excludeLinkElement='aa-intel-information-link',highlightOnly=false})=>{const functionMappings={fleetcomposition:{add:typeof addFleetcompositionHighlight==='function'?addFleetcompositionHighlight:null,remove:typeof removeFleetcompositionHighlight==='function'?removeFleetcompositionHighlight:null,change:typeof changeFleetcompositionStickyHighlight==='function'?changeFleetcompositionStickyHighlight:null},dscan:{add:typeof addDscanHighlight==='function'?addDscanHighlight:null,remove:typeof removeDscanHighlight==='function'?removeDscanHighlight:null,change:typeof changeDscanStickyHighlight==='function'?changeDscanStickyHighlight:null},chatscan:{add:typeof addChatscanHighlight==='function'?addChatscanHighlight:null,remove:typeof removeChatscanHighlight==='function'?removeChatscanHighlight:null,change:typeof changeChatscanStickyHighlight==='function'?changeChatscanStickyHighlight:null}};const functions=functionMappings[scanType];const highlightHandler=highlightOnly?(element)=>element.addClass('aa-intel-highlight'):(element)=>functions.add(type,element);const unhighlightHandler=highlightOnly?(element)=>element.removeClass('aa-intel-highlight'):(element)=>functions.remove(type,element);element.mouseenter((event)=>{highlightHandler($(event.currentTarget));}).mouseleave((event)=>{unhighlightHandler($(event.currentTarget));});if(!highlightOnly){element.click((event)=>{if(!$(event.target).hasClass(excludeLinkElement)){functions.change(type,$(event.currentTarget));}else{event.stopPropagation();}});}};const _toggleFleetcompStickyHighlight=(params)=>{_toggleScanStickyHighlight({...params,scanType:'fleetcomposition'});};const _toggleDscanStickyHighlight=(params)=>{_toggleScanStickyHighlight({...params,scanType:'dscan'});};const _toggleChatscanStickyHighlight=(params)=>{_toggleScanStickyHighlight({...params,scanType:'chatscan'});};const bootstrapTooltip=({selector='body',namespace='aa-intel-tool'})=>{document.querySelectorAll(`${selector} [data-bs-tooltip="${namespace}"]`).forEach((tooltipTriggerEl)=>{return new bootstrap.Tooltip(tooltipTriggerEl);});};const _eveImageHtml=({eveId,eveName,imageSource,imageSize=32})=>{return`<img class="eve-image rounded" data-eveid="${eveId}" src="${imageSource}" alt="${eveName}" title="${eveName}" data-bs-tooltip="aa-intel-tool" loading="lazy" width="${imageSize}" height="${imageSize}">`;};const _externalLinkHtml=({serviceName,href})=>{return`<a class="aa-intel-information-link" href="${href}" target="_blank" rel="noopener noreferer">${serviceName}</a>`;};const _eveWhoLinkHtml=(href)=>_externalLinkHtml({serviceName:'evewho',href:href});const _zkillboardLinkHtml=(href)=>_externalLinkHtml({serviceName:'zkillboard',href:href});const _dotlanLinkHtml=(href)=>_externalLinkHtml({serviceName:'dotlan',href:href});const _infoPanel=({imageData,eveData,additionalInfo='',logoOnly=false})=>{const imageDataHtml=`<span class="aa-intel-eve-image-wrapper">${imageData}</span>`;if(logoOnly){return imageDataHtml;}
+const nameWrapper=`<span class="aa-intel-eve-name-wrapper">${eveData}</span>`;const additionalWrapper=additionalInfo?`<span class="aa-intel-additional-information-wrapper"><small>${additionalInfo}</small></span>`:'';return`${imageDataHtml}<span class="aa-intel-eve-information-wrapper">${nameWrapper}${additionalWrapper}</span>`;};const pilotInfoPanel=(pilotData)=>{const imageData=_eveImageHtml({eveId:pilotData.id,eveName:pilotData.name,imageSource:pilotData.portrait});const additionalInfo=`${_eveWhoLinkHtml(pilotData.evewho)} | ${_zkillboardLinkHtml(pilotData.zkillboard)}`;return _infoPanel({imageData:imageData,eveData:pilotData.name,additionalInfo:additionalInfo});};const corporationInfoPanel=(corporationData,logoOnly=false)=>{const imageData=_eveImageHtml({eveId:corporationData.id,eveName:corporationData.name,imageSource:corporationData.logo});const isNpcCorp=corporationData.id>=1000000&&corporationData.id<=2000000;const additionalInfo=isNpcCorp?`(${aaIntelToolJsSettings.translation.scanData.npcCorp})`:`${_dotlanLinkHtml(corporationData.dotlan)} | ${_zkillboardLinkHtml(corporationData.zkillboard)}`;return _infoPanel({imageData:imageData,eveData:corporationData.name,additionalInfo:additionalInfo,logoOnly:logoOnly});};const allianceInfoPanel=(allianceData,logoOnly=false)=>{const name=allianceData.name||aaIntelToolJsSettings.translation.scanData.unaffiliated;if(logoOnly&&allianceData.id===1){return'';}
+const imageData=_eveImageHtml({eveId:allianceData.id,eveName:name,imageSource:allianceData.logo});const additionalInfo=allianceData.id>1?`${_dotlanLinkHtml(allianceData.dotlan)} | ${_zkillboardLinkHtml(allianceData.zkillboard)}`:aaIntelToolJsSettings.translation.scanData.noAlliance;return _infoPanel({imageData:imageData,eveData:name,additionalInfo:additionalInfo,logoOnly:logoOnly});};const shipInfoPanel=(shipData)=>{const imageData=_eveImageHtml({eveId:shipData.id,eveName:shipData.name,imageSource:shipData.image});return _infoPanel({imageData:imageData,eveData:shipData.name});};const _scanDataRequests={};const fetchScanData=(url)=>{if(!_scanDataRequests[url]){_scanDataRequests[url]=fetchGet({url:url});}
+return _scanDataRequests[url];};$(document).ready(()=>{const elementCopyToClipboard=$('button#btn-copy-permalink-to-clipboard');if(!ClipboardJS.isSupported()){elementCopyToClipboard.remove();}
+const closeMessageElement=({element,closeAfter=10})=>{element.fadeTo(closeAfter*1000,500).slideUp(500,()=>{element.remove();});};const showMessage=({message,element,type})=>{const alertClass=type==='success'?'alert-success':'alert-danger';const messageClass=`alert-message-${type}`;const closeAfter=type==='success'?10:9999;element.html(`<div class="alert ${alertClass} alert-dismissible ${messageClass} d-flex align-items-center fade show">${message}<button type="button" class="btn-close" data-bs-dismiss="alert" aria-label="Close"></button></div>`);closeMessageElement({element:$(`.${messageClass}`),closeAfter:closeAfter});};const showSuccess=({message,element})=>showMessage({message:message,element:element,type:'success'});const showError=({message,element})=>showMessage({message:message,element:element,type:'error'});const copyScanLink=(elementId)=>{const clipboardScanLink=new ClipboardJS(elementId);const handleClipboardResult=({success,e})=>{const messageType=success?'success':'error';const message=aaIntelToolJsSettings.translation.copyToClipboard.permalink.text[messageType];(success?showSuccess:showError)({message:message,element:$('.aa-intel-copy-result')});if(success&&e){e.clearSelection();}
+clipboardScanLink.destroy();};clipboardScanLink.on('success',(e)=>handleClipboardResult({success:true,e:e})).on('error',()=>handleClipboardResult({success:false}));};elementCopyToClipboard.click(()=>{copyScanLink(`#${elementCopyToClipboard.attr('id')}`);});});const _removeSearchFromColumnControl=(columnControl,index=1)=>{const cc=JSON.parse(JSON.stringify(columnControl));if(cc[index]){cc[index].content=[];}
+return cc;};
 //# sourceMappingURL=aa-intel-tool-scan-result-common.min.js.map
\ No newline at end of file
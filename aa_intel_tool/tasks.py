@@ -3,12 +3,14 @@ The tasks
 """
 
 # Standard Library
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
 
 # Third Party
 from celery import shared_task
 
 # Django
+from django.db import transaction
 from django.utils import timezone
 
 # Alliance Auth
@@ -16,7 +18,10 @@ from allianceauth.services.hooks import get_extension_logger
 
 # AA Intel Tool
 from aa_intel_tool.app_settings import AppSettings
-from aa_intel_tool.models import Scan
+from aa_intel_tool.helper.eve_character import refresh_character_affiliations
+from aa_intel_tool.helper.metrics import inc_counter
+from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.parser.general import parse_pending_scan
 from aa_intel_tool.providers.applogger import AppLogger
 
 logger = AppLogger(get_extension_logger(__name__))
@@ -27,6 +32,9 @@ def housekeeping() -> None:
     """
     Remove scans older than AppSettings.INTELTOOL_SCAN_RETENTION_TIME day(s)
 
+    The scans are removed in batches of AppSettings.INTELTOOL_HOUSEKEEPING_BATCH_SIZE,
+    each in its own short transaction, so a large backlog doesn't lock the tables.
+
     :return: None
     :rtype: None
     """
@@ -36,7 +44,113 @@ def housekeeping() -> None:
             msg=f"Removing scans older than {AppSettings.INTELTOOL_SCAN_RETENTION_TIME} day(s)"  # pylint: disable=line-too-long
         )
 
-        Scan.objects.filter(  # pylint: disable=no-member
+        expired_scans = Scan.objects.filter(  # pylint: disable=no-member
             created__lte=timezone.now()
             - timedelta(days=AppSettings.INTELTOOL_SCAN_RETENTION_TIME)
-        ).delete()
+        )
+        batch_size = AppSettings.INTELTOOL_HOUSEKEEPING_BATCH_SIZE
+        removed_rows = 0
+        start_time = time.monotonic()
+
+        while True:
+            with transaction.atomic():
+                scan_hashes = list(
+                    expired_scans.values_list("pk", flat=True)[:batch_size]
+                )
+
+                if not scan_hashes:
+                    break
+
+                # Only the hashes are loaded, the sections are removed with a
+                # single query per batch, without loading them
+                removed, _ = (
+                    Scan.objects.filter(pk__in=scan_hashes)  # pylint: disable=no-member
+                    .only("pk")
+                    .delete()
+                )
+                removed_rows += removed
+
+        duration = time.monotonic() - start_time
+
+        logger.info(
+            msg=(
+                f"Removed {removed_rows} row(s) (scans and their sections) in "
+                f"{duration:.2f} s ({removed_rows / max(duration, 0.001):.0f} rows/s)"
+            )
+        )
+
+        inc_counter(
+            name="aa_intel_tool_housekeeping_deleted_rows_total", value=removed_rows
+        )
+
+
+@shared_task
+def parse_scan(scan_hash: str) -> None:
+    """
+    Parse the intel of a pending scan (AppSettings.INTELTOOL_ASYNC_PARSING)
+
+    :param scan_hash: Hash of the pending scan
+    :type scan_hash: str
+    :return: None
+    :rtype: None
+    """
+
+    parse_pending_scan(scan_hash=scan_hash)
+
+
+def _get_recently_seen_character_ids(since: datetime) -> set[int]:
+    """
+    Get the IDs of the characters in the chat lists and fleet compositions
+    scanned since the given time
+
+    :param since: The time since when the characters were seen
+    :type since: datetime
+    :return: The character IDs
+    :rtype: set[int]
+    """
+
+    character_ids = set()
+    sections = ScanData.objects.filter(  # pylint: disable=no-member
+        scan__created__gte=since,
+        section__in=[
+            ScanData.Section.PILOTLIST,
+            ScanData.Section.FLEETCOMPOSITION,
+        ],
+    ).only("processed_data_json")
+
+    for section in sections.iterator(chunk_size=100):
+        character_ids.update(
+            pilot["id"] for pilot in section.processed_data if pilot.get("id")
+        )
+
+    return character_ids
+
+
+@shared_task
+def refresh_affiliations() -> None:
+    """
+    Refresh the affiliation of the characters seen in scans within the last
+    AppSettings.INTELTOOL_AFFILIATION_REFRESH_WINDOW hour(s)
+
+    Parsing scans only looks the characters up in the database, this keeps their
+    corporation and alliance up to date.
+
+    :return: None
+    :rtype: None
+    """
+
+    if not AppSettings.INTELTOOL_AFFILIATION_REFRESH_WINDOW:
+        return
+
+    character_ids = _get_recently_seen_character_ids(
+        since=timezone.now()
+        - timedelta(hours=AppSettings.INTELTOOL_AFFILIATION_REFRESH_WINDOW)
+    )
+
+    logger.info(
+        msg=f"Refreshing the affiliation of {len(character_ids)} recently seen character(s)"
+    )
+
+    changed_characters = refresh_character_affiliations(character_ids=character_ids)
+
+    logger.info(msg=f"The affiliation of {changed_characters} character(s) changed")
@@ -4,12 +4,17 @@ Initialize the tests
 
 # Standard Library
 import socket
+from collections.abc import Callable, Iterable
+from typing import Any
+from unittest.mock import patch
 
 # Django
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 # AA Intel Tool
-from aa_intel_tool.tests.utils import create_fake_user, random_id
+from aa_intel_tool.tests.utils import FakeESIHandler, create_fake_user, random_id
 
 
 class SocketAccessError(Exception):
@@ -56,3 +61,71 @@ class BaseTestCase(TestCase):
     @staticmethod
     def guard(*args, **kwargs):
         raise SocketAccessError("Attempted to access network")
+
+    def assertQueryBudget(  # pylint: disable=invalid-name,too-many-arguments
+        self,
+        run: Callable[[int], Any],
+        sizes: Iterable[int],
+        max_queries: int,
+        max_esi_calls: int = 0,
+        fake_esi: FakeESIHandler | None = None,
+        prepare: Callable[[int], Any] | None = None,
+    ) -> None:
+        """
+        Assert that `run` stays within a budget of SQL queries and ESI calls, and
+        that their number doesn't grow with the input size
+
+        :param run: Runs the code under test for an input size
+        :type run: Callable[[int], Any]
+        :param sizes: The input sizes, at least two to catch a growing number
+        :type sizes: Iterable[int]
+        :param max_queries: Maximum number of SQL queries per run
+        :type max_queries: int
+        :param max_esi_calls: Maximum number of ESI calls per run
+        :type max_esi_calls: int
+        :param fake_esi: The (already patched in) fake ESI handler counting the calls
+        :type fake_esi: FakeESIHandler | None
+        :param prepare: Prepares a run for an input size, not counted
+        :type prepare: Callable[[int], Any] | None
+        :return: None
+        :rtype: None
+        """
+
+        counts = {}
+
+        for size in sizes:
+            if prepare is not None:
+                prepare(size)
+
+            esi_calls_before = fake_esi.calls if fake_esi is not None else 0
+
+            # Bulk operations are one query, as on MySQL, and not split into
+            # batches by SQLite's limit of query parameters
+            with (
+                patch.object(
+                    connection.ops,
+                    "bulk_batch_size",
+                    side_effect=lambda fields, objs: len(objs) or 1,
+                ),
+                CaptureQueriesContext(connection=connection) as queries,
+            ):
+                run(size)
+
+            esi_calls = (fake_esi.calls if fake_esi is not None else 0) - (
+                esi_calls_before
+            )
+            counts[size] = {"queries": len(queries), "esi_calls": esi_calls}
+
+            with self.subTest(size=size):
+                self.assertLessEqual(
+                    len(queries),
+                    max_queries,
+                    msg="\n".join(query["sql"] for query in queries.captured_queries),
+                )
+                self.assertLessEqual(esi_calls, max_esi_calls)
+
+        self.assertEqual(
+            len({tuple(count.values()) for count in counts.values()}),
+            1,
+            msg=f"The number of queries or ESI calls grows with the input size: {counts}",
+        )
@@ -97,3 +97,22 @@ class TestScanAdmin(BaseTestCase):
         result = admin_instance._raw_data(scan)
 
         self.assertIn("<pre>test data</pre>", result)
+
+    def test_displays_parse_stats_in_pre_tag(self):
+        """
+        Test if ScanAdmin._parse_stats displays the stored parse statistics
+
+        :return:
+        :rtype:
+        """
+
+        scan = Scan.objects.create(raw_data="test data")
+        admin_instance = ScanAdmin(model=Scan, admin_site=admin.site)
+
+        self.assertEqual(admin_instance._parse_stats(scan), "-")
+
+        scan.parse_stats = {"total_ms": 1.5}
+        result = admin_instance._parse_stats(scan)
+
+        self.assertIn("<pre>", result)
+        self.assertIn("&quot;total_ms&quot;: 1.5", result)
@@ -0,0 +1,165 @@
+"""
+Tests for the affiliation cache => aa_intel_tool/helper/affiliation_cache.py
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# AA Intel Tool
+from aa_intel_tool.helper.affiliation_cache import AffiliationCache, AffiliationInfo
+from aa_intel_tool.tests import BaseTestCase
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestAffiliationCache(BaseTestCase):
+    """
+    Testing the affiliation cache
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+        self.affiliation_cache = AffiliationCache(entity_type="test")
+
+    def test_get_many(self):
+        """
+        Test that only cached entries are returned
+
+        :return:
+        :rtype:
+        """
+
+        self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "ONE"))
+
+        result = self.affiliation_cache.get_many(entity_ids=[1, 2])
+
+        self.assertEqual(result, {1: AffiliationInfo("One", "ONE")})
+        self.assertIsNone(self.affiliation_cache.get(entity_id=2))
+
+    def test_evicts_least_recently_used_entries(self):
+        """
+        Test that the process-local cache is bounded by its maximum size
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.helper.affiliation_cache.AppSettings.INTELTOOL_AFFILIATION_CACHE_MAX_SIZE",
+            2,
+        ):
+            self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "1"))
+            self.affiliation_cache.set(entity_id=2, info=AffiliationInfo("Two", "2"))
+
+            # Use 1, so 2 is the least recently used entry
+            self.affiliation_cache.get(entity_id=1)
+            self.affiliation_cache.set(entity_id=3, info=AffiliationInfo("Three", "3"))
+
+        self.assertEqual(list(self.affiliation_cache._entries), [1, 3])
+        self.assertEqual(self.affiliation_cache.stats()["size"], 2)
+
+    def test_entries_expire(self):
+        """
+        Test that entries expire after the TTL
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.helper.affiliation_cache.time.time", return_value=1000.0
+        ):
+            self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "1"))
+
+        with patch(
+            "aa_intel_tool.helper.affiliation_cache.time.time",
+            return_value=1000.0 + 86400,
+        ):
+            self.assertIsNone(self.affiliation_cache.get(entity_id=1))
+
+        self.assertEqual(self.affiliation_cache.stats()["size"], 0)
+
+    def test_entries_are_shared_through_django_cache(self):
+        """
+        Test that an entry cached by one worker is available to another one
+
+        :return:
+        :rtype:
+        """
+
+        self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "1"))
+
+        other_worker_cache = AffiliationCache(entity_type="test")
+
+        self.assertEqual(
+            other_worker_cache.get(entity_id=1), AffiliationInfo("One", "1")
+        )
+        self.assertEqual(other_worker_cache.stats()["size"], 1)
+
+    @patch(
+        "aa_intel_tool.helper.affiliation_cache.AppSettings.INTELTOOL_METRICS_ENABLED",
+        True,
+    )
+    def test_stats_count_hits_and_misses(self):
+        """
+        Test that hits and misses are counted, when metrics are enabled
+
+        :return:
+        :rtype:
+        """
+
+        self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "1"))
+
+        self.affiliation_cache.get_many(entity_ids=[1, 2, 3])
+        self.affiliation_cache.get(entity_id=1)
+
+        self.assertEqual(
+            self.affiliation_cache.stats(),
+            {"size": 1, "max_size": 10000, "hits": 2, "misses": 2},
+        )
+
+        self.affiliation_cache.clear()
+
+        self.assertEqual(
+            self.affiliation_cache.stats(),
+            {"size": 0, "max_size": 10000, "hits": 0, "misses": 0},
+        )
+
+    @patch(
+        "aa_intel_tool.helper.affiliation_cache.AppSettings.INTELTOOL_METRICS_ENABLED",
+        False,
+    )
+    def test_does_not_count_hits_and_misses_when_metrics_are_disabled(self):
+        """
+        Test that lookups don't touch the counters, when metrics are disabled
+
+        :return:
+        :rtype:
+        """
+
+        self.affiliation_cache.set(entity_id=1, info=AffiliationInfo("One", "1"))
+
+        with (
+            patch("aa_intel_tool.helper.affiliation_cache.cache.incr") as mock_incr,
+            patch("aa_intel_tool.helper.affiliation_cache.cache.add") as mock_add,
+        ):
+            self.affiliation_cache.get_many(entity_ids=[1, 2])
+
+        mock_incr.assert_not_called()
+        mock_add.assert_not_called()
+        self.assertEqual(self.affiliation_cache.stats()["hits"], 0)
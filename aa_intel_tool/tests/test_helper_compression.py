@@ -0,0 +1,78 @@
+"""
+Tests for the compression helper => aa_intel_tool/helper/compression.py
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# AA Intel Tool
+from aa_intel_tool.helper.compression import (
+    COMPRESSION_MARKER,
+    compress,
+    compress_if_enabled,
+    decompress,
+)
+from aa_intel_tool.tests import BaseTestCase
+
+JSON_DATA = b'[{"portrait": "https://images.evetech.net/characters/1/portrait"}]' * 20
+
+
+class TestHelperCompression(BaseTestCase):
+    """
+    Testing the compression helper
+    """
+
+    def test_compress_and_decompress(self):
+        """
+        Test that compressed data is marked and decompresses to the original data
+
+        :return:
+        :rtype:
+        """
+
+        compressed = compress(data=JSON_DATA)
+
+        self.assertTrue(compressed.startswith(COMPRESSION_MARKER))
+        self.assertLess(len(compressed), len(JSON_DATA))
+        self.assertEqual(decompress(data=memoryview(compressed)), JSON_DATA)
+
+    def test_keeps_data_that_does_not_get_smaller(self):
+        """
+        Test that data that doesn't get smaller is kept uncompressed
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(compress(data=b"[]"), b"[]")
+        self.assertEqual(decompress(data=b"[]"), b"[]")
+
+    def test_does_not_compress_twice(self):
+        """
+        Test that already compressed data is not compressed again
+
+        :return:
+        :rtype:
+        """
+
+        compressed = compress(data=JSON_DATA)
+
+        self.assertEqual(compress(data=compressed), compressed)
+
+    def test_compress_if_enabled(self):
+        """
+        Test that data is only compressed when enabled
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(compress_if_enabled(data=JSON_DATA), JSON_DATA)
+
+        with patch(
+            "aa_intel_tool.helper.compression.AppSettings.INTELTOOL_COMPRESS_SCAN_DATA",
+            True,
+        ):
+            self.assertEqual(
+                compress_if_enabled(data=JSON_DATA), compress(data=JSON_DATA)
+            )
@@ -3,31 +3,81 @@ Tests for the helper functions in the eve_character module.
 """
 
 # Standard Library
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
 # Alliance Auth
 from allianceauth.eveonline.models import (
     EveAllianceInfo,
+    EveCharacter,
     EveCorporationInfo,
 )
 
 # AA Intel Tool
+from aa_intel_tool.helper.affiliation_cache import (
+    AffiliationInfo,
+    alliance_cache,
+    corporation_cache,
+)
 from aa_intel_tool.helper.eve_character import (
     _create_alliance,
     _create_corporation,
+    _fetch_affiliation_details,
     _fetch_affiliations_with_retry,
     _fetch_ids_with_retry,
-    _get_alliance_info_from_affiliation,
-    _get_corporation_info_from_affiliation,
+    _unresolvable_name_cache_key,
+    clean_character_name,
     create_characters,
     fetch_character_ids_from_esi,
-    temp_alliance_data,
-    temp_corp_data,
+    normalize_character_name,
+    refresh_character_affiliations,
 )
+from aa_intel_tool.models import CharacterName
 from aa_intel_tool.providers.esi import ESIHandler
 from aa_intel_tool.tests import BaseTestCase, random_id
 
+# The affiliation cache and the unresolvable names live in Django's cache,
+# use a local memory cache for the tests
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+class TestNormalizeCharacterName(BaseTestCase):
+    """
+    Test cleaning and normalizing character names
+    """
+
+    def test_cleans_whitespace_and_keeps_the_case(self):
+        """
+        Test that surrounding and repeated whitespace is removed, the case is kept
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            clean_character_name(name="  Bravo \t Charlie "), "Bravo Charlie"
+        )
+
+    def test_normalizes_all_variations_of_a_name_alike(self):
+        """
+        Test that whitespace and case variations of a name are normalized alike
+
+        :return:
+        :rtype:
+        """
+
+        for name in ("Bravo Charlie", "bravo charlie", " BRAVO  Charlie\t"):
+            with self.subTest(name=name):
+                self.assertEqual(normalize_character_name(name=name), "bravo charlie")
+
 
 class TestCreateAlliance(BaseTestCase):
     """
@@ -216,129 +266,6 @@ class TestCreateCorporation(BaseTestCase):
             mock_create_corporation.assert_not_called()
 
 
-class TestGetCorporationInfoFromAffiliation(BaseTestCase):
-    """
-    Test the _get_corporation_info_from_affiliation function.
-    """
-
-    def test_retrieves_corporation_info_from_cache(self):
-        """
-        Test that corporation information is retrieved from the cache when available.
-
-        :return:
-        :rtype:
-        """
-
-        temp_corp_data[12345] = {"corporation_id": 12345, "name": "Cached Corporation"}
-        affiliation_data = {"corporation_id": 12345}
-
-        result = _get_corporation_info_from_affiliation(affiliation_data)
-
-        self.assertEqual(
-            result, {"corporation_id": 12345, "name": "Cached Corporation"}
-        )
-        self.assertIn(12345, temp_corp_data)
-
-    def test_fetches_corporation_info_when_not_in_cache(self):
-        """
-        Test that corporation information is fetched from the ESI API when not available in the cache.
-
-        :return:
-        :rtype:
-        """
-
-        with patch.object(
-            ESIHandler,
-            "get_corporations_corporation_id",
-            return_value={"corporation_id": 67890, "name": "Fetched Corporation"},
-        ) as mock_fetch:
-            affiliation_data = {"corporation_id": 67890}
-
-            result = _get_corporation_info_from_affiliation(affiliation_data)
-
-            self.assertEqual(
-                result, {"corporation_id": 67890, "name": "Fetched Corporation"}
-            )
-            self.assertIn(67890, temp_corp_data)
-            mock_fetch.assert_called_once_with(corporation_id=67890, use_etag=False)
-
-    def test_returns_none_when_corporation_id_is_invalid(self):
-        """
-        Test that None is returned when the corporation ID is invalid and cannot be fetched.
-
-        :return:
-        :rtype:
-        """
-
-        with patch.object(
-            ESIHandler, "get_corporations_corporation_id", return_value=None
-        ) as mock_fetch:
-            affiliation_data = {"corporation_id": 99999}
-
-            result = _get_corporation_info_from_affiliation(affiliation_data)
-
-            self.assertIsNone(result)
-            self.assertIn(99999, temp_corp_data)
-            mock_fetch.assert_called_once_with(corporation_id=99999, use_etag=False)
-
-
-class TestGetAllianceInfofromAffiliation(BaseTestCase):
-    """
-    Test the _get_alliance_info_from_affiliation function.
-    """
-
-    def test_retrieves_alliance_info_from_cache(self):
-        """
-        Test that alliance information is retrieved from the cache when available.
-
-        :return:
-        :rtype:
-        """
-
-        temp_alliance_data[54321] = {"alliance_id": 54321, "name": "Cached Alliance"}
-        affiliation_data = {"alliance_id": 54321, "character_id": 12345}
-
-        result = _get_alliance_info_from_affiliation(affiliation_data)
-
-        self.assertEqual(result, {"alliance_id": 54321, "name": "Cached Alliance"})
-        self.assertIn(54321, temp_alliance_data)
-
-    def test_fetches_alliance_info_when_not_in_cache(self):
-        """
-        Test that alliance information is fetched from the ESI API when not available in the cache.
-
-        :return:
-        :rtype:
-
-        """
-        with patch.object(
-            ESIHandler,
-            "get_alliances_alliance_id",
-            return_value={"alliance_id": 98765, "name": "Fetched Alliance"},
-        ) as mock_fetch:
-            affiliation_data = {"alliance_id": 98765, "character_id": 12345}
-
-            result = _get_alliance_info_from_affiliation(affiliation_data)
-
-            self.assertEqual(result, {"alliance_id": 98765, "name": "Fetched Alliance"})
-            self.assertIn(98765, temp_alliance_data)
-            mock_fetch.assert_called_once_with(alliance_id=98765, use_etag=False)
-
-    def test_returns_none_when_alliance_id_is_missing(self):
-        """
-        Test that None is returned when the alliance ID is missing from the affiliation data.
-
-        :return:
-        :rtype:
-        """
-
-        affiliation_data = {"character_id": 12345}
-
-        result = _get_alliance_info_from_affiliation(affiliation_data)
-
-        self.assertIsNone(result)
-
-
 class TestFetchAffiliationsWithRetry(BaseTestCase):
     """
     Test the _fetch_affiliations_with_retry function.
@@ -426,11 +353,24 @@ class TestFetchAffiliationsWithRetry(BaseTestCase):
             mock_post.assert_called_once_with(ids=[1])
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class TestFetchIdsWithRetry(BaseTestCase):
     """
     Test the _fetch_ids_with_retry function.
     """
 
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
     def test_fetches_ids_successfully(self):
         """
         Test that IDs are fetched successfully for a valid chunk of character names.
@@ -543,7 +483,253 @@ class TestFetchIdsWithRetry(BaseTestCase):
             self.assertEqual(result, [])
             mock_post.assert_called_once_with(names=["TestName"])
 
+    def test_caches_names_esi_did_not_resolve(self):
+        """
+        Test that names missing from the ESI response are remembered as unresolvable.
+
+        :return:
+        :rtype:
+        """
+
+        with patch.object(
+            ESIHandler,
+            "post_universe_ids",
+            return_value=SimpleNamespace(
+                model_dump=lambda: {"characters": [{"id": 1, "name": "Test"}]}
+            ),
+        ):
+            _fetch_ids_with_retry(chunk=["Test", "Tset"])
+
+        self.assertIsNone(cache.get(_unresolvable_name_cache_key(name="Test")))
+        self.assertTrue(cache.get(_unresolvable_name_cache_key(name="Tset")))
+
+    def test_does_not_cache_names_when_esi_fails(self):
+        """
+        Test that names are not remembered as unresolvable when ESI didn't answer.
+
+        :return:
+        :rtype:
+        """
+
+        with patch.object(ESIHandler, "post_universe_ids", return_value=None):
+            _fetch_ids_with_retry(chunk=["Test"])
+
+        self.assertIsNone(cache.get(_unresolvable_name_cache_key(name="Test")))
+
+    def test_does_not_cache_names_when_disabled(self):
+        """
+        Test that no names are remembered when the negative cache is disabled.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch.object(
+                ESIHandler,
+                "post_universe_ids",
+                return_value=SimpleNamespace(model_dump=lambda: {"characters": None}),
+            ),
+            patch(
+                "aa_intel_tool.helper.eve_character.AppSettings.INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL",
+                0,
+            ),
+        ):
+            _fetch_ids_with_retry(chunk=["Test"])
+
+        self.assertIsNone(cache.get(_unresolvable_name_cache_key(name="Test")))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestFetchAffiliationDetails(BaseTestCase):
+    """
+    Test the _fetch_affiliation_details function.
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+        corporation_cache.clear()
+        alliance_cache.clear()
+
+    def test_fetches_each_corporation_and_alliance_only_once(self):
+        """
+        Test that duplicate corporation and alliance IDs are only fetched once, and the results are returned and cached.
+
+        :return:
+        :rtype:
+        """
+
+        affiliations = [
+            {"corporation_id": 100, "alliance_id": 200},
+            {"corporation_id": 100, "alliance_id": 200},
+            {"corporation_id": 101, "alliance_id": None},
+        ]
 
+        with (
+            patch.object(
+                ESIHandler,
+                "get_corporations_corporation_id",
+                side_effect=lambda corporation_id, use_etag: SimpleNamespace(
+                    name=f"Corp {corporation_id}", ticker="C"
+                ),
+            ) as mock_get_corp,
+            patch.object(
+                ESIHandler,
+                "get_alliances_alliance_id",
+                side_effect=lambda alliance_id, use_etag: SimpleNamespace(
+                    name=f"Alliance {alliance_id}", ticker="A"
+                ),
+            ) as mock_get_alliance,
+        ):
+            result = _fetch_affiliation_details(affiliations=affiliations)
+
+            self.assertEqual(mock_get_corp.call_count, 2)
+            mock_get_alliance.assert_called_once_with(alliance_id=200, use_etag=False)
+            self.assertEqual(
+                result,
+                {
+                    "corporations": {
+                        100: AffiliationInfo("Corp 100", "C"),
+                        101: AffiliationInfo("Corp 101", "C"),
+                    },
+                    "alliances": {200: AffiliationInfo("Alliance 200", "A")},
+                },
+            )
+            self.assertEqual(
+                corporation_cache.get_many(entity_ids=[100, 101]),
+                result["corporations"],
+            )
+
+    def test_skips_ids_in_cache(self):
+        """
+        Test that corporations and alliances already in the cache are not fetched again.
+
+        :return:
+        :rtype:
+        """
+
+        corporation_cache.set(entity_id=100, info=AffiliationInfo("Cached Corp", "CC"))
+        alliance_cache.set(entity_id=200, info=AffiliationInfo("Cached Alliance", "CA"))
+
+        with (
+            patch.object(
+                ESIHandler, "get_corporations_corporation_id"
+            ) as mock_get_corp,
+            patch.object(ESIHandler, "get_alliances_alliance_id") as mock_get_alliance,
+            patch(
+                "aa_intel_tool.helper.eve_character.ThreadPoolExecutor"
+            ) as mock_executor,
+        ):
+            result = _fetch_affiliation_details(
+                affiliations=[{"corporation_id": 100, "alliance_id": 200}]
+            )
+
+            mock_get_corp.assert_not_called()
+            mock_get_alliance.assert_not_called()
+            mock_executor.assert_not_called()
+            self.assertEqual(
+                result,
+                {
+                    "corporations": {100: AffiliationInfo("Cached Corp", "CC")},
+                    "alliances": {200: AffiliationInfo("Cached Alliance", "CA")},
+                },
+            )
+
+    def test_does_not_cache_failed_lookups(self):
+        """
+        Test that corporations and alliances ESI couldn't return are None and not cached.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch.object(
+                ESIHandler, "get_corporations_corporation_id", return_value=None
+            ),
+            patch.object(ESIHandler, "get_alliances_alliance_id", return_value=None),
+        ):
+            result = _fetch_affiliation_details(
+                affiliations=[{"corporation_id": 99999, "alliance_id": 88888}]
+            )
+
+        self.assertEqual(
+            result, {"corporations": {99999: None}, "alliances": {88888: None}}
+        )
+        self.assertIsNone(corporation_cache.get(entity_id=99999))
+        self.assertIsNone(alliance_cache.get(entity_id=88888))
+
+    def test_closes_the_database_connections_of_the_worker_threads(self):
+        """
+        Test that every job closes the database connections of its worker thread.
+
+        :return:
+        :rtype:
+        """
+
+        affiliations = [
+            {"corporation_id": 100, "alliance_id": 200},
+            {"corporation_id": 101, "alliance_id": None},
+        ]
+
+        with (
+            patch.object(
+                ESIHandler, "get_corporations_corporation_id", return_value=None
+            ),
+            patch.object(
+                ESIHandler, "get_alliances_alliance_id", side_effect=Exception
+            ),
+            patch("aa_intel_tool.helper.eve_character.connections") as mock_connections,
+        ):
+            with self.assertRaises(Exception):
+                _fetch_affiliation_details(affiliations=affiliations)
+
+        self.assertEqual(mock_connections.close_all.call_count, 3)
+
+    def test_limits_concurrent_requests(self):
+        """
+        Test that the number of workers is limited by INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS.
+
+        :return:
+        :rtype:
+        """
+
+        affiliations = [
+            {"corporation_id": corporation_id, "alliance_id": None}
+            for corporation_id in range(100, 110)
+        ]
+
+        with (
+            patch(
+                "aa_intel_tool.helper.eve_character.AppSettings.INTELTOOL_ESI_MAX_CONCURRENT_REQUESTS",
+                3,
+            ),
+            patch.object(
+                ESIHandler,
+                "get_corporations_corporation_id",
+                return_value=SimpleNamespace(name="Corp", ticker="C"),
+            ),
+            patch(
+                "aa_intel_tool.helper.eve_character.ThreadPoolExecutor",
+                wraps=ThreadPoolExecutor,
+            ) as mock_executor,
+        ):
+            result = _fetch_affiliation_details(affiliations=affiliations)
+
+            mock_executor.assert_called_once_with(max_workers=3)
+            self.assertEqual(len(result["corporations"]), 10)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
 class TestCreateCharacters(BaseTestCase):
     """
     Test the create_characters function.
@@ -726,12 +912,8 @@ class TestCreateCharacters(BaseTestCase):
                 return_value=[],
             ),
             patch(
-                "aa_intel_tool.helper.eve_character._get_corporation_info_from_affiliation",
-                return_value=None,
-            ),
-            patch(
-                "aa_intel_tool.helper.eve_character._get_alliance_info_from_affiliation",
-                return_value=None,
+                "aa_intel_tool.helper.eve_character._fetch_affiliation_details",
+                return_value={"corporations": {}, "alliances": {}},
             ),
             patch(
                 "aa_intel_tool.helper.eve_character.EveCharacter.objects.bulk_create"
@@ -772,12 +954,8 @@ class TestCreateCharacters(BaseTestCase):
                 return_value=[],
             ),
             patch(
-                "aa_intel_tool.helper.eve_character._get_corporation_info_from_affiliation",
-                return_value=None,
-            ),
-            patch(
-                "aa_intel_tool.helper.eve_character._get_alliance_info_from_affiliation",
-                return_value=None,
+                "aa_intel_tool.helper.eve_character._fetch_affiliation_details",
+                return_value={"corporations": {}, "alliances": {}},
             ),
             patch(
                 "aa_intel_tool.helper.eve_character.EveCharacter.objects.bulk_create"
@@ -800,11 +978,24 @@ class TestCreateCharacters(BaseTestCase):
             mock_create_corporation.assert_called_once_with({123})
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class TestFetchCharacterIdsFromEsi(BaseTestCase):
     """
     Test the fetch_character_ids_from_esi function.
     """
 
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
     def test_fetches_character_ids_in_chunks(self):
         """
         Test that character IDs are fetched in chunks when the number of character names exceeds the chunk size, and that results are combined correctly.
@@ -935,3 +1126,276 @@ class TestFetchCharacterIdsFromEsi(BaseTestCase):
             mock_warning.assert_called_once_with(
                 f"No ID information received from ESI for chunk {1} with character IDs: {characters_to_fetch}"
             )
+
+    def test_skips_names_esi_could_not_resolve(self):
+        """
+        Test that names ESI recently couldn't resolve are not sent to ESI again,
+        regardless of their case and whitespace, and resolved names are taken from
+        the database.
+
+        :return:
+        :rtype:
+        """
+
+        with patch.object(
+            ESIHandler,
+            "post_universe_ids",
+            return_value=SimpleNamespace(
+                model_dump=lambda: {"characters": [{"id": 1, "name": "Alpha"}]}
+            ),
+        ) as mock_post:
+            fetch_character_ids_from_esi(characters_to_fetch=["Alpha", "Bravo Charlie"])
+
+            mock_post.reset_mock()
+
+            result = fetch_character_ids_from_esi(
+                characters_to_fetch=["Alpha", "bravo  charlie "]
+            )
+
+            self.assertEqual(result, [{"id": 1, "name": "Alpha"}])
+            mock_post.assert_not_called()
+
+    def test_skips_esi_when_all_names_are_unresolvable(self):
+        """
+        Test that ESI is not called at all when all names are known to be unresolvable.
+
+        :return:
+        :rtype:
+        """
+
+        cache.set(key=_unresolvable_name_cache_key(name="Junk Line"), value=True)
+
+        with patch(
+            "aa_intel_tool.helper.eve_character._fetch_ids_with_retry"
+        ) as mock_fetch_ids_with_retry:
+            result = fetch_character_ids_from_esi(characters_to_fetch={"Junk Line"})
+
+            self.assertEqual(result, [])
+            mock_fetch_ids_with_retry.assert_not_called()
+
+    def test_stores_the_resolved_names(self):
+        """
+        Test that the names ESI resolved are stored with their character IDs,
+        and updated when ESI resolves them to another character.
+
+        :return:
+        :rtype:
+        """
+
+        for character_id in (1, 2):
+            with patch.object(
+                ESIHandler,
+                "post_universe_ids",
+                return_value=SimpleNamespace(
+                    model_dump=lambda character_id=character_id: {
+                        "characters": [{"id": character_id, "name": "Alpha Bravo"}]
+                    }
+                ),
+            ):
+                _fetch_ids_with_retry(chunk=["alpha bravo"])
+
+            with self.subTest(character_id=character_id):
+                character_name = CharacterName.objects.get()
+
+                self.assertEqual(character_name.normalized_name, "alpha bravo")
+                self.assertEqual(character_name.name, "Alpha Bravo")
+                self.assertEqual(character_name.character_id, character_id)
+
+    def test_resolves_stored_names_without_esi(self):
+        """
+        Test that names, which were resolved before, are taken from the database,
+        regardless of their case and whitespace, and only the others are sent to ESI.
+
+        :return:
+        :rtype:
+        """
+
+        CharacterName.objects.create(
+            normalized_name="alpha bravo", name="Alpha Bravo", character_id=1
+        )
+
+        with patch.object(
+            ESIHandler,
+            "post_universe_ids",
+            return_value=SimpleNamespace(
+                model_dump=lambda: {"characters": [{"id": 2, "name": "Charlie"}]}
+            ),
+        ) as mock_post:
+            result = fetch_character_ids_from_esi(
+                characters_to_fetch=[" ALPHA  bravo", "Charlie"]
+            )
+
+            self.assertEqual(
+                result,
+                [{"id": 1, "name": "Alpha Bravo"}, {"id": 2, "name": "Charlie"}],
+            )
+            mock_post.assert_called_once_with(names=["Charlie"])
+
+
+@patch("aa_intel_tool.helper.eve_character._create_corporation")
+@patch("aa_intel_tool.helper.eve_character._create_alliance")
+class TestRefreshCharacterAffiliations(BaseTestCase):
+    """
+    Test the refresh_character_affiliations function.
+    """
+
+    def setUp(self):
+        """
+        Create two characters, which were never refreshed
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.characters = [
+            EveCharacter.objects.create(
+                character_id=90000000 + i,
+                character_name=f"Pilot {i}",
+                corporation_id=98000001,
+                corporation_name="Old Corporation",
+                corporation_ticker="OLD",
+            )
+            for i in range(2)
+        ]
+
+    def test_updates_the_changed_affiliations(
+        self, mock_create_alliance, mock_create_corporation
+    ):
+        """
+        Test that changed affiliations are updated with the corporation, alliance and
+        faction details, and unchanged ones only get their refresh time updated.
+
+        :param mock_create_alliance:
+        :type mock_create_alliance:
+        :param mock_create_corporation:
+        :type mock_create_corporation:
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_intel_tool.helper.eve_character._fetch_affiliations_with_retry",
+                return_value=[
+                    SimpleNamespace(
+                        character_id=90000000,
+                        corporation_id=98000002,
+                        alliance_id=99000001,
+                        faction_id=500001,
+                    ),
+                    SimpleNamespace(character_id=90000001, corporation_id=98000001),
+                ],
+            ) as mock_fetch_affiliations,
+            patch(
+                "aa_intel_tool.helper.eve_character._fetch_affiliation_details",
+                return_value={
+                    "corporations": {
+                        98000002: AffiliationInfo(name="New Corporation", ticker="NEW")
+                    },
+                    "alliances": {
+                        99000001: AffiliationInfo(name="New Alliance", ticker="ALLY")
+                    },
+                },
+            ) as mock_fetch_affiliation_details,
+            patch.object(
+                ESIHandler,
+                "get_universe_factions",
+                return_value=[SimpleNamespace(faction_id=500001, name="Caldari State")],
+            ),
+        ):
+            result = refresh_character_affiliations(
+                character_ids=[90000000, 90000001, 90000000]
+            )
+
+        self.assertEqual(result, 1)
+        mock_fetch_affiliations.assert_called_once_with(chunk=[90000000, 90000001])
+        self.assertEqual(
+            [
+                affiliation["character_id"]
+                for affiliation in mock_fetch_affiliation_details.call_args.kwargs[
+                    "affiliations"
+                ]
+            ],
+            [90000000],
+        )
+        mock_create_alliance.assert_called_once_with({99000001})
+        mock_create_corporation.assert_not_called()
+
+        changed, unchanged = EveCharacter.objects.filter(
+            character_id__in=[90000000, 90000001]
+        ).order_by("character_id")
+
+        self.assertEqual(changed.corporation_name, "New Corporation")
+        self.assertEqual(changed.corporation_ticker, "NEW")
+        self.assertEqual(changed.alliance_id, 99000001)
+        self.assertEqual(changed.alliance_name, "New Alliance")
+        self.assertEqual(changed.faction_id, 500001)
+        self.assertEqual(changed.faction_name, "Caldari State")
+        self.assertIsNotNone(changed.last_updated_affiliations)
+        self.assertEqual(unchanged.corporation_name, "Old Corporation")
+        self.assertIsNotNone(unchanged.last_updated_affiliations)
+
+    def test_skips_recently_refreshed_characters(
+        self, mock_create_alliance, mock_create_corporation
+    ):
+        """
+        Test that characters refreshed within ESI's cache time are not refreshed again.
+
+        :param mock_create_alliance:
+        :type mock_create_alliance:
+        :param mock_create_corporation:
+        :type mock_create_corporation:
+        :return:
+        :rtype:
+        """
+
+        EveCharacter.objects.filter(character_id__in=[90000000, 90000001]).update(
+            last_updated_affiliations=timezone.now()
+        )
+
+        with patch(
+            "aa_intel_tool.helper.eve_character._fetch_affiliations_with_retry"
+        ) as mock_fetch_affiliations:
+            result = refresh_character_affiliations(character_ids=[90000000, 90000001])
+
+        self.assertEqual(result, 0)
+        mock_fetch_affiliations.assert_not_called()
+        mock_create_alliance.assert_not_called()
+        mock_create_corporation.assert_not_called()
+
+    def test_refreshes_in_batches(self, mock_create_alliance, mock_create_corporation):
+        """
+        Test that the characters are refreshed with one ESI request per batch.
+
+        :param mock_create_alliance:
+        :type mock_create_alliance:
+        :param mock_create_corporation:
+        :type mock_create_corporation:
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("aa_intel_tool.helper.eve_character.AFFILIATION_BATCH_SIZE", 1),
+            patch(
+                "aa_intel_tool.helper.eve_character._fetch_affiliations_with_retry",
+                side_effect=lambda chunk: [
+                    SimpleNamespace(character_id=chunk[0], corporation_id=98000001)
+                ],
+            ) as mock_fetch_affiliations,
+        ):
+            result = refresh_character_affiliations(character_ids=[90000000, 90000001])
+
+        self.assertEqual(result, 0)
+        self.assertEqual(
+            [call.kwargs["chunk"] for call in mock_fetch_affiliations.call_args_list],
+            [[90000000], [90000001]],
+        )
+        self.assertFalse(
+            EveCharacter.objects.filter(
+                character_id__in=[90000000, 90000001],
+                last_updated_affiliations__isnull=True,
+            ).exists()
+        )
@@ -0,0 +1,185 @@
+"""
+Tests for the Eve type helper => aa_intel_tool/helper/eve_type.py
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Third Party
+from eve_sde.models import EveSDE, ItemCategory, ItemGroup, ItemType
+
+# Django
+from django.core.cache import cache
+
+# AA Intel Tool
+from aa_intel_tool.helper.eve_type import (
+    SDE_TYPE_INDEX_CACHE_KEY,
+    EveTypeInfo,
+    clear_type_index,
+    get_eve_types,
+    get_eve_types_by_name,
+    get_type_index,
+)
+from aa_intel_tool.tests import BaseTestCase
+
+
+class TestEveTypeIndex(BaseTestCase):
+    """
+    Testing the SDE type index
+    """
+
+    def setUp(self):
+        """
+        Set up the SDE test data
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        clear_type_index()
+
+        group_frigate = ItemGroup.objects.create(
+            id=25,
+            name="Frigate",
+            category=ItemCategory.objects.create(id=6, name="Ship"),
+        )
+        ItemType.objects.create(id=587, name="Rifter", group=group_frigate, mass=1000)
+        ItemType.objects.create(id=603, name="Merlin", group=group_frigate, mass=2000)
+        ItemType.objects.create(
+            id=34,
+            name="Tritanium",
+            group=ItemGroup.objects.create(
+                id=18,
+                name="Mineral",
+                category=ItemCategory.objects.create(id=4, name="Material"),
+            ),
+        )
+
+    def tearDown(self):
+        """
+        Clear the type index, so other tests start with a cold index
+
+        :return:
+        :rtype:
+        """
+
+        clear_type_index()
+
+        super().tearDown()
+
+    def test_get_eve_types(self):
+        """
+        Test that EVE types are resolved by their IDs
+
+        :return:
+        :rtype:
+        """
+
+        result = get_eve_types(type_ids=[587, 587, 4711])
+
+        self.assertEqual(result, [EveTypeInfo(587, "Rifter", 25, "Frigate", 1000, 6)])
+
+    def test_get_eve_types_by_name(self):
+        """
+        Test that EVE types are resolved by their names
+
+        :return:
+        :rtype:
+        """
+
+        result = get_eve_types_by_name(names=["Merlin", "Unknown Ship"])
+
+        self.assertEqual(result, [EveTypeInfo(603, "Merlin", 25, "Frigate", 2000, 6)])
+        self.assertEqual(result[0].group__name, "Frigate")
+
+    def test_ignores_eve_types_of_other_categories(self):
+        """
+        Test that EVE types outside the categories we care about are not indexed
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(get_eve_types(type_ids=[34]), [])
+        self.assertEqual(get_eve_types_by_name(names=["Tritanium"]), [])
+
+    def test_index_is_only_loaded_once(self):
+        """
+        Test that a warm index doesn't touch the DB
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(2):
+            get_eve_types(type_ids=[587])
+
+        with self.assertNumQueries(0):
+            get_eve_types(type_ids=[603])
+            get_eve_types_by_name(names=["Rifter"])
+
+    def test_index_is_loaded_from_django_cache(self):
+        """
+        Test that the index is taken from Django's cache when the SDE build matches
+
+        :return:
+        :rtype:
+        """
+
+        get_type_index()
+        clear_type_index()
+
+        cache.set(
+            key=SDE_TYPE_INDEX_CACHE_KEY,
+            value={
+                "build_number": None,
+                "by_id": {1: EveTypeInfo(1, "Cached", 2, "Group", 0, 6)},
+                "by_name": {"Cached": 1},
+            },
+            timeout=None,
+        )
+
+        # Only the SDE build number is queried
+        with self.assertNumQueries(1):
+            result = get_eve_types(type_ids=[1, 587])
+
+        self.assertEqual(result, [EveTypeInfo(1, "Cached", 2, "Group", 0, 6)])
+
+    def test_index_is_not_shared_when_django_cache_is_disabled(self):
+        """
+        Test that Django's cache is not used when disabled
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.helper.eve_type.AppSettings.INTELTOOL_SDE_CACHE_USE_DJANGO_CACHE",
+            False,
+        ):
+            get_type_index()
+
+        self.assertIsNone(cache.get(key=SDE_TYPE_INDEX_CACHE_KEY))
+
+    def test_index_is_rebuilt_when_sde_build_changes(self):
+        """
+        Test that the index is invalidated when a new SDE has been imported
+
+        :return:
+        :rtype:
+        """
+
+        self.assertIsNone(get_type_index()["build_number"])
+
+        EveSDE.objects.create(build_number=4711)
+        ItemType.objects.create(
+            id=588, name="Reaper", group=ItemGroup.objects.get(id=25), mass=500
+        )
+
+        with patch("aa_intel_tool.helper.eve_type.SDE_VERSION_CHECK_INTERVAL", 0):
+            result = get_eve_types(type_ids=[588])
+
+        self.assertEqual(get_type_index()["build_number"], 4711)
+        self.assertEqual(result, [EveTypeInfo(588, "Reaper", 25, "Frigate", 500, 6)])
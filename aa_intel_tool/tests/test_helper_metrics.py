@@ -0,0 +1,226 @@
+"""
+Tests for the metrics helper => aa_intel_tool/helper/metrics.py
+"""
+
+# Standard Library
+from unittest.mock import MagicMock, patch
+
+# Third Party
+from aiopenapi3 import RequestError
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# AA Intel Tool
+from aa_intel_tool.exceptions import ParserError
+from aa_intel_tool.helper.affiliation_cache import corporation_cache
+from aa_intel_tool.helper.metrics import (
+    inc_counter,
+    observe_histogram,
+    render_metrics,
+)
+from aa_intel_tool.parser.general import parse_intel
+from aa_intel_tool.providers.esi import ESIHandler
+from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch("aa_intel_tool.helper.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", True)
+class TestMetrics(BaseTestCase):
+    """
+    Test recording and rendering the metrics
+    """
+
+    def setUp(self):
+        """
+        Start with empty metrics
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_renders_all_metrics_with_zero_values(self):
+        """
+        Test that all metrics are rendered, before anything was recorded
+
+        :return:
+        :rtype:
+        """
+
+        metrics = render_metrics()
+
+        self.assertIn("# TYPE aa_intel_tool_scans_parsed_total counter", metrics)
+        self.assertIn('aa_intel_tool_scans_parsed_total{scan_type="dscan"} 0', metrics)
+        self.assertIn("aa_intel_tool_scan_parse_errors_total 0", metrics)
+        self.assertIn("# TYPE aa_intel_tool_parse_duration_seconds histogram", metrics)
+        self.assertTrue(metrics.endswith("\n"))
+
+    def test_increments_counters(self):
+        """
+        Test that counters are incremented per label set
+
+        :return:
+        :rtype:
+        """
+
+        inc_counter(name="aa_intel_tool_scans_parsed_total", scan_type="dscan")
+        inc_counter(name="aa_intel_tool_scans_parsed_total", value=2, scan_type="dscan")
+        inc_counter(name="aa_intel_tool_scans_parsed_total", scan_type="chatlist")
+
+        metrics = render_metrics()
+
+        self.assertIn('aa_intel_tool_scans_parsed_total{scan_type="dscan"} 3', metrics)
+        self.assertIn(
+            'aa_intel_tool_scans_parsed_total{scan_type="chatlist"} 1', metrics
+        )
+        self.assertIn(
+            'aa_intel_tool_scans_parsed_total{scan_type="fleetcomp"} 0', metrics
+        )
+
+    def test_renders_cumulative_histogram_buckets(self):
+        """
+        Test that the histogram buckets are cumulative, with the sum and count
+
+        :return:
+        :rtype:
+        """
+
+        for value in (5, 40, 20000):
+            observe_histogram(
+                name="aa_intel_tool_scan_lines", value=value, scan_type="chatlist"
+            )
+
+        metrics = render_metrics()
+
+        self.assertIn(
+            'aa_intel_tool_scan_lines_bucket{scan_type="chatlist",le="10"} 1', metrics
+        )
+        self.assertIn(
+            'aa_intel_tool_scan_lines_bucket{scan_type="chatlist",le="50"} 2', metrics
+        )
+        self.assertIn(
+            'aa_intel_tool_scan_lines_bucket{scan_type="chatlist",le="5000"} 2',
+            metrics,
+        )
+        self.assertIn(
+            'aa_intel_tool_scan_lines_bucket{scan_type="chatlist",le="+Inf"} 3',
+            metrics,
+        )
+        self.assertIn(
+            'aa_intel_tool_scan_lines_sum{scan_type="chatlist"} 20045.0', metrics
+        )
+        self.assertIn('aa_intel_tool_scan_lines_count{scan_type="chatlist"} 3', metrics)
+
+    def test_renders_the_affiliation_cache_statistics(self):
+        """
+        Test that the hits and misses of the affiliation caches are rendered
+
+        :return:
+        :rtype:
+        """
+
+        corporation_cache.get_many(entity_ids=[98000001])
+
+        metrics = render_metrics()
+
+        self.assertIn(
+            'aa_intel_tool_affiliation_cache_requests_total{cache="corporation",result="miss"} 1',
+            metrics,
+        )
+
+    def test_records_esi_requests_by_operation_and_result(self):
+        """
+        Test that ESI requests are counted by operation and result
+
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="PostUniverseIds")
+
+        ESIHandler.result(operation=operation)
+
+        operation.result.side_effect = RequestError(None, None, None, None)
+
+        ESIHandler.result(operation=operation)
+
+        metrics = render_metrics()
+
+        self.assertIn(
+            'aa_intel_tool_esi_requests_total{operation="PostUniverseIds",result="ok"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'aa_intel_tool_esi_requests_total{operation="PostUniverseIds",result="error"} 1',
+            metrics,
+        )
+
+    @patch(
+        "aa_intel_tool.parser.general.AppSettings.INTELTOOL_DEDUPLICATION_WINDOW", 60
+    )
+    def test_records_parsed_scans_and_parse_errors(self):
+        """
+        Test that parsed scans, their lines and parse errors are recorded
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_intel_tool.parser.general.match_intel_type",
+                return_value=("fleetcomp", []),
+            ),
+            patch(
+                "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+                {
+                    "fleetcomp": {
+                        "parser": MagicMock(return_value=MagicMock(hash="hash1"))
+                    }
+                },
+            ),
+        ):
+            parse_intel(form_data="line 1\nline 2")
+
+        with self.assertRaises(ParserError):
+            parse_intel(form_data="Not a supported intel type")
+
+        metrics = render_metrics()
+
+        self.assertIn(
+            'aa_intel_tool_scans_parsed_total{scan_type="fleetcomp"} 1', metrics
+        )
+        self.assertIn(
+            'aa_intel_tool_scan_lines_bucket{scan_type="fleetcomp",le="10"} 1', metrics
+        )
+        self.assertIn("aa_intel_tool_scan_parse_errors_total 1", metrics)
+        self.assertIn(
+            'aa_intel_tool_cache_requests_total{cache="scan_digest",result="miss"} 2',
+            metrics,
+        )
+
+    def test_records_nothing_when_disabled(self):
+        """
+        Test that nothing is recorded, when the metrics are disabled
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.helper.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", False
+        ):
+            inc_counter(name="aa_intel_tool_scan_parse_errors_total")
+            observe_histogram(
+                name="aa_intel_tool_scan_lines", value=10, scan_type="chatlist"
+            )
+
+        metrics = render_metrics()
+
+        self.assertIn("aa_intel_tool_scan_parse_errors_total 0", metrics)
+        self.assertIn('aa_intel_tool_scan_lines_count{scan_type="chatlist"} 0', metrics)
@@ -0,0 +1,101 @@
+"""
+Tests for the parse statistics helper => aa_intel_tool/helper/parse_stats.py
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# AA Intel Tool
+from aa_intel_tool.helper.parse_stats import (
+    OTHER_STAGE,
+    add_parse_count,
+    collect_parse_stats,
+    parse_stage,
+)
+from aa_intel_tool.models import Scan
+from aa_intel_tool.tests import BaseTestCase
+
+
+class TestParseStats(BaseTestCase):
+    """
+    Test the collection of parse statistics
+    """
+
+    def test_records_the_stages_exclusively(self):
+        """
+        Test that a nested stage's time is not recorded for the outer stage as well
+
+        :return:
+        :rtype:
+        """
+
+        # Every call of the clock advances it by one second
+        with patch(
+            "aa_intel_tool.helper.parse_stats.time.perf_counter",
+            side_effect=range(100),
+        ):
+            with collect_parse_stats() as parse_stats:  # 0
+                with parse_stage(name="parse"):  # 1
+                    with parse_stage(name="sde"):  # 2
+                        pass
+                    # 3
+                # 4
+            # 5
+
+        stats = parse_stats.as_dict()
+
+        self.assertEqual(stats["stages"][OTHER_STAGE]["ms"], 2000.0)
+        self.assertEqual(stats["stages"]["parse"]["ms"], 2000.0)
+        self.assertEqual(stats["stages"]["sde"]["ms"], 1000.0)
+        self.assertEqual(stats["total_ms"], 5000.0)
+
+    def test_counts_the_queries_per_stage(self):
+        """
+        Test that the queries are counted for the stage they were run in
+
+        :return:
+        :rtype:
+        """
+
+        with collect_parse_stats() as parse_stats:
+            with parse_stage(name="db_write"):
+                Scan.objects.create(raw_data="test data")
+
+            list(Scan.objects.all())
+
+        stages = parse_stats.as_dict()["stages"]
+
+        self.assertGreaterEqual(stages["db_write"]["queries"], 1)
+        self.assertEqual(stages[OTHER_STAGE]["queries"], 1)
+
+    def test_adds_to_the_counters(self):
+        """
+        Test that the counters are summed up
+
+        :return:
+        :rtype:
+        """
+
+        with collect_parse_stats() as parse_stats:
+            add_parse_count(name="esi_calls")
+            add_parse_count(name="esi_calls", value=2)
+            add_parse_count(name="lines", value=10)
+
+        self.assertEqual(parse_stats.as_dict()["counts"], {"esi_calls": 3, "lines": 10})
+
+    def test_does_nothing_without_collecting(self):
+        """
+        Test that stages and counters can be used without collecting statistics
+
+        :return:
+        :rtype:
+        """
+
+        with parse_stage(name="parse"):
+            add_parse_count(name="lines")
+
+        with collect_parse_stats() as parse_stats:
+            pass
+
+        self.assertEqual(parse_stats.as_dict()["counts"], {})
+        self.assertEqual(list(parse_stats.as_dict()["stages"]), [OTHER_STAGE])
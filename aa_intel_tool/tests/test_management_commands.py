@@ -0,0 +1,56 @@
+"""
+Tests for the management commands
+"""
+
+# Standard Library
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+
+# AA Intel Tool
+from aa_intel_tool.helper.compression import COMPRESSION_MARKER
+from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.tests import BaseTestCase
+
+
+class TestCompressScansCommand(BaseTestCase):
+    """
+    Testing the aa_intel_tool_compress_scans management command
+    """
+
+    def test_compresses_and_decompresses_existing_scans(self):
+        """
+        Test that existing scans are compressed and decompressed, and the bytes saved are reported
+
+        :return:
+        :rtype:
+        """
+
+        raw_data = "Pilot Name\n" * 100
+        processed_data = [{"name": "Pilot Name", "count": 1}] * 100
+        scan = Scan.objects.create(raw_data=raw_data)
+        ScanData.objects.create(
+            scan=scan, section=ScanData.Section.PILOTLIST, processed_data=processed_data
+        )
+
+        out = StringIO()
+        call_command("aa_intel_tool_compress_scans", stdout=out)
+
+        scan = Scan.objects.get(pk=scan.pk)
+        scan_data = ScanData.objects.get(scan=scan)
+
+        self.assertTrue(bytes(scan.raw_data_bytes).startswith(COMPRESSION_MARKER))
+        self.assertTrue(
+            bytes(scan_data.processed_data_json).startswith(COMPRESSION_MARKER)
+        )
+        self.assertEqual(scan.raw_data, raw_data)
+        self.assertEqual(scan_data.processed_data, processed_data)
+        self.assertIn("Scans: 1 row(s), 1,100 » ", out.getvalue())
+        self.assertIn("bytes saved", out.getvalue())
+
+        call_command("aa_intel_tool_compress_scans", "--decompress", stdout=StringIO())
+
+        scan = Scan.objects.get(pk=scan.pk)
+
+        self.assertEqual(bytes(scan.raw_data_bytes), raw_data.encode())
@@ -6,7 +6,8 @@ Tests for our models
 from unittest.mock import patch
 
 # Django
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 
 # AA Intel Tool
 from aa_intel_tool.models import Scan, ScanData
@@ -58,21 +59,59 @@ class TestScanModel(BaseTestCase):
 
     def test_handles_collision_by_generating_new_hash(self):
         """
-        Test that the hash collision is handled by generating a new hash
+        Test that the hash collision is handled by inserting with a new hash
 
         :return:
         :rtype:
         """
 
-        with patch("aa_intel_tool.models.Scan.objects.filter") as mock_filter:
-            # Simulate hash collision by returning True for the first two calls
-            mock_filter.return_value.exists.side_effect = [True, True, False]
+        existing_scan = Scan.objects.create(raw_data="test data")
+
+        with patch(
+            "aa_intel_tool.models.Scan.generate_scan_hash",
+            side_effect=[existing_scan.hash, existing_scan.hash, "new_hash"],
+        ):
+            scan = Scan.objects.create(raw_data="other data")
+
+        self.assertEqual(scan.hash, "new_hash")
+        self.assertEqual(Scan.objects.get(pk=existing_scan.hash).raw_data, "test data")
+
+    def test_gives_up_after_repeated_collisions(self):
+        """
+        Test that the IntegrityError is raised, when every new hash collides
+
+        :return:
+        :rtype:
+        """
 
-            new_hash = Scan.generate_scan_hash()
+        existing_scan = Scan.objects.create(raw_data="test data")
+
+        with (
+            patch(
+                "aa_intel_tool.models.Scan.generate_scan_hash",
+                return_value=existing_scan.hash,
+            ),
+            self.assertRaises(IntegrityError),
+        ):
+            Scan.objects.create(raw_data="other data")
 
-            self.assertIsNotNone(new_hash)
-            self.assertEqual(len(new_hash), 30)
-            self.assertNotIn(new_hash, ["collision_hash1", "collision_hash2"])
+    def test_creates_scan_with_a_single_insert(self):
+        """
+        Test that a new scan is created without probing for its hash first
+
+        :return:
+        :rtype:
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            Scan.objects.create(raw_data="test data")
+
+        statements = [
+            query["sql"] for query in queries if "SAVEPOINT" not in query["sql"]
+        ]
+
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("INSERT"))
 
     def test_saves_with_generated_hash(self):
         """
@@ -153,6 +192,57 @@ class TestScanDataModel(BaseTestCase):
         self.assertEqual(scan_data.section, ScanData.Section.PILOTLIST)
         self.assertEqual(scan_data.processed_data, {"key": "value"})
 
+    def test_stores_processed_data_as_serialized_json(self):
+        """
+        Test that the processed data is stored as serialized JSON and decoded on access
+
+        :return:
+        :rtype:
+        """
+
+        scan = Scan.objects.create(raw_data="test data")
+        ScanData.objects.create(
+            scan=scan,
+            section=ScanData.Section.PILOTLIST,
+            processed_data=[{"name": "Ærøskøbing"}],
+        )
+
+        scan_data = ScanData.objects.get(scan=scan)
+
+        self.assertEqual(
+            bytes(scan_data.processed_data_json),
+            '[{"name": "\\u00c6r\\u00f8sk\\u00f8bing"}]'.encode(),
+        )
+        self.assertEqual(scan_data.processed_data, [{"name": "Ærøskøbing"}])
+
+    def test_compresses_stored_data_when_enabled(self):
+        """
+        Test that the raw data and the processed data are compressed when enabled
+
+        :return:
+        :rtype:
+        """
+
+        raw_data = "Pilot Name\n" * 100
+        processed_data = [{"name": "Pilot Name"}] * 100
+
+        with patch(
+            "aa_intel_tool.helper.compression.AppSettings.INTELTOOL_COMPRESS_SCAN_DATA",
+            True,
+        ):
+            scan = Scan.objects.create(raw_data=raw_data)
+            ScanData.objects.create(scan=scan, processed_data=processed_data)
+
+        scan = Scan.objects.get(pk=scan.pk)
+        scan_data = ScanData.objects.get(scan=scan)
+
+        self.assertLess(len(scan.raw_data_bytes), len(raw_data))
+        self.assertEqual(scan.raw_data, raw_data)
+        self.assertLess(
+            len(scan_data.processed_data_json), len(ScanData.serialize(processed_data))
+        )
+        self.assertEqual(scan_data.processed_data, processed_data)
+
     def test_defaults_to_invalid_section(self):
         """
         Test that the ScanData model defaults to INVALID section if not specified
@@ -5,10 +5,28 @@ Testing the parsers
 # Standard Library
 from unittest.mock import MagicMock, patch
 
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
 # AA Intel Tool
+from aa_intel_tool.constants import SUPPORTED_INTEL_TYPES
 from aa_intel_tool.exceptions import ParserError
-from aa_intel_tool.parser.general import check_intel_type, parse_intel
+from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.parser.general import (
+    _get_scan_digest_cache_key,
+    check_intel_type,
+    get_scan_error,
+    match_intel_type,
+    parse_intel,
+    parse_pending_scan,
+    queue_intel,
+)
+from aa_intel_tool.parser.helper.db import safe_scan_to_db
 from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
 from aa_intel_tool.tests.utils import (
     load_chatscan_faulty_txt,
     load_chatscan_txt,
@@ -136,91 +154,266 @@ class TestCheckIntelType(BaseTestCase):
             parse_intel(form_data=form_data)
 
 
+class TestMatchIntelType(BaseTestCase):
+    """
+    Test the match_intel_type function
+    """
+
+    def test_returns_matched_lines(self):
+        """
+        Test should return the intel type and one match per line
+
+        :return:
+        :rtype:
+        """
+
+        scan_data = load_dscan_txt().splitlines()
+
+        intel_type, scan_lines = match_intel_type(scan_data=scan_data)
+
+        self.assertEqual(intel_type, "dscan")
+        self.assertEqual([line.string for line in scan_lines], scan_data)
+
+    def test_matches_each_line_only_once(self):
+        """
+        Test should only match the lines against the pattern of the detected intel type
+
+        :return:
+        :rtype:
+        """
+
+        scan_data = load_dscan_txt().splitlines()
+        patterns = {}
+
+        for intel_type, intel_type_attributes in SUPPORTED_INTEL_TYPES.items():
+            patterns[intel_type] = MagicMock(wraps=intel_type_attributes["pattern"])
+
+        with patch.dict(
+            "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+            {
+                intel_type: {**intel_type_attributes, "pattern": patterns[intel_type]}
+                for intel_type, intel_type_attributes in SUPPORTED_INTEL_TYPES.items()
+            },
+        ):
+            match_intel_type(scan_data=scan_data)
+
+        self.assertEqual(patterns["chatlist"].match.call_count, 0)
+        self.assertEqual(patterns["dscan"].match.call_count, len(scan_data))
+        self.assertEqual(patterns["fleetcomp"].match.call_count, 0)
+
+    def test_falls_back_to_next_candidate(self):
+        """
+        Test should check the next candidate when the lines don't match the first one
+
+        :return:
+        :rtype:
+        """
+
+        scan_data = ["123\tSystem\tShip Class\tShip Type\tPosition\t5 - 5 - 5"]
+
+        intel_type, scan_lines = match_intel_type(scan_data=scan_data)
+
+        self.assertEqual(intel_type, "fleetcomp")
+        self.assertEqual(scan_lines[0].group(1), "123")
+
+    def test_raises_error_when_a_line_does_not_match(self):
+        """
+        Test should raise a ParserError when a line outside the sample doesn't match
+
+        :return:
+        :rtype:
+        """
+
+        scan_data = load_dscan_txt().splitlines() + ["Not a D-Scan line"]
+
+        with patch("aa_intel_tool.parser.general.INTEL_TYPE_SAMPLE_SIZE", 1):
+            with self.assertRaises(ParserError):
+                match_intel_type(scan_data=scan_data)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
 class TestParseIntel(BaseTestCase):
     """
     Test the parse_intel function
     """
 
-    @patch("aa_intel_tool.parser.general.check_intel_type")
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+    @patch("aa_intel_tool.parser.general.match_intel_type")
     @patch(
         "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
         {"dscan": {"parser": MagicMock(return_value=MagicMock(hash="hash1"))}},
     )
-    def test_parses_valid_dscan_data(self, mock_check_intel_type):
+    def test_parses_valid_dscan_data(self, mock_match_intel_type):
         """
         Test should return the hash of the parsed intel data for valid dscan data
 
-        :param mock_check_intel_type:
-        :type mock_check_intel_type:
+        :param mock_match_intel_type:
+        :type mock_match_intel_type:
         :return:
         :rtype:
         """
 
-        mock_check_intel_type.return_value = "dscan"
+        mock_match_intel_type.return_value = ("dscan", [])
         form_data = load_dscan_txt()
         result = parse_intel(form_data)
 
         self.assertEqual(result, "hash1")
 
-    @patch("aa_intel_tool.parser.general.check_intel_type")
+    @patch("aa_intel_tool.parser.general.match_intel_type")
     @patch(
         "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
         {"fleetcomp": {"parser": MagicMock(return_value=MagicMock(hash="hash2"))}},
     )
-    def test_parses_valid_fleetcomp_data(self, mock_check_intel_type):
+    def test_parses_valid_fleetcomp_data(self, mock_match_intel_type):
         """
         Test should return the hash of the parsed intel data for valid fleetcomp data
 
-        :param mock_check_intel_type:
-        :type mock_check_intel_type:
+        :param mock_match_intel_type:
+        :type mock_match_intel_type:
         :return:
         :rtype:
         """
 
-        mock_check_intel_type.return_value = "fleetcomp"
+        mock_match_intel_type.return_value = ("fleetcomp", [])
         form_data = load_fleetcomp_txt()
         result = parse_intel(form_data)
 
         self.assertEqual(result, "hash2")
 
-    @patch("aa_intel_tool.parser.general.check_intel_type")
+    @patch("aa_intel_tool.parser.general.match_intel_type")
     @patch(
         "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
         {"chatscan": {"parser": MagicMock(return_value=MagicMock(hash="hash3"))}},
     )
-    def test_parses_valid_chatscan_data(self, mock_check_intel_type):
+    def test_parses_valid_chatscan_data(self, mock_match_intel_type):
         """
         Test should return the hash of the parsed intel data for valid chatscan data
 
-        :param mock_check_intel_type:
-        :type mock_check_intel_type:
+        :param mock_match_intel_type:
+        :type mock_match_intel_type:
         :return:
         :rtype:
         """
 
-        mock_check_intel_type.return_value = "chatscan"
+        mock_match_intel_type.return_value = ("chatscan", [])
         form_data = load_chatscan_txt()
         result = parse_intel(form_data)
 
         self.assertEqual(result, "hash3")
 
-    @patch("aa_intel_tool.parser.general.check_intel_type")
-    def test_raises_error_for_invalid_data(self, mock_check_intel_type):
+    @patch("aa_intel_tool.parser.general.match_intel_type")
+    def test_raises_error_for_invalid_data(self, mock_match_intel_type):
         """
         Test should throw a ParserError as parsed intel data for invalid data
 
-        :param mock_check_intel_type:
-        :type mock_check_intel_type:
+        :param mock_match_intel_type:
+        :type mock_match_intel_type:
         :return:
         :rtype:
         """
 
-        mock_check_intel_type.side_effect = ParserError("Invalid data")
+        mock_match_intel_type.side_effect = ParserError("Invalid data")
         form_data = load_chatscan_faulty_txt()
 
         with self.assertRaises(ParserError):
             parse_intel(form_data)
 
+    def test_saves_the_raw_data_with_the_scan(self):
+        """
+        Test should save the raw data with the scan itself, not in a second query
+
+        :return:
+        :rtype:
+        """
+
+        parser = MagicMock(
+            side_effect=lambda scan_data: safe_scan_to_db(
+                scan_type=Scan.Type.DSCAN, parsed_data={}
+            )
+        )
+
+        with (
+            patch(
+                "aa_intel_tool.parser.general.match_intel_type",
+                return_value=("dscan", []),
+            ),
+            patch(
+                "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+                {"dscan": {"parser": parser}},
+            ),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            scan_hash = parse_intel("Line 1")
+
+        self.assertEqual(Scan.objects.get(pk=scan_hash).raw_data, "Line 1")
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries))
+
+    def _parse_with_stats(self, form_data: str) -> Scan:
+        """
+        Parse the intel with a parser that saves a scan
+
+        :param form_data:
+        :type form_data:
+        :return:
+        :rtype:
+        """
+
+        parser = MagicMock(
+            side_effect=lambda scan_data: safe_scan_to_db(
+                scan_type=Scan.Type.DSCAN, parsed_data={}
+            )
+        )
+
+        with (
+            patch(
+                "aa_intel_tool.parser.general.match_intel_type",
+                return_value=("dscan", ["Line 1"]),
+            ),
+            patch(
+                "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+                {"dscan": {"parser": parser}},
+            ),
+        ):
+            return Scan.objects.get(pk=parse_intel(form_data))
+
+    @patch("aa_intel_tool.parser.general.AppSettings.INTELTOOL_STORE_PARSE_STATS", True)
+    def test_stores_parse_stats_when_enabled(self):
+        """
+        Test should store the time and queries of each stage with the scan
+
+        :return:
+        :rtype:
+        """
+
+        parse_stats = self._parse_with_stats("Line 1\nLine 2").parse_stats
+
+        self.assertEqual(parse_stats["counts"], {"lines": 2})
+        self.assertLessEqual(
+            {"detect", "parse", "db_write"}, set(parse_stats["stages"])
+        )
+        self.assertGreaterEqual(parse_stats["stages"]["db_write"]["queries"], 2)
+
+    def test_does_not_store_parse_stats_by_default(self):
+        """
+        Test should not store the parse statistics, unless enabled
+
+        :return:
+        :rtype:
+        """
+
+        self.assertIsNone(self._parse_with_stats("Line 1").parse_stats)
+
     def test_raises_error_for_empty_data(self):
         """
         Test should throw a ParserError as parsed intel data for empty form data
@@ -233,3 +426,301 @@ class TestParseIntel(BaseTestCase):
 
         with self.assertRaises(ParserError):
             parse_intel(form_data)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch("aa_intel_tool.parser.general.AppSettings.INTELTOOL_DEDUPLICATION_WINDOW", 60)
+class TestParseIntelDeduplication(BaseTestCase):
+    """
+    Test the deduplication of identical intel in the parse_intel function
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache and a parser that creates a real scan
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+        self.parser = MagicMock(
+            side_effect=lambda scan_data: Scan.objects.create(scan_type=Scan.Type.DSCAN)
+        )
+        self.supported_intel_types = {"dscan": {"parser": self.parser}}
+
+    def _parse_intel(self, form_data: str) -> str:
+        """
+        Parse the intel with the mocked parser
+
+        :param form_data:
+        :type form_data:
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_intel_tool.parser.general.match_intel_type",
+                return_value=("dscan", []),
+            ),
+            patch(
+                "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+                self.supported_intel_types,
+            ),
+        ):
+            return parse_intel(form_data)
+
+    def test_returns_existing_scan_for_the_same_data(self):
+        """
+        Test should return the existing scan without parsing the same data again
+
+        :return:
+        :rtype:
+        """
+
+        form_data = load_dscan_txt()
+
+        first_hash = self._parse_intel(form_data)
+        second_hash = self._parse_intel(form_data)
+
+        self.assertEqual(first_hash, second_hash)
+        self.parser.assert_called_once()
+        self.assertEqual(Scan.objects.count(), 1)
+
+    def test_ignores_surrounding_whitespace_and_empty_lines(self):
+        """
+        Test should treat data that only differs in whitespace as the same data
+
+        :return:
+        :rtype:
+        """
+
+        first_hash = self._parse_intel("Line 1\nLine 2")
+        second_hash = self._parse_intel("  Line 1 \r\n\r\nLine 2\t\n")
+
+        self.assertEqual(first_hash, second_hash)
+        self.parser.assert_called_once()
+
+    def test_parses_different_data(self):
+        """
+        Test should parse data that differs from the recently parsed data
+
+        :return:
+        :rtype:
+        """
+
+        first_hash = self._parse_intel("Line 1")
+        second_hash = self._parse_intel("Line 2")
+
+        self.assertNotEqual(first_hash, second_hash)
+        self.assertEqual(self.parser.call_count, 2)
+
+    def test_parses_again_when_the_scan_was_removed(self):
+        """
+        Test should parse the data again when the recent scan no longer exists
+
+        :return:
+        :rtype:
+        """
+
+        first_hash = self._parse_intel("Line 1")
+        Scan.objects.filter(pk=first_hash).delete()
+        second_hash = self._parse_intel("Line 1")
+
+        self.assertNotEqual(first_hash, second_hash)
+        self.assertEqual(self.parser.call_count, 2)
+        self.assertEqual(cache.get(_get_scan_digest_cache_key(["Line 1"])), second_hash)
+
+    def test_parses_the_same_data_again_when_disabled(self):
+        """
+        Test should parse the same data again when deduplication is disabled
+
+        :return:
+        :rtype:
+        """
+
+        form_data = load_dscan_txt()
+
+        with patch(
+            "aa_intel_tool.parser.general.AppSettings.INTELTOOL_DEDUPLICATION_WINDOW", 0
+        ):
+            first_hash = self._parse_intel(form_data)
+            second_hash = self._parse_intel(form_data)
+
+        self.assertNotEqual(first_hash, second_hash)
+        self.assertEqual(self.parser.call_count, 2)
+
+    def test_digest_depends_on_the_app_version(self):
+        """
+        Test should use a different digest for a different app version
+
+        :return:
+        :rtype:
+        """
+
+        cache_key = _get_scan_digest_cache_key(["Line 1"])
+
+        with patch("aa_intel_tool.parser.general.__version__", "0.0.0"):
+            self.assertNotEqual(_get_scan_digest_cache_key(["Line 1"]), cache_key)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestQueueIntel(BaseTestCase):
+    """
+    Test the queue_intel function
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+    def test_creates_pending_scan(self):
+        """
+        Test should create a pending scan with the raw data, without parsing it
+
+        :return:
+        :rtype:
+        """
+
+        with patch("aa_intel_tool.parser.general.match_intel_type") as mock_match:
+            scan_hash, created = queue_intel("Line 1")
+
+        intel_scan = Scan.objects.get(pk=scan_hash)
+
+        self.assertTrue(created)
+        self.assertEqual(intel_scan.scan_type, Scan.Type.PENDING)
+        self.assertEqual(intel_scan.raw_data, "Line 1")
+        mock_match.assert_not_called()
+
+    @patch(
+        "aa_intel_tool.parser.general.AppSettings.INTELTOOL_DEDUPLICATION_WINDOW", 60
+    )
+    def test_returns_existing_scan_for_the_same_data(self):
+        """
+        Test should return the existing scan for the same data
+
+        :return:
+        :rtype:
+        """
+
+        first_hash, _ = queue_intel("Line 1")
+        second_hash, created = queue_intel("Line 1")
+
+        self.assertEqual(first_hash, second_hash)
+        self.assertFalse(created)
+        self.assertEqual(Scan.objects.count(), 1)
+
+    def test_raises_error_for_empty_data(self):
+        """
+        Test should throw a ParserError for empty form data
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(ParserError):
+            queue_intel("")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestParsePendingScan(BaseTestCase):
+    """
+    Test the parse_pending_scan function
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache and a pending scan
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+        self.scan_hash, _ = queue_intel("Line 1")
+
+    def test_saves_the_sections_to_the_pending_scan(self):
+        """
+        Test should save the parsed sections to the pending scan
+
+        :return:
+        :rtype:
+        """
+
+        parser = MagicMock(
+            side_effect=lambda scan_data: safe_scan_to_db(
+                scan_type=Scan.Type.DSCAN,
+                parsed_data={
+                    "ships": {"section": ScanData.Section.SHIPLIST, "data": []}
+                },
+            )
+        )
+
+        with (
+            patch(
+                "aa_intel_tool.parser.general.match_intel_type",
+                return_value=("dscan", ["Line 1"]),
+            ) as mock_match,
+            patch(
+                "aa_intel_tool.parser.general.SUPPORTED_INTEL_TYPES",
+                {"dscan": {"parser": parser}},
+            ),
+        ):
+            parse_pending_scan(scan_hash=self.scan_hash)
+
+        intel_scan = Scan.objects.get()
+
+        self.assertEqual(intel_scan.hash, self.scan_hash)
+        self.assertEqual(intel_scan.scan_type, Scan.Type.DSCAN)
+        self.assertEqual(intel_scan.scan_data.get().section, "shiplist")
+        mock_match.assert_called_once_with(scan_data=["Line 1"])
+        parser.assert_called_once_with(scan_data=["Line 1"])
+
+    def test_marks_scan_as_invalid_on_error(self):
+        """
+        Test should mark the scan as invalid and keep the error, if parsing fails
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.parser.general.match_intel_type",
+            side_effect=ParserError("Broken intel"),
+        ):
+            parse_pending_scan(scan_hash=self.scan_hash)
+
+        self.assertEqual(
+            Scan.objects.get(pk=self.scan_hash).scan_type, Scan.Type.INVALID
+        )
+        self.assertIn("Broken intel", get_scan_error(scan_hash=self.scan_hash))
+
+    def test_skips_scans_that_are_not_pending(self):
+        """
+        Test should not parse a scan that is not pending (anymore)
+
+        :return:
+        :rtype:
+        """
+
+        Scan.objects.filter(pk=self.scan_hash).update(scan_type=Scan.Type.DSCAN)
+
+        with patch("aa_intel_tool.parser.general.match_intel_type") as mock_match:
+            parse_pending_scan(scan_hash=self.scan_hash)
+
+        mock_match.assert_not_called()
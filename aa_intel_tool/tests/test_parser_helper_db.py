@@ -2,9 +2,16 @@
 Tests for the parsers' DB helper => aa_intel_tool/parser/helper/db.py
 """
 
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
 # AA Intel Tool
 from aa_intel_tool.models import Scan, ScanData
-from aa_intel_tool.parser.helper.db import safe_scan_to_db
+from aa_intel_tool.parser.helper.db import safe_scan_to_db, target_scan
 from aa_intel_tool.tests import BaseTestCase
 
 
@@ -56,3 +63,121 @@ class TestParserHelperDb(BaseTestCase):
         self.assertEqual(
             first=scan_data_from_db.processed_data, second=parsed_data["foobar"]["data"]
         )
+
+    def test_safe_scan_to_db_with_pending_scan(self):
+        """
+        Test that the data is saved to the pending scan, instead of a new scan
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.PENDING)
+        parsed_data = {
+            "foobar": {
+                "section": ScanData.Section.PILOTLIST,
+                "data": {"name": "William Riker"},
+            }
+        }
+
+        token = target_scan.set(intel_scan)
+
+        try:
+            new_scan = safe_scan_to_db(
+                scan_type=Scan.Type.CHATLIST, parsed_data=parsed_data
+            )
+        finally:
+            target_scan.reset(token)
+
+        self.assertEqual(new_scan.hash, intel_scan.hash)
+        self.assertEqual(Scan.objects.count(), 1)
+        self.assertEqual(
+            Scan.objects.get(pk=intel_scan.hash).scan_type, Scan.Type.CHATLIST
+        )
+        self.assertEqual(
+            ScanData.objects.get(scan=intel_scan).processed_data,
+            {"name": "William Riker"},
+        )
+
+    def test_safe_scan_to_db_with_new_target_scan(self):
+        """
+        Test that a new target scan is saved with its raw data in a single INSERT
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan()
+        intel_scan.raw_data = "raw data"
+        parsed_data = {
+            "foobar": {
+                "section": ScanData.Section.PILOTLIST,
+                "data": {"name": "William Riker"},
+            }
+        }
+
+        token = target_scan.set(intel_scan)
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                new_scan = safe_scan_to_db(
+                    scan_type=Scan.Type.CHATLIST, parsed_data=parsed_data
+                )
+        finally:
+            target_scan.reset(token)
+
+        inserts = [
+            query["sql"] for query in queries if query["sql"].startswith("INSERT")
+        ]
+
+        self.assertIs(new_scan, intel_scan)
+        self.assertEqual(len(inserts), 2)
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries))
+        self.assertEqual(Scan.objects.get(pk=new_scan.hash).raw_data, "raw data")
+
+    def test_safe_scan_to_db_has_a_fixed_query_count(self):
+        """
+        Test that the number of queries doesn't depend on the number of sections
+
+        :return:
+        :rtype:
+        """
+
+        parsed_data = {
+            section: {"section": section, "data": []}
+            for section in (
+                ScanData.Section.PILOTLIST,
+                ScanData.Section.CORPORATIONLIST,
+                ScanData.Section.ALLIANCELIST,
+            )
+        }
+
+        with CaptureQueriesContext(connection) as one_section:
+            safe_scan_to_db(
+                scan_type=Scan.Type.CHATLIST,
+                parsed_data=dict(list(parsed_data.items())[:1]),
+            )
+
+        with CaptureQueriesContext(connection) as three_sections:
+            safe_scan_to_db(scan_type=Scan.Type.CHATLIST, parsed_data=parsed_data)
+
+        self.assertEqual(len(three_sections), len(one_section))
+
+    def test_safe_scan_to_db_saves_nothing_on_error(self):
+        """
+        Test that the scan is not saved, when its sections can't be saved
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "aa_intel_tool.parser.helper.db.ScanData.objects.bulk_create",
+                side_effect=DatabaseError,
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            safe_scan_to_db(scan_type=Scan.Type.DSCAN, parsed_data={})
+
+        self.assertFalse(Scan.objects.exists())
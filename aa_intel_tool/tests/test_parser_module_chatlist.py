@@ -5,19 +5,32 @@ Test cases for the chatlist parser module.
 # Standard Library
 from unittest.mock import MagicMock, patch
 
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# Alliance Auth
+from allianceauth.eveonline.models import EveCharacter
+
 # AA Intel Tool
+from aa_intel_tool.constants import RegexPattern
 from aa_intel_tool.exceptions import ParserError
-from aa_intel_tool.models import Scan
+from aa_intel_tool.helper.affiliation_cache import alliance_cache, corporation_cache
+from aa_intel_tool.models import CharacterName, Scan
 from aa_intel_tool.parser.module.chatlist import (
     _get_character_info,
+    _get_characters_by_name,
     _get_unaffiliated_alliance_info,
     _parse_alliance_info,
     _parse_character_info,
     _parse_chatscan_data,
     _parse_corporation_info,
+    has_line_structure,
     parse,
 )
 from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
+from aa_intel_tool.tests.utils import FakeESIHandler, create_fake_characters
 
 
 class TestParse(BaseTestCase):
@@ -161,6 +174,71 @@ class TestParse(BaseTestCase):
 
         self.assertIsInstance(result, Scan)
 
+    @patch(
+        "aa_intel_tool.parser.module.chatlist.AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN",
+        True,
+    )
+    @patch("aa_intel_tool.parser.module.chatlist._get_character_info")
+    @patch("aa_intel_tool.parser.module.chatlist._parse_chatscan_data")
+    def test_parses_matched_lines(
+        self, mock_parse_chatscan_data, mock_get_character_info
+    ):
+        """
+        Test should take the character names from already matched lines.
+
+        :param mock_parse_chatscan_data:
+        :type mock_parse_chatscan_data:
+        :param mock_get_character_info:
+        :type mock_get_character_info:
+        :return:
+        :rtype:
+        """
+
+        mock_parse_chatscan_data.return_value = {
+            "pilots": [],
+            "corporations": [],
+            "alliances": [],
+        }
+
+        scan_data = [
+            RegexPattern.CHATLIST.value.match(name)
+            for name in ["Character1", "Character2"]
+        ]
+        parse(scan_data, safe_to_db=False)
+
+        mock_get_character_info.assert_called_once_with(
+            scan_data=["Character1", "Character2"]
+        )
+
+
+class TestHasLineStructure(BaseTestCase):
+    """
+    Test cases for the has_line_structure function in the chatlist module.
+    """
+
+    def test_returns_true_for_character_names(self):
+        """
+        Test should accept lines that can be a character name.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(has_line_structure("Rounon Dax"))
+        self.assertTrue(has_line_structure("Abc"))
+
+    def test_returns_false_for_other_lines(self):
+        """
+        Test should reject lines with tabs or an invalid length.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(has_line_structure("670\tCapsule\tCapsule\t300 km"))
+        self.assertFalse(has_line_structure("Ab"))
+        self.assertFalse(has_line_structure("A" * 38))
+
 
 class TestParseChatScanData(BaseTestCase):
     """
@@ -615,13 +693,7 @@ class TestGetCharacterInfo(BaseTestCase):
         """
 
         scan_data = ["Character 1", "Character 2"]
-
-        eve_characters = MagicMock()
-        eve_characters.count.return_value = len(scan_data)
-        eve_characters.__len__.return_value = len(scan_data)
-        eve_characters.values_list.side_effect = lambda *args, **kwargs: (
-            list(scan_data) if kwargs.get("flat") else [(n,) for n in scan_data]
-        )
+        eve_characters = [MagicMock(character_name=name) for name in scan_data]
 
         filter_qs = MagicMock()
         filter_qs.exclude.return_value = eve_characters
@@ -651,18 +723,11 @@ class TestGetCharacterInfo(BaseTestCase):
         """
 
         scan_data = ["Character 1", "Character 2", "Character 3"]
-        existing_characters = ["Character 1", "Character 2"]
+        eve_characters = [
+            MagicMock(character_name=name) for name in ["Character 1", "Character 2"]
+        ]
         fetched_characters = [{"character_name": "Character 3"}]
-
-        eve_characters = MagicMock()
-        eve_characters.count.return_value = len(existing_characters)
-        eve_characters.values_list.side_effect = lambda *args, **kwargs: (
-            list(existing_characters)
-            if kwargs.get("flat")
-            else [(n,) for n in existing_characters]
-        )
-
-        new_eve_characters = MagicMock()
+        new_eve_characters = [MagicMock(character_name="Character 3")]
 
         filter_qs = MagicMock()
         filter_qs.exclude.return_value = eve_characters
@@ -689,7 +754,7 @@ class TestGetCharacterInfo(BaseTestCase):
             mock_create.assert_called_once_with(
                 character_data_from_esi=fetched_characters
             )
-            self.assertEqual(result, eve_characters | new_eve_characters)
+            self.assertEqual(result, eve_characters + new_eve_characters)
 
     def test_does_not_create_characters_when_esi_returns_nothing(self):
         """
@@ -700,15 +765,7 @@ class TestGetCharacterInfo(BaseTestCase):
         """
 
         scan_data = ["Character 1", "Character 2"]
-        existing_characters = ["Character 1"]
-
-        eve_characters = MagicMock()
-        eve_characters.count.return_value = len(existing_characters)
-        eve_characters.values_list.side_effect = lambda *args, **kwargs: (
-            list(existing_characters)
-            if kwargs.get("flat")
-            else [(n,) for n in existing_characters]
-        )
+        eve_characters = [MagicMock(character_name="Character 1")]
 
         filter_qs = MagicMock()
         filter_qs.exclude.return_value = eve_characters
@@ -731,3 +788,182 @@ class TestGetCharacterInfo(BaseTestCase):
             mock_fetch.assert_called_once_with(characters_to_fetch={"Character 2"})
             mock_create.assert_not_called()
             self.assertEqual(result, eve_characters)
+
+    def test_returns_each_character_once_for_duplicate_names(self):
+        """
+        Test should return every character only once, when a name is in the scan data more than once
+
+        :return:
+        :rtype:
+        """
+
+        character = EveCharacter.objects.create(
+            character_id=90000001,
+            character_name="Character 1",
+            corporation_id=98000001,
+            corporation_name="Corporation 1",
+            corporation_ticker="CORP1",
+        )
+
+        with patch(
+            "aa_intel_tool.parser.module.chatlist.fetch_character_ids_from_esi"
+        ) as mock_fetch:
+            with self.assertNumQueries(1):
+                result = _get_character_info(["Character 1", "Character 1"])
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(result, [character])
+
+    def test_finds_known_characters_regardless_of_case_and_whitespace(self):
+        """
+        Test should find known characters locally, when their names are pasted in another case or with extra whitespace
+
+        :return:
+        :rtype:
+        """
+
+        character = EveCharacter.objects.create(
+            character_id=90000001,
+            character_name="Character One",
+            corporation_id=98000001,
+            corporation_name="Corporation 1",
+            corporation_ticker="CORP1",
+        )
+        CharacterName.objects.create(
+            normalized_name="character one", name="Character One", character_id=90000001
+        )
+
+        with patch(
+            "aa_intel_tool.parser.module.chatlist.fetch_character_ids_from_esi",
+            return_value=[],
+        ) as mock_fetch:
+            # The exact names, their character IDs and the characters, all indexed
+            with self.assertNumQueries(3):
+                result = _get_character_info(
+                    ["character one", "  CHARACTER   One ", "Character Two "]
+                )
+
+        mock_fetch.assert_called_once_with(characters_to_fetch={"Character Two"})
+        self.assertEqual(result, [character])
+
+    def test_finds_renamed_characters_by_their_old_name(self):
+        """
+        Test should find renamed characters by the name ESI resolved before, keyed by that name
+
+        :return:
+        :rtype:
+        """
+
+        character = EveCharacter.objects.create(
+            character_id=90000001,
+            character_name="New Name",
+            corporation_id=98000001,
+            corporation_name="Corporation 1",
+            corporation_ticker="CORP1",
+        )
+        CharacterName.objects.create(
+            normalized_name="old name", name="Old Name", character_id=90000001
+        )
+
+        with patch(
+            "aa_intel_tool.parser.module.chatlist.fetch_character_ids_from_esi"
+        ) as mock_fetch:
+            result = _get_characters_by_name(["Old Name", "New Name"])
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(result, {"old name": character, "new name": character})
+        self.assertEqual(_get_character_info(["Old Name", "New Name"]), [character])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch(
+    "aa_intel_tool.parser.module.chatlist.AppSettings.INTELTOOL_CHATSCAN_MAX_PILOTS", 0
+)
+@patch(
+    "aa_intel_tool.parser.module.chatlist.AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN",
+    True,
+)
+class TestQueryBudget(BaseTestCase):
+    """
+    Test that the number of queries and ESI calls of the chat list parser doesn't
+    grow with the number of pilots
+
+    ESI resolves up to 500 names per request, so all sizes stay within one request.
+    """
+
+    SIZES = (10, 100, 500)
+
+    def setUp(self):
+        """
+        Set up the characters ESI knows
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        self.characters = create_fake_characters(number_of_characters=max(self.SIZES))
+        self.fake_esi = FakeESIHandler(characters=self.characters)
+
+    def _run(self, size: int) -> Scan:
+        """
+        Parse a chat list with the given number of pilots
+
+        :param size:
+        :type size:
+        :return:
+        :rtype:
+        """
+
+        return parse(
+            scan_data=[character.character_name for character in self.characters[:size]]
+        )
+
+    def _forget_characters(self, size: int):  # pylint: disable=unused-argument
+        """
+        Remove the characters and their resolved names and clear the caches, so all pilots are new
+
+        :param size:
+        :type size:
+        :return:
+        :rtype:
+        """
+
+        EveCharacter.objects.filter(character_id__gte=90000000).delete()
+        CharacterName.objects.all().delete()
+        cache.clear()
+        corporation_cache.clear()
+        alliance_cache.clear()
+
+    def test_new_pilots(self):
+        """
+        Test the budget when all pilots need to be fetched from ESI
+
+        :return:
+        :rtype:
+        """
+
+        with self.fake_esi.patch():
+            self.assertQueryBudget(
+                run=self._run,
+                sizes=self.SIZES,
+                # Incl. the savepoints of the transactions
+                max_queries=18,
+                # Names, affiliations, factions, 2 corporations and 1 alliance
+                max_esi_calls=6,
+                fake_esi=self.fake_esi,
+                prepare=self._forget_characters,
+            )
+
+    def test_known_pilots(self):
+        """
+        Test the budget when all pilots are already in the database
+
+        :return:
+        :rtype:
+        """
+
+        EveCharacter.objects.bulk_create(self.characters)
+
+        self.assertQueryBudget(run=self._run, sizes=self.SIZES, max_queries=7)
@@ -3,26 +3,43 @@ Unit tests for the D-Scan parser module.
 """
 
 # Standard Library
-import importlib
 from unittest import mock
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+# Third Party
+from eve_sde.models import ItemCategory, ItemGroup, ItemType
 
 # AA Intel Tool
+from aa_intel_tool.constants import RegexPattern
 from aa_intel_tool.exceptions import ParserError
+from aa_intel_tool.helper.eve_type import clear_type_index
 from aa_intel_tool.models import Scan, ScanData
 from aa_intel_tool.parser.module.dscan import (
     _get_ansiblex_jumpgate_destination,
     _get_deployables_on_grid,
+    _get_eve_types_by_category,
     _get_scan_details,
     _get_ships,
     _get_starbases_on_grid,
     _get_type_info_dict,
     _get_upwell_structures_on_grid,
-    _is_on_grid,
+    _tokenize,
+    has_line_structure,
     parse,
 )
 from aa_intel_tool.tests import BaseTestCase
 
+# D-Scan lines of all categories, on and off grid, for the query budget
+DSCAN_LINES = (
+    "587\tRifter\tRifter\t1,234 km",
+    "587\tRifter\tRifter\t5.2 AU",
+    "670\tSomeone's Capsule\tCapsule\t-",
+    "35832\tMy Astrahus\tAstrahus\t2,500 km",
+    "35841\t1DQ1-A » 8QT-H4 - Bridge\tAnsiblex Jump Bridge\t3,000 km",
+    "33474\tMobile Depot\tMobile Depot\t500 m",
+    "16213\tTower\tCaldari Control Tower\t7,000 km",
+)
+
 
 class TestParseDScan(BaseTestCase):
     """
@@ -31,7 +48,7 @@ class TestParseDScan(BaseTestCase):
 
     def test_raises_error_when_module_is_disabled(self):
         with patch(
-            "aa_intel_tool.app_settings.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
+            "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
             False,
         ):
             with self.assertRaises(ParserError) as context:
@@ -52,7 +69,7 @@ class TestParseDScan(BaseTestCase):
 
         with (
             patch(
-                "aa_intel_tool.app_settings.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
+                "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
                 True,
             ),
             patch(
@@ -60,8 +77,8 @@ class TestParseDScan(BaseTestCase):
                 return_value=(None, {}, {"all": []}),
             ),
             patch(
-                "aa_intel_tool.parser.module.dscan.ItemType.objects.filter",
-                return_value=MagicMock(values_list=MagicMock(return_value=[])),
+                "aa_intel_tool.parser.module.dscan.get_eve_types",
+                return_value=[],
             ),
             patch(
                 "aa_intel_tool.parser.module.dscan._get_ships",
@@ -115,7 +132,7 @@ class TestParseDScan(BaseTestCase):
 
         with (
             patch(
-                "aa_intel_tool.app_settings.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
+                "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_ENABLE_MODULE_DSCAN",
                 True,
             ),
             patch(
@@ -123,8 +140,8 @@ class TestParseDScan(BaseTestCase):
                 return_value=("Destination", {"all": {1: 2}}, {"all": [1]}),
             ),
             patch(
-                "aa_intel_tool.parser.module.dscan.ItemType.objects.filter"
-            ) as mock_bulk_get,
+                "aa_intel_tool.parser.module.dscan.get_eve_types"
+            ) as mock_get_eve_types,
             patch(
                 "aa_intel_tool.parser.module.dscan._get_ships",
                 return_value={
@@ -150,9 +167,7 @@ class TestParseDScan(BaseTestCase):
                 "aa_intel_tool.parser.module.dscan.safe_scan_to_db"
             ) as mock_safe_scan_to_db,
         ):
-            mock_bulk_get.return_value.values_list.return_value = [
-                (1, "Ship", 2, "Group", 1000)
-            ]
+            mock_get_eve_types.return_value = [(1, "Ship", 2, "Group", 1000, 6)]
 
             result = parse(scan_data=["some data"])
 
@@ -164,6 +179,89 @@ class TestParseDScan(BaseTestCase):
             )
             self.assertEqual(result, mock_safe_scan_to_db.return_value)
 
+    def test_resolves_eve_types_without_queries_when_type_index_is_warm(self):
+        """
+        Testing that all eve_types are resolved from the SDE type index,
+        without any DB queries once the index is loaded
+
+        :return:
+        :rtype:
+        """
+
+        ItemType.objects.create(
+            id=587,
+            name="Rifter",
+            group=ItemGroup.objects.create(
+                id=25,
+                name="Frigate",
+                category=ItemCategory.objects.create(id=6, name="Ship"),
+            ),
+            mass=1067000,
+        )
+        ItemType.objects.create(
+            id=35832,
+            name="Astrahus",
+            group=ItemGroup.objects.create(
+                id=1657,
+                name="Citadel",
+                category=ItemCategory.objects.create(id=65, name="Structure"),
+            ),
+            mass=0,
+        )
+
+        scan_data = [
+            "587\tRifter\tRifter\t1,234 km",
+            "587\tRifter\tRifter\t5.2 AU",
+            "35832\tMy Astrahus\tAstrahus\t2,500 km",
+        ]
+
+        clear_type_index()
+
+        with patch(
+            "aa_intel_tool.parser.module.dscan.safe_scan_to_db"
+        ) as mock_safe_scan_to_db:
+            # Cold index: SDE build number + a single query for all types
+            with self.assertNumQueries(2):
+                parse(scan_data=scan_data)
+
+            with self.assertNumQueries(0):
+                parse(scan_data=scan_data)
+
+            parsed_data = mock_safe_scan_to_db.call_args.kwargs["parsed_data"]
+
+            self.assertEqual(parsed_data["all"]["data"][0]["count"], 2)
+            self.assertEqual(parsed_data["ongrid"]["data"][0]["count"], 1)
+            self.assertEqual(parsed_data["offgrid"]["data"][0]["count"], 1)
+            self.assertEqual(
+                parsed_data["structures_on_grid"]["data"][0]["name"], "Astrahus"
+            )
+
+
+class TestHelperGetEveTypesByCategory(BaseTestCase):
+    """
+    Testing the _get_eve_types_by_category helper function
+    """
+
+    def test_partitions_eve_types_by_category(self):
+        """
+        Testing that eve_types are partitioned by their category ID
+
+        :return:
+        :rtype:
+        """
+
+        eve_types = [
+            (1, "Ship Alpha", 100, "Frigate", 500, 6),
+            (2, "Structure Alpha", 300, "Citadel", 0, 65),
+            (3, "Ship Beta", 101, "Destroyer", 1000, 6),
+        ]
+
+        result = _get_eve_types_by_category(eve_types=eve_types)
+
+        self.assertEqual(result[6], [eve_types[0], eve_types[2]])
+        self.assertEqual(result[65], [eve_types[1]])
+        self.assertEqual(result[22], [])
+
 
 class TestHelperGetScanDetails(BaseTestCase):
     """
@@ -184,8 +282,8 @@ class TestHelperGetScanDetails(BaseTestCase):
         ]
 
         with patch(
-            "aa_intel_tool.parser.module.dscan._is_on_grid",
-            side_effect=[True, False],
+            "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_DSCAN_GRID_SIZE",
+            50,
         ):
             ansiblex_destination, counter, eve_ids = _get_scan_details(
                 scan_data=scan_data
@@ -229,7 +327,7 @@ class TestHelperGetScanDetails(BaseTestCase):
 
         scan_data = ["Invalid Data"]
 
-        with self.assertRaises(AttributeError):
+        with self.assertRaises(ParserError):
             _get_scan_details(scan_data=scan_data)
 
     def test_detects_ansiblex_jump_gate_destination(self):
@@ -298,9 +396,6 @@ class TestHelperGetStarbasesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {1: 2, 2: 1}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -312,7 +407,7 @@ class TestHelperGetStarbasesOnGrid(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_starbases_on_grid(eve_types=eve_types_qs, counter=counter)
+            result = _get_starbases_on_grid(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result), 2)
             self.assertEqual(result[0]["name"], "Starbase Alpha")
@@ -334,10 +429,7 @@ class TestHelperGetStarbasesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
-        result = _get_starbases_on_grid(eve_types=eve_types_qs, counter=counter)
+        result = _get_starbases_on_grid(eve_types=eve_types, counter=counter)
 
         self.assertEqual(result, [])
 
@@ -355,9 +447,6 @@ class TestHelperGetStarbasesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {1: 2}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -369,7 +458,7 @@ class TestHelperGetStarbasesOnGrid(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_starbases_on_grid(eve_types=eve_types_qs, counter=counter)
+            result = _get_starbases_on_grid(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result), 1)
             self.assertEqual(result[0]["name"], "Starbase Alpha")
@@ -395,9 +484,6 @@ class TestHelperGetDeployablesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {1: 3, 2: 1}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -409,7 +495,7 @@ class TestHelperGetDeployablesOnGrid(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_deployables_on_grid(eve_types=eve_types_qs, counter=counter)
+            result = _get_deployables_on_grid(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result), 2)
             self.assertEqual(result[0]["name"], "Deployable Alpha")
@@ -431,10 +517,7 @@ class TestHelperGetDeployablesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
-        result = _get_deployables_on_grid(eve_types=eve_types_qs, counter=counter)
+        result = _get_deployables_on_grid(eve_types=eve_types, counter=counter)
 
         self.assertEqual(result, [])
 
@@ -452,9 +535,6 @@ class TestHelperGetDeployablesOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {1: 2}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -466,7 +546,7 @@ class TestHelperGetDeployablesOnGrid(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_deployables_on_grid(eve_types=eve_types_qs, counter=counter)
+            result = _get_deployables_on_grid(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result), 1)
             self.assertEqual(result[0]["name"], "Deployable Alpha")
@@ -493,9 +573,6 @@ class TestHelperGetUpwellStructuresOnGrid(BaseTestCase):
         counter = {"ongrid": {1: 2, 2: 1}}
         ansiblex_destination = "System XYZ"
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -508,7 +585,7 @@ class TestHelperGetUpwellStructuresOnGrid(BaseTestCase):
             }
 
             result = _get_upwell_structures_on_grid(
-                eve_types=eve_types_qs,
+                eve_types=eve_types,
                 counter=counter,
                 ansiblex_destination=ansiblex_destination,
             )
@@ -531,10 +608,7 @@ class TestHelperGetUpwellStructuresOnGrid(BaseTestCase):
         ]
         counter = {"ongrid": {}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
-        result = _get_upwell_structures_on_grid(eve_types=eve_types_qs, counter=counter)
+        result = _get_upwell_structures_on_grid(eve_types=eve_types, counter=counter)
 
         self.assertEqual(result, [])
 
@@ -552,9 +626,6 @@ class TestHelperGetUpwellStructuresOnGrid(BaseTestCase):
         counter = {"ongrid": {35841: 1}}
         ansiblex_destination = "System ABC"
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -567,7 +638,7 @@ class TestHelperGetUpwellStructuresOnGrid(BaseTestCase):
             }
 
             result = _get_upwell_structures_on_grid(
-                eve_types=eve_types_qs,
+                eve_types=eve_types,
                 counter=counter,
                 ansiblex_destination=ansiblex_destination,
             )
@@ -595,9 +666,6 @@ class TestHelperGetShips(BaseTestCase):
         ]
         counter = {"all": {1: 3, 2: 2}, "ongrid": {1: 2}, "offgrid": {2: 1}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -609,7 +677,7 @@ class TestHelperGetShips(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_ships(eve_types=eve_types_qs, counter=counter)
+            result = _get_ships(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result["all"]), 2)
             self.assertEqual(result["all"][0]["name"], "Ship Alpha")
@@ -630,10 +698,7 @@ class TestHelperGetShips(BaseTestCase):
         eve_types = []
         counter = {"all": {}, "ongrid": {}, "offgrid": {}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
-        result = _get_ships(eve_types=eve_types_qs, counter=counter)
+        result = _get_ships(eve_types=eve_types, counter=counter)
 
         self.assertEqual(result["all"], [])
         self.assertEqual(result["ongrid"], [])
@@ -658,9 +723,6 @@ class TestHelperGetShips(BaseTestCase):
             "offgrid": {2: 1},
         }
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -672,7 +734,7 @@ class TestHelperGetShips(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_ships(eve_types=eve_types_qs, counter=counter)
+            result = _get_ships(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result["ongrid"]), 1)
             self.assertEqual(result["ongrid"][0]["name"], "Ship Alpha")
@@ -695,9 +757,6 @@ class TestHelperGetShips(BaseTestCase):
         ]
         counter = {"all": {1: 3, 2: 2}, "ongrid": {}, "offgrid": {}}
 
-        eve_types_qs = MagicMock()
-        eve_types_qs.filter.return_value = eve_types
-
         with patch(
             "aa_intel_tool.parser.module.dscan._get_type_info_dict"
         ) as mock_type_info:
@@ -709,7 +768,7 @@ class TestHelperGetShips(BaseTestCase):
                 "image": f"url/{eve_type[0]}",
             }
 
-            result = _get_ships(eve_types=eve_types_qs, counter=counter)
+            result = _get_ships(eve_types=eve_types, counter=counter)
 
             self.assertEqual(len(result["types"]), 1)
             self.assertEqual(result["types"][0]["name"], "Frigate")
@@ -778,75 +837,247 @@ class TestHelperGetTypeInfoDict(BaseTestCase):
             _get_type_info_dict(eve_type)
 
 
-class TestHelperIsOnGrid(BaseTestCase):
+class TestHelperTokenize(BaseTestCase):
     """
-    Testing the _is_on_grid helper function
+    Testing the _tokenize helper function
     """
 
-    def test_returns_true_for_distance_within_grid_size(self):
+    def test_tokenizes_scan_data(self):
         """
-        Testing that true is returned for distance within grid size
+        Testing that the D-Scan lines are split into their parts
 
         :return:
         :rtype:
         """
 
-        dscan_module = importlib.import_module("aa_intel_tool.parser.module.dscan")
-
-        importlib.reload(dscan_module)
+        scan_data = [
+            "670\tCapsule\tCapsule\t300 km",
+            "11567\tMy Avatar\tAvatar\t4.2 AU",
+            "35841\tC-N4OD » Jita - Jump Gate\tAnsiblex Jump Bridge\t-",
+        ]
 
-        with mock.patch.object(
-            dscan_module.AppSettings, "INTELTOOL_DSCAN_GRID_SIZE", 500
+        with mock.patch(
+            "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_DSCAN_GRID_SIZE",
+            500,
         ):
-            self.assertTrue(_is_on_grid("300 km"))
+            result = _tokenize(scan_data=scan_data)
+
+        self.assertEqual(
+            result,
+            [
+                (670, "Capsule", "Capsule", 300, "km", True),
+                (11567, "My Avatar", "Avatar", 42, "AU", False),
+                (
+                    35841,
+                    "C-N4OD » Jita - Jump Gate",
+                    "Ansiblex Jump Bridge",
+                    None,
+                    None,
+                    False,
+                ),
+            ],
+        )
 
     def test_returns_false_for_distance_exceeding_grid_size(self):
         """
-        Testing that false is returned for distance exceeding grid size
+        Testing that an entry exceeding the grid size is not on grid
 
         :return:
         :rtype:
         """
 
-        dscan_module = importlib.import_module("aa_intel_tool.parser.module.dscan")
+        with mock.patch(
+            "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_DSCAN_GRID_SIZE",
+            500,
+        ):
+            result = _tokenize(scan_data=["670\tCapsule\tCapsule\t600 km"])
+
+        self.assertFalse(result[0][5])
+
+    def test_handles_localised_distances(self):
+        """
+        Testing that the thousands separators and units of the different clients are handled
+
+        :return:
+        :rtype:
+        """
 
-        importlib.reload(dscan_module)
+        scan_data = [
+            "670\tCapsule\tCapsule\t1,234 km",
+            "670\tKapsel\tKapsel\t1.234 km",
+            "670\tKapsel\tKapsel\t9,5 AE",
+            "670\tКапсула\tКапсула\t444 141 км",
+            "670\tКапсула\tКапсула\t2,3 а.е.",
+        ]
 
-        with mock.patch.object(
-            dscan_module.AppSettings, "INTELTOOL_DSCAN_GRID_SIZE", 500
+        with mock.patch(
+            "aa_intel_tool.parser.module.dscan.AppSettings.INTELTOOL_DSCAN_GRID_SIZE",
+            10000,
         ):
-            self.assertFalse(dscan_module._is_on_grid("600 km"))
+            result = _tokenize(scan_data=scan_data)
+
+        self.assertEqual(
+            [(token[3], token[4], token[5]) for token in result],
+            [
+                (1234, "km", True),
+                (1234, "km", True),
+                (95, "AE", False),
+                (444141, "км", False),
+                (23, "а.е.", False),
+            ],
+        )
+
+    def test_keeps_tabs_in_names(self):
+        """
+        Testing that a tab in the name doesn't break the tokenizer
+
+        See https://github.com/ppfeufer/aa-intel-tool/issues/82
+
+        :return:
+        :rtype:
+        """
+
+        result = _tokenize(scan_data=["670\tCap\tsule\tCapsule\t0 m"])
 
-    def test_returns_false_for_invalid_distance_format(self):
+        self.assertEqual(result, [(670, "Cap\tsule", "Capsule", 0, "m", True)])
+
+    def test_returns_false_for_distance_without_value(self):
         """
-        Testing that false is returned for invalid distance format
+        Testing that an entry with a unit, but without a distance value is not on grid
 
         :return:
         :rtype:
         """
 
-        dscan_module = importlib.import_module("aa_intel_tool.parser.module.dscan")
+        result = _tokenize(scan_data=["670\tCapsule\tCapsule\tkm"])
 
-        importlib.reload(dscan_module)
+        self.assertEqual(result, [(670, "Capsule", "Capsule", None, "km", False)])
 
-        with mock.patch.object(
-            dscan_module.AppSettings, "INTELTOOL_DSCAN_GRID_SIZE", 500
-        ):
-            self.assertFalse(_is_on_grid("invalid"))
+    def test_accepts_distance_units_without_or_with_other_spaces(self):
+        """
+        Testing that the unit is found without a space or after a non-breaking space, like the baseline pattern did
+
+        :return:
+        :rtype:
+        """
+
+        for distance in ("100km", "100\u00a0km", "100\u202fkm", "100  km"):
+            with self.subTest(distance=distance):
+                result = _tokenize(scan_data=[f"670\tCapsule\tCapsule\t{distance}"])
+
+                self.assertEqual(result[0][3:5], (100, "km"))
+
+    def test_tokenizes_matched_lines(self):
+        """
+        Testing that already matched lines are not matched again
+
+        :return:
+        :rtype:
+        """
+
+        line = RegexPattern.DSCAN.value.match("670\tCapsule\tCapsule\t0 m")
+
+        result = _tokenize(scan_data=[line])
+
+        self.assertEqual(result, [(670, "Capsule", "Capsule", 0, "m", True)])
+
+    def test_raises_error_for_invalid_line(self):
+        """
+        Testing that a ParserError is raised for a line that isn't a D-Scan line
+
+        :return:
+        :rtype:
+        """
 
-    def test_returns_false_for_empty_distance(self):
+        with self.assertRaises(ParserError):
+            _tokenize(scan_data=["670\tCapsule\tCapsule\t300 km", "Invalid Data"])
+
+
+class TestHelperHasLineStructure(BaseTestCase):
+    """
+    Testing the has_line_structure helper function
+    """
+
+    def test_returns_true_for_dscan_lines(self):
+        """
+        Testing that lines starting with an item ID and at least 3 tabs are accepted
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(has_line_structure("670\tCapsule\tCapsule\t300 km"))
+        self.assertTrue(has_line_structure("670\tCap\tsule\tCapsule\t-"))
+
+    def test_returns_false_for_other_lines(self):
         """
-        Testing that false is returned for empty distance
+        Testing that other lines are rejected
 
         :return:
         :rtype:
         """
 
-        dscan_module = importlib.import_module("aa_intel_tool.parser.module.dscan")
+        self.assertFalse(has_line_structure("Rounon Dax"))
+        self.assertFalse(has_line_structure("670\tCapsule\t300 km"))
+        self.assertFalse(
+            has_line_structure("Pilot\tSystem\tOmen\tCruiser\tSquad Member\t0 - 0 - 5")
+        )
+
+
+class TestQueryBudget(BaseTestCase):
+    """
+    Test that the number of queries of the D-Scan parser doesn't grow with the
+    number of lines
+    """
+
+    def setUp(self):
+        """
+        Set up the EVE types of all categories
+
+        :return:
+        :rtype:
+        """
 
-        importlib.reload(dscan_module)
+        super().setUp()
 
-        with mock.patch.object(
-            dscan_module.AppSettings, "INTELTOOL_DSCAN_GRID_SIZE", 500
+        for category_id, group_id, type_id, name in (
+            (6, 25, 587, "Rifter"),
+            (6, 29, 670, "Capsule"),
+            (65, 1657, 35832, "Astrahus"),
+            (65, 1408, 35841, "Ansiblex Jump Bridge"),
+            (22, 1246, 33474, "Mobile Depot"),
+            (23, 365, 16213, "Caldari Control Tower"),
         ):
-            self.assertFalse(_is_on_grid(""))
+            ItemType.objects.create(
+                id=type_id,
+                name=name,
+                group=ItemGroup.objects.get_or_create(
+                    id=group_id,
+                    name=f"Group {group_id}",
+                    category=ItemCategory.objects.get_or_create(
+                        id=category_id, name=f"Category {category_id}"
+                    )[0],
+                )[0],
+                mass=1000,
+            )
+
+        self.addCleanup(clear_type_index)
+
+    def test_number_of_queries_does_not_grow_with_the_lines(self):
+        """
+        Test the budget, with a cold SDE type index for every run
+
+        :return:
+        :rtype:
+        """
+
+        self.assertQueryBudget(
+            run=lambda size: parse(
+                scan_data=[DSCAN_LINES[i % len(DSCAN_LINES)] for i in range(size)]
+            ),
+            sizes=(len(DSCAN_LINES), 100, 2000),
+            # SDE build number and types, the scan and its sections (incl. the
+            # savepoints of the transaction)
+            max_queries=8,
+            prepare=lambda size: clear_type_index(),
+        )
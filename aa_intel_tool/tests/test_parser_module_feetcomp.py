@@ -4,19 +4,35 @@ Unit tests for the fleetcomp parser module.
 
 # Standard Library
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+# Third Party
+from eve_sde.models import ItemCategory, ItemGroup, ItemType
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# Alliance Auth
+from allianceauth.eveonline.models import EveCharacter
 
 # AA Intel Tool
+from aa_intel_tool.constants import RegexPattern
 from aa_intel_tool.exceptions import ParserError
-from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.helper.affiliation_cache import alliance_cache, corporation_cache
+from aa_intel_tool.helper.eve_type import clear_type_index, get_type_index
+from aa_intel_tool.models import CharacterName, Scan, ScanData
 from aa_intel_tool.parser.module.fleetcomp import (
     get_fleet_composition,
     handle_fleet_composition_and_participation,
+    has_line_structure,
     parse,
     parse_line,
     update_ships,
 )
 from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
+from aa_intel_tool.tests.utils import FakeESIHandler, create_fake_characters
 
 
 class TestGetFleetComposition(BaseTestCase):
@@ -56,42 +72,125 @@ class TestGetFleetComposition(BaseTestCase):
                 mass=2000,
             ),
         ]
-        pilot_details = [
-            SimpleNamespace(
+        pilot_details = {
+            "pilot 1": SimpleNamespace(
                 character_name="Pilot 1",
                 character_id=101,
                 portrait_url_32="url1",
             ),
-            SimpleNamespace(
+            "pilot 2": SimpleNamespace(
                 character_name="Pilot 2",
                 character_id=102,
                 portrait_url_32="url2",
             ),
-        ]
-
-        itemtype_filter_qs = MagicMock()
-        itemtype_filter_qs.values_list.return_value = ship_class_details
+        }
 
         with (
             patch(
-                "aa_intel_tool.parser.module.fleetcomp.ItemType.objects.filter",
-                return_value=itemtype_filter_qs,
-            ) as mock_filter,
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
+                return_value=ship_class_details,
+            ) as mock_get_eve_types_by_name,
             patch(
-                "aa_intel_tool.parser.module.fleetcomp._get_character_info",
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
                 return_value=pilot_details,
-            ) as mock_get_character_info,
+            ) as mock_get_characters_by_name,
         ):
             result = get_fleet_composition(pilots=pilots, ships=ships)
 
-            mock_filter.assert_called_once_with(name__in=ships["class"])
-            mock_get_character_info.assert_called_once_with(
+            mock_get_eve_types_by_name.assert_called_once_with(names=ships["class"])
+            mock_get_characters_by_name.assert_called_once_with(
                 scan_data=["Pilot 1", "Pilot 2"]
             )
             self.assertEqual(len(result["classes"]), 2)
             self.assertEqual(len(result["types"]), 2)
             self.assertEqual(len(result["pilots"]), 2)
 
+    def test_matches_pilots_pasted_in_another_case(self):
+        """
+        Test that get_fleet_composition matches pilots, whose names were pasted in another case than they are stored in.
+
+        :return:
+        :rtype:
+        """
+
+        pilots = {"pilot one": {"name": "pilot one", "ship": "Ship Class 1"}}
+        ships = {
+            "class": {"Ship Class 1": {"count": 1}},
+            "type": {"Group 1": {"count": 1}},
+        }
+
+        with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
+                return_value=[
+                    SimpleNamespace(
+                        pk=1,
+                        name="Ship Class 1",
+                        group__pk=10,
+                        group__name="Group 1",
+                        mass=1000,
+                    )
+                ],
+            ),
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value={
+                    "pilot one": SimpleNamespace(
+                        character_name="Pilot One",
+                        character_id=101,
+                        portrait_url_32="url1",
+                    )
+                },
+            ),
+        ):
+            result = get_fleet_composition(pilots=pilots, ships=ships)
+
+            self.assertEqual(result["pilots"][0]["id"], 101)
+            self.assertEqual(result["pilots"][0]["ship_id"], 1)
+
+    def test_matches_renamed_pilots(self):
+        """
+        Test that get_fleet_composition matches pilots, whose character has been renamed since, by the pasted name.
+
+        :return:
+        :rtype:
+        """
+
+        pilots = {"Old Name": {"name": "Old Name", "ship": "Ship Class 1"}}
+        ships = {
+            "class": {"Ship Class 1": {"count": 1}},
+            "type": {"Group 1": {"count": 1}},
+        }
+
+        with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
+                return_value=[
+                    SimpleNamespace(
+                        pk=1,
+                        name="Ship Class 1",
+                        group__pk=10,
+                        group__name="Group 1",
+                        mass=1000,
+                    )
+                ],
+            ),
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value={
+                    "old name": SimpleNamespace(
+                        character_name="New Name",
+                        character_id=101,
+                        portrait_url_32="url1",
+                    )
+                },
+            ),
+        ):
+            result = get_fleet_composition(pilots=pilots, ships=ships)
+
+            self.assertEqual(result["pilots"][0]["name"], "Old Name")
+            self.assertEqual(result["pilots"][0]["id"], 101)
+
     def test_handles_empty_pilots_and_ships_gracefully(self):
         """
         Test that get_fleet_composition handles empty pilots and ships dictionaries gracefully without raising errors.
@@ -103,30 +202,27 @@ class TestGetFleetComposition(BaseTestCase):
         pilots = {}
         ships = {"class": {}, "type": {}}
 
-        itemtype_filter_qs = MagicMock()
-        itemtype_filter_qs.values_list.return_value = []
-
         with (
             patch(
-                "aa_intel_tool.parser.module.fleetcomp.ItemType.objects.filter",
-                return_value=itemtype_filter_qs,
-            ) as mock_filter,
-            patch(
-                "aa_intel_tool.parser.module.fleetcomp._get_character_info",
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
                 return_value=[],
-            ) as mock_get_character_info,
+            ) as mock_get_eve_types_by_name,
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value={},
+            ) as mock_get_characters_by_name,
         ):
             result = get_fleet_composition(pilots=pilots, ships=ships)
 
-            mock_filter.assert_called_once_with(name__in=ships["class"])
-            mock_get_character_info.assert_called_once_with(scan_data=[])
+            mock_get_eve_types_by_name.assert_called_once_with(names=ships["class"])
+            mock_get_characters_by_name.assert_called_once_with(scan_data=[])
             self.assertEqual(result["classes"], [])
             self.assertEqual(result["types"], [])
             self.assertEqual(result["pilots"], [])
 
     def test_raises_error_when_ship_class_not_found(self):
         """
-        Test that get_fleet_composition raises a StopIteration error when a ship class in the pilots dictionary is not found in the ships dictionary.
+        Test that get_fleet_composition raises a KeyError when a ship class in the pilots dictionary is not found in the ships dictionary.
 
         :return:
         :rtype:
@@ -140,9 +236,6 @@ class TestGetFleetComposition(BaseTestCase):
             "type": {},
         }
 
-        itemtype_filter_qs = MagicMock()
-        itemtype_filter_qs.values_list.return_value = []
-
         missing_pilot = SimpleNamespace(
             character_name="Pilot 1",
             character_id=101,
@@ -151,17 +244,92 @@ class TestGetFleetComposition(BaseTestCase):
 
         with (
             patch(
-                "aa_intel_tool.parser.module.fleetcomp.ItemType.objects.filter",
-                return_value=itemtype_filter_qs,
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
+                return_value=[],
             ),
             patch(
-                "aa_intel_tool.parser.module.fleetcomp._get_character_info",
-                return_value=[missing_pilot],
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value={"pilot 1": missing_pilot},
             ),
         ):
-            with self.assertRaises(StopIteration):
+            with self.assertRaises(KeyError):
                 get_fleet_composition(pilots=pilots, ships=ships)
 
+    def test_number_of_queries_does_not_depend_on_ship_diversity(self):
+        """
+        Test that get_fleet_composition needs a fixed number of queries for a 256-pilot fleet, no matter how many different ship classes are flown.
+
+        :return:
+        :rtype:
+        """
+
+        number_of_pilots = 256
+        ship_group = ItemGroup.objects.create(
+            id=25,
+            name="Frigate",
+            category=ItemCategory.objects.create(id=6, name="Ship"),
+        )
+        ItemType.objects.bulk_create(
+            [
+                ItemType(id=1000 + i, name=f"Ship {i}", group=ship_group, mass=1000)
+                for i in range(number_of_pilots)
+            ]
+        )
+        EveCharacter.objects.bulk_create(
+            [
+                EveCharacter(
+                    character_id=2000 + i,
+                    character_name=f"Pilot {i}",
+                    corporation_id=98000001,
+                    corporation_name="Corporation",
+                    corporation_ticker="CORP",
+                )
+                for i in range(number_of_pilots)
+            ]
+        )
+
+        clear_type_index()
+        self.addCleanup(clear_type_index)
+
+        # Warm up the SDE type index, it's not what we are testing here
+        get_type_index()
+
+        for number_of_ship_classes in (1, 16, number_of_pilots):
+            with self.subTest(number_of_ship_classes=number_of_ship_classes):
+                pilots = {}
+                ships = {"class": {}, "type": {}}
+
+                for i in range(number_of_pilots):
+                    line = [
+                        f"Pilot {i}",
+                        "Jita",
+                        f"Ship {i % number_of_ship_classes}",
+                        "Frigate",
+                        "Squad Member",
+                        "0 - 0 - 5",
+                        "",
+                    ]
+                    pilots[line[0]] = {
+                        "name": line[0],
+                        "solarsystem": line[1],
+                        "ship": line[2],
+                        "ship_type": line[3],
+                    }
+                    ships = update_ships(ships=ships, line=line)
+
+                # Fetching the characters
+                with self.assertNumQueries(1):
+                    result = get_fleet_composition(pilots=pilots, ships=ships)
+
+                self.assertEqual(len(result["pilots"]), number_of_pilots)
+                self.assertEqual(len(result["classes"]), number_of_ship_classes)
+                self.assertEqual(
+                    {pilot["name"]: pilot["ship_id"] for pilot in result["pilots"]}[
+                        f"Pilot {number_of_pilots - 1}"
+                    ],
+                    1000 + (number_of_pilots - 1) % number_of_ship_classes,
+                )
+
 
 class TestParseLine(BaseTestCase):
     """
@@ -193,6 +361,71 @@ class TestParseLine(BaseTestCase):
             ],
         )
 
+    def test_parses_matched_line(self):
+        """
+        Test that parse_line takes the columns of an already matched line from its groups
+
+        :return:
+        :rtype:
+        """
+
+        line = RegexPattern.FLEETCOMP.value.match(
+            "Pilot Name\tSystem Name\tShip Class\tShip Type\tPosition\t5 - 5 - 5"
+        )
+
+        result = parse_line(line)
+
+        self.assertEqual(
+            result,
+            [
+                "Pilot Name",
+                "System Name",
+                "Ship Class",
+                "Ship Type",
+                "Position",
+                "5 - 5 - 5",
+                "",
+            ],
+        )
+
+
+class TestHasLineStructure(BaseTestCase):
+    """
+    Test cases for the has_line_structure function.
+    """
+
+    def test_returns_true_for_fleet_composition_lines(self):
+        """
+        Test that lines with a skills column after at least 5 other columns are accepted
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(
+            has_line_structure("Pilot\tSystem\tOmen\tCruiser\tSquad Member\t0 - 0 - 5")
+        )
+        self.assertTrue(
+            has_line_structure(
+                "Pilot\tSystem\tOmen\tCruiser\tSquad Member\t0 - 0 - 5\tWing 1 / Squad 1"
+            )
+        )
+
+    def test_returns_false_for_other_lines(self):
+        """
+        Test that lines without a skills column are rejected
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(has_line_structure("Pilot Name"))
+        self.assertFalse(has_line_structure("670\tCapsule\tCapsule\t300 km"))
+        self.assertFalse(has_line_structure("Pilot\t0 - 0 - 5\tOmen\tCruiser\tA\tB"))
+        self.assertFalse(
+            has_line_structure("Pilot\tSystem\tOmen\tCruiser\tSquad Member\t0 - 0 - 6")
+        )
+
 
 class TestUpdateShips(BaseTestCase):
     """
@@ -297,6 +530,8 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         """
 
         pilots = {"Pilot 1": {"ship": "Ship Class 1"}}
+        eve_character = SimpleNamespace(character_name="Pilot 1", character_id=101)
+        characters_by_name = {"pilot 1": eve_character}
         ships = {
             "class": {"Ship Class 1": {"count": 1}},
             "type": {"Group 1": {"count": 1}},
@@ -305,6 +540,10 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         participation = {"some": "data"}
 
         with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value=characters_by_name,
+            ) as mock_get_characters_by_name,
             patch(
                 "aa_intel_tool.parser.module.fleetcomp.get_fleet_composition",
                 return_value=fleet_composition,
@@ -320,11 +559,15 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         ):
             result = handle_fleet_composition_and_participation(pilots, ships)
 
+            mock_get_characters_by_name.assert_called_once_with(scan_data=list(pilots))
             mock_get_fleet_composition.assert_called_once_with(
-                pilots=pilots, ships=ships
+                pilots=pilots, ships=ships, characters_by_name=characters_by_name
             )
             mock_parse_pilots.assert_called_once_with(
-                scan_data=list(set(pilots)), safe_to_db=False, ignore_limit=True
+                scan_data=list(pilots),
+                safe_to_db=False,
+                ignore_limit=True,
+                eve_characters=[eve_character],
             )
             self.assertEqual(result, (fleet_composition, participation))
 
@@ -337,6 +580,8 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         """
 
         pilots = {"Pilot 1": {"ship": "Ship Class 1"}}
+        eve_character = SimpleNamespace(character_name="Pilot 1", character_id=101)
+        characters_by_name = {"pilot 1": eve_character}
         ships = {
             "class": {"Ship Class 1": {"count": 1}},
             "type": {"Group 1": {"count": 1}},
@@ -344,6 +589,10 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         fleet_composition = {"classes": [], "types": [], "pilots": []}
 
         with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value=characters_by_name,
+            ) as mock_get_characters_by_name,
             patch(
                 "aa_intel_tool.parser.module.fleetcomp.get_fleet_composition",
                 return_value=fleet_composition,
@@ -355,8 +604,9 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         ):
             result = handle_fleet_composition_and_participation(pilots, ships)
 
+            mock_get_characters_by_name.assert_called_once_with(scan_data=list(pilots))
             mock_get_fleet_composition.assert_called_once_with(
-                pilots=pilots, ships=ships
+                pilots=pilots, ships=ships, characters_by_name=characters_by_name
             )
             self.assertEqual(result, (fleet_composition, None))
 
@@ -369,10 +619,15 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         """
 
         pilots = {}
+        characters_by_name = {}
         ships = {"class": {}, "type": {}}
         fleet_composition = {"classes": [], "types": [], "pilots": []}
 
         with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value=characters_by_name,
+            ) as mock_get_characters_by_name,
             patch(
                 "aa_intel_tool.parser.module.fleetcomp.get_fleet_composition",
                 return_value=fleet_composition,
@@ -384,11 +639,74 @@ class TestHandleFleetCompositionAndParticipation(BaseTestCase):
         ):
             result = handle_fleet_composition_and_participation(pilots, ships)
 
+            mock_get_characters_by_name.assert_called_once_with(scan_data=list(pilots))
             mock_get_fleet_composition.assert_called_once_with(
-                pilots=pilots, ships=ships
+                pilots=pilots, ships=ships, characters_by_name=characters_by_name
             )
             self.assertEqual(result, (fleet_composition, None))
 
+    def test_resolves_pilots_only_once(self):
+        """
+        Test that handle_fleet_composition_and_participation resolves the pilots only once and shares them between the fleet composition and the participation.
+
+        :return:
+        :rtype:
+        """
+
+        pilots = {"Pilot 1": {"ship": "Ship Class 1"}}
+        ships = {
+            "class": {"Ship Class 1": {"count": 1}},
+            "type": {"Group 1": {"count": 1}},
+        }
+        eve_character = EveCharacter(
+            character_name="Pilot 1",
+            character_id=101,
+            corporation_id=201,
+            corporation_name="Corporation 1",
+            corporation_ticker="CORP1",
+            alliance_id=301,
+            alliance_name="Alliance 1",
+            alliance_ticker="ALLY1",
+        )
+
+        with (
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp._get_characters_by_name",
+                return_value={"pilot 1": eve_character},
+            ) as mock_get_characters_by_name,
+            patch(
+                "aa_intel_tool.parser.module.chatlist._get_character_info"
+            ) as mock_chatlist_get_character_info,
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp.get_eve_types_by_name",
+                return_value=[
+                    SimpleNamespace(
+                        pk=1,
+                        name="Ship Class 1",
+                        group__pk=10,
+                        group__name="Group 1",
+                        mass=1000,
+                    )
+                ],
+            ),
+            patch(
+                "aa_intel_tool.parser.module.fleetcomp.AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN",
+                True,
+            ),
+            patch(
+                "aa_intel_tool.parser.module.chatlist.AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN",
+                True,
+            ),
+        ):
+            fleet_composition, participation = (
+                handle_fleet_composition_and_participation(pilots, ships)
+            )
+
+            mock_get_characters_by_name.assert_called_once_with(scan_data=["Pilot 1"])
+            mock_chatlist_get_character_info.assert_not_called()
+            self.assertEqual(fleet_composition["pilots"][0]["id"], 101)
+            self.assertEqual(participation["pilots"]["data"][0]["id"], 101)
+
 
 class TestParse(BaseTestCase):
     """
@@ -501,3 +819,125 @@ class TestParse(BaseTestCase):
                 scan_type=Scan.Type.FLEETCOMP, parsed_data=expected_parsed
             )
             self.assertEqual(result, mock_safe_scan.return_value)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch(
+    "aa_intel_tool.parser.module.fleetcomp.AppSettings.INTELTOOL_ENABLE_MODULE_CHATSCAN",
+    True,
+)
+class TestQueryBudget(BaseTestCase):
+    """
+    Test that the number of queries and ESI calls of the fleet composition parser
+    doesn't grow with the number of pilots
+    """
+
+    SIZES = (10, 100, 256)
+
+    def setUp(self):
+        """
+        Set up the ship types and the characters ESI knows
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        ship_group = ItemGroup.objects.create(
+            id=25,
+            name="Frigate",
+            category=ItemCategory.objects.create(id=6, name="Ship"),
+        )
+        ItemType.objects.bulk_create(
+            [
+                ItemType(id=1000 + i, name=f"Ship {i}", group=ship_group, mass=1000)
+                for i in range(16)
+            ]
+        )
+
+        self.characters = create_fake_characters(number_of_characters=max(self.SIZES))
+        self.fake_esi = FakeESIHandler(characters=self.characters)
+
+        self.addCleanup(clear_type_index)
+
+    def _run(self, size: int) -> Scan:
+        """
+        Parse a fleet composition with the given number of pilots
+
+        :param size:
+        :type size:
+        :return:
+        :rtype:
+        """
+
+        return parse(
+            scan_data=[
+                f"{character.character_name}\tJita\tShip {i % 16}\tFrigate\t"
+                "Squad Member\t0 - 0 - 5\tWing 1 / Squad 1"
+                for i, character in enumerate(self.characters[:size])
+            ]
+        )
+
+    def _prepare(self, size: int):  # pylint: disable=unused-argument
+        """
+        Start with a cold SDE type index for every run
+
+        :param size:
+        :type size:
+        :return:
+        :rtype:
+        """
+
+        clear_type_index()
+
+    def _forget_characters(self, size: int):
+        """
+        Remove the characters and their resolved names and clear the caches, so all pilots are new
+
+        :param size:
+        :type size:
+        :return:
+        :rtype:
+        """
+
+        self._prepare(size=size)
+
+        EveCharacter.objects.filter(character_id__gte=90000000).delete()
+        CharacterName.objects.all().delete()
+        cache.clear()
+        corporation_cache.clear()
+        alliance_cache.clear()
+
+    def test_new_pilots(self):
+        """
+        Test the budget when all pilots need to be fetched from ESI
+
+        :return:
+        :rtype:
+        """
+
+        with self.fake_esi.patch():
+            self.assertQueryBudget(
+                run=self._run,
+                sizes=self.SIZES,
+                max_queries=20,
+                # Names, affiliations, factions, 2 corporations and 1 alliance
+                max_esi_calls=6,
+                fake_esi=self.fake_esi,
+                prepare=self._forget_characters,
+            )
+
+    def test_known_pilots(self):
+        """
+        Test the budget when all pilots are already in the database
+
+        :return:
+        :rtype:
+        """
+
+        EveCharacter.objects.bulk_create(self.characters)
+
+        self.assertQueryBudget(
+            run=self._run, sizes=self.SIZES, max_queries=9, prepare=self._prepare
+        )
@@ -7,10 +7,13 @@ from datetime import timedelta
 from unittest.mock import patch
 
 # Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 
 # AA Intel Tool
-from aa_intel_tool.tasks import housekeeping
+from aa_intel_tool.models import Scan, ScanData
+from aa_intel_tool.tasks import housekeeping, parse_scan, refresh_affiliations
 from aa_intel_tool.tests import BaseTestCase
 
 
@@ -19,38 +22,218 @@ class TestHousekeeping(BaseTestCase):
     Tests for the housekeeping task
     """
 
+    @staticmethod
+    def _create_scan(age: timedelta) -> Scan:
+        """
+        Create a scan with one section, created the given time ago
+
+        :param age:
+        :type age:
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.DSCAN, raw_data="raw")
+        ScanData.objects.create(
+            scan=intel_scan, section=ScanData.Section.SHIPLIST, processed_data=[]
+        )
+        Scan.objects.filter(pk=intel_scan.pk).update(created=now() - age)
+
+        return intel_scan
+
     def test_removes_scans_older_than_retention_time(self):
         """
-        Test that scans older than the retention time are removed.
+        Test that scans older than the retention time are removed with their sections.
+
+        :return:
+        :rtype:
+        """
+
+        old_scans = [self._create_scan(age=timedelta(days=8)) for _ in range(5)]
+        new_scan = self._create_scan(age=timedelta(days=6))
+
+        with patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_SCAN_RETENTION_TIME", 7):
+            housekeeping()
+
+        self.assertFalse(
+            Scan.objects.filter(pk__in=[scan.pk for scan in old_scans]).exists()
+        )
+        self.assertQuerySetEqual(Scan.objects.all(), [new_scan])
+        self.assertEqual(ScanData.objects.get().scan_id, new_scan.pk)
+
+    def test_removes_scans_in_batches(self):
+        """
+        Test that the scans are removed in batches of the configured size.
 
         :return:
         :rtype:
         """
 
+        for _ in range(5):
+            self._create_scan(age=timedelta(days=8))
+
         with (
             patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_SCAN_RETENTION_TIME", 7),
-            patch("aa_intel_tool.tasks.Scan.objects.filter") as mock_filter,
+            patch(
+                "aa_intel_tool.tasks.AppSettings.INTELTOOL_HOUSEKEEPING_BATCH_SIZE", 2
+            ),
+            CaptureQueriesContext(connection) as queries,
         ):
             housekeeping()
-            mock_filter.assert_called_once()
-            called_kwargs = mock_filter.call_args.kwargs
-            created_lte = called_kwargs.get("created__lte")
-            expected = now() - timedelta(days=7)
 
-            self.assertTrue(abs(created_lte - expected) < timedelta(seconds=1))
-            mock_filter.return_value.delete.assert_called_once()
+        scan_deletes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(
+                f"DELETE FROM {connection.ops.quote_name(Scan._meta.db_table)}"
+            )
+        ]
 
-    def test_does_not_remove_scans_when_retention_time_is_zero(self):
+        self.assertEqual(len(scan_deletes), 3)
+        self.assertFalse(Scan.objects.exists())
+        self.assertFalse(ScanData.objects.exists())
+
+    def test_does_not_load_the_scan_data(self):
         """
-        Test that no scans are removed when retention time is set to zero.
+        Test that neither the raw data nor the sections are loaded for removal.
 
         :return:
         :rtype:
         """
 
+        for _ in range(3):
+            self._create_scan(age=timedelta(days=8))
+
         with (
-            patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_SCAN_RETENTION_TIME", 0),
-            patch("aa_intel_tool.tasks.Scan.objects.filter") as mock_filter,
+            patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_SCAN_RETENTION_TIME", 7),
+            CaptureQueriesContext(connection) as queries,
         ):
             housekeeping()
-            mock_filter.assert_not_called()
+
+        selects = [
+            query["sql"] for query in queries if query["sql"].startswith("SELECT")
+        ]
+
+        self.assertFalse(any("raw_data_bytes" in sql for sql in selects))
+        self.assertFalse(any("processed_data_json" in sql for sql in selects))
+
+    def test_does_not_remove_scans_when_retention_time_is_zero(self):
+        """
+        Test that no scans are removed when retention time is set to zero.
+
+        :return:
+        :rtype:
+        """
+
+        old_scan = self._create_scan(age=timedelta(days=365))
+
+        with patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_SCAN_RETENTION_TIME", 0):
+            housekeeping()
+
+        self.assertQuerySetEqual(Scan.objects.all(), [old_scan])
+
+
+class TestParseScan(BaseTestCase):
+    """
+    Tests for the parse_scan task
+    """
+
+    def test_parses_the_pending_scan(self):
+        """
+        Test that the pending scan is parsed.
+
+        :return:
+        :rtype:
+        """
+
+        with patch("aa_intel_tool.tasks.parse_pending_scan") as mock_parse:
+            parse_scan(scan_hash="pending-hash")
+
+        mock_parse.assert_called_once_with(scan_hash="pending-hash")
+
+
+class TestRefreshAffiliations(BaseTestCase):
+    """
+    Tests for the refresh_affiliations task
+    """
+
+    @staticmethod
+    def _create_scan(
+        section: ScanData.Section, character_ids: list[int], age: timedelta
+    ) -> None:
+        """
+        Create a scan with one section listing the given characters, created the given time ago
+
+        :param section:
+        :type section:
+        :param character_ids:
+        :type character_ids:
+        :param age:
+        :type age:
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST, raw_data="raw")
+        ScanData.objects.create(
+            scan=intel_scan,
+            section=section,
+            processed_data=[
+                {"id": character_id, "name": f"Pilot {character_id}"}
+                for character_id in character_ids
+            ],
+        )
+        Scan.objects.filter(pk=intel_scan.pk).update(created=now() - age)
+
+    @patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_AFFILIATION_REFRESH_WINDOW", 24)
+    def test_refreshes_the_characters_seen_in_recent_scans(self):
+        """
+        Test that only the characters in the pilot lists of recent scans are refreshed.
+
+        :return:
+        :rtype:
+        """
+
+        self._create_scan(
+            section=ScanData.Section.PILOTLIST,
+            character_ids=[1, 2],
+            age=timedelta(hours=1),
+        )
+        self._create_scan(
+            section=ScanData.Section.FLEETCOMPOSITION,
+            character_ids=[2, 3],
+            age=timedelta(hours=23),
+        )
+        self._create_scan(
+            section=ScanData.Section.PILOTLIST,
+            character_ids=[4],
+            age=timedelta(hours=25),
+        )
+        self._create_scan(
+            section=ScanData.Section.CORPORATIONLIST,
+            character_ids=[5],
+            age=timedelta(hours=1),
+        )
+
+        with patch(
+            "aa_intel_tool.tasks.refresh_character_affiliations", return_value=1
+        ) as mock_refresh:
+            refresh_affiliations()
+
+        mock_refresh.assert_called_once_with(character_ids={1, 2, 3})
+
+    @patch("aa_intel_tool.tasks.AppSettings.INTELTOOL_AFFILIATION_REFRESH_WINDOW", 0)
+    def test_does_nothing_when_disabled(self):
+        """
+        Test that nothing is refreshed, when the refresh window is 0.
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "aa_intel_tool.tasks.refresh_character_affiliations"
+        ) as mock_refresh:
+            refresh_affiliations()
+
+        mock_refresh.assert_not_called()
@@ -4,16 +4,17 @@ Tests for the AJAX views in aa_intel_tool.views.ajax.
 
 # Standard Library
 from http import HTTPStatus
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 # Django
 from django.test import RequestFactory
 from django.urls import reverse
 
 # AA Intel Tool
-from aa_intel_tool.models import ScanData
+from aa_intel_tool.helper.http_cache import scan_etag
+from aa_intel_tool.models import Scan, ScanData
 from aa_intel_tool.tests import BaseTestCase
-from aa_intel_tool.views.ajax import get_scan_data
+from aa_intel_tool.views.ajax import get_all_scan_data, get_scan_data
 
 
 class TestGetScanData(BaseTestCase):
@@ -37,15 +38,16 @@ class TestGetScanData(BaseTestCase):
             )
         )
 
-        with patch("aa_intel_tool.views.ajax.ScanData.objects.filter") as mock_filter:
-            mock_scan_data = Mock()
-            mock_scan_data.processed_data = {"key": "value"}
-            mock_filter.return_value.get.return_value = mock_scan_data
+        scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST, raw_data="raw")
+        ScanData.objects.create(
+            scan=scan, section="valid-section", processed_data={"key": "value"}
+        )
 
-            response = get_scan_data(request, "valid-hash", "valid-section")
+        response = get_scan_data(request, scan.hash, "valid-section")
 
-            self.assertEqual(response.status_code, HTTPStatus.OK)
-            self.assertJSONEqual(response.content, {"key": "value"})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertJSONEqual(response.content, {"key": "value"})
 
     def test_returns_empty_dict_when_scan_data_does_not_exist(self):
         """
@@ -63,10 +65,303 @@ class TestGetScanData(BaseTestCase):
             )
         )
 
-        with patch("aa_intel_tool.views.ajax.ScanData.objects.filter") as mock_filter:
-            mock_filter.return_value.get.side_effect = ScanData.DoesNotExist
+        response = get_scan_data(request, "invalid-hash", "invalid-section")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertJSONEqual(response.content, {})
+
+
+class TestGetAllScanData(BaseTestCase):
+    """
+    Tests for the get_all_scan_data AJAX view
+    """
+
+    def test_returns_processed_data_for_all_sections_in_one_query(self):
+        """
+        Testing return of the processed data of all sections with a single query
+
+        :return:
+        :rtype:
+        """
+
+        scan = Scan.objects.create(scan_type=Scan.Type.DSCAN, raw_data="raw")
+        ScanData.objects.create(
+            scan=scan,
+            section=ScanData.Section.SHIPLIST,
+            processed_data=[{"name": "Frigate", "count": 2}],
+        )
+        ScanData.objects.create(
+            scan=scan, section=ScanData.Section.STARBASES_ON_GRID, processed_data=[]
+        )
+
+        rf = RequestFactory()
+        request = rf.get(
+            reverse(
+                "aa_intel_tool:ajax_get_all_scan_data",
+                kwargs={"scan_hash": scan.hash},
+            )
+        )
+
+        with self.assertNumQueries(1):
+            response = get_all_scan_data(request, scan.hash)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertJSONEqual(
+            response.content,
+            {
+                "shiplist": [{"name": "Frigate", "count": 2}],
+                "starbases_on_grid": [],
+            },
+        )
+
+    def test_returns_empty_dict_when_scan_does_not_exist(self):
+        """
+        Testing return of empty dict when the scan does not exist
+
+        :return:
+        :rtype:
+        """
+
+        rf = RequestFactory()
+        request = rf.get(
+            reverse(
+                "aa_intel_tool:ajax_get_all_scan_data",
+                kwargs={"scan_hash": "invalid-hash"},
+            )
+        )
+
+        response = get_all_scan_data(request, "invalid-hash")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertJSONEqual(response.content, {})
+
+
+class TestScanDataHttpCaching(BaseTestCase):
+    """
+    Tests for the HTTP caching of the AJAX views
+    """
+
+    def test_sets_etag_and_long_lived_cache_control(self):
+        """
+        Testing that existing scan data is served with a strong ETag and cached for a long time
+
+        :return:
+        :rtype:
+        """
+
+        scan = Scan.objects.create(scan_type=Scan.Type.DSCAN, raw_data="raw")
+        ScanData.objects.create(
+            scan=scan, section=ScanData.Section.SHIPLIST, processed_data=[]
+        )
+
+        response = self.client.get(
+            reverse(
+                "aa_intel_tool:ajax_get_scan_data",
+                kwargs={"scan_hash": scan.hash, "scan_section": "shiplist"},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["ETag"], scan_etag(scan.hash, "shiplist"))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_max_age_is_capped_at_the_retention_time(self):
+        """
+        Testing that scan data is not cached longer than the scan is kept, and for
+        a year, when scans are kept indefinitely
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse(
+            "aa_intel_tool:ajax_get_all_scan_data", kwargs={"scan_hash": "valid-hash"}
+        )
+        headers = {"if-none-match": scan_etag("valid-hash", "all")}
+
+        for retention_time, max_age in ((30, 2592000), (0, 31536000)):
+            with (
+                self.subTest(retention_time=retention_time),
+                patch(
+                    "aa_intel_tool.helper.http_cache.AppSettings.INTELTOOL_SCAN_RETENTION_TIME",
+                    retention_time,
+                ),
+            ):
+                response = self.client.get(url, headers=headers)
+
+                self.assertIn(f"max-age={max_age}", response["Cache-Control"])
+
+    def test_returns_not_modified_without_database_access(self):
+        """
+        Testing that a matching If-None-Match is answered with a 304 without any query
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse(
+                    "aa_intel_tool:ajax_get_all_scan_data",
+                    kwargs={"scan_hash": "valid-hash"},
+                ),
+                headers={"if-none-match": scan_etag("valid-hash", "all")},
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_missing_scan_data_is_not_stored(self):
+        """
+        Testing that missing scan data is not stored by the browser
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(
+            reverse(
+                "aa_intel_tool:ajax_get_scan_data",
+                kwargs={"scan_hash": "invalid-hash", "scan_section": "shiplist"},
+            )
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("no-store", response["Cache-Control"])
+
+
+class TestScanDataStorage(BaseTestCase):
+    """
+    Tests for sending the stored JSON of the scan data
+    """
+
+    def test_sends_stored_json_verbatim(self):
+        """
+        Testing that the stored JSON is sent as it is, without decoding it
+
+        :return:
+        :rtype:
+        """
+
+        scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST, raw_data="raw")
+        ScanData.objects.create(
+            scan=scan,
+            section=ScanData.Section.PILOTLIST,
+            processed_data=[{"name": "Pilot"}],
+        )
+        ScanData.objects.create(
+            scan=scan,
+            section=ScanData.Section.ALLIANCELIST,
+            processed_data=[],
+        )
+
+        rf = RequestFactory()
+        request = rf.get("/")
+
+        with patch("aa_intel_tool.models.json.loads") as mock_loads:
+            section_response = get_scan_data(request, scan.hash, "pilotlist")
+            all_response = get_all_scan_data(request, scan.hash)
+
+            mock_loads.assert_not_called()
+
+        self.assertEqual(section_response.content, b'[{"name": "Pilot"}]')
+        self.assertJSONEqual(
+            all_response.content,
+            {"pilotlist": [{"name": "Pilot"}], "alliancelist": []},
+        )
+
+    def test_sends_compressed_data_decompressed(self):
+        """
+        Testing that compressed scan data is sent decompressed
+
+        :return:
+        :rtype:
+        """
+
+        processed_data = [{"name": "Pilot"}] * 100
+
+        with patch(
+            "aa_intel_tool.helper.compression.AppSettings.INTELTOOL_COMPRESS_SCAN_DATA",
+            True,
+        ):
+            scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST, raw_data="raw")
+            ScanData.objects.create(
+                scan=scan,
+                section=ScanData.Section.PILOTLIST,
+                processed_data=processed_data,
+            )
+
+        rf = RequestFactory()
+        request = rf.get("/")
+
+        self.assertJSONEqual(
+            get_scan_data(request, scan.hash, "pilotlist").content, processed_data
+        )
+        self.assertJSONEqual(
+            get_all_scan_data(request, scan.hash).content,
+            {"pilotlist": processed_data},
+        )
+
+
+class TestGetScanStatus(BaseTestCase):
+    """
+    Tests for the scan status, polled while a scan is parsed in the background
+    """
+
+    def _get_status(self, scan_hash: str) -> dict:
+        """
+        Get the status of a scan
+
+        :param scan_hash:
+        :type scan_hash:
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(
+            reverse("aa_intel_tool:ajax_get_scan_status", args=[scan_hash])
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("no-store", response["Cache-Control"])
+
+        return response.json()
+
+    def test_returns_pending_for_pending_scan(self):
+        """
+        Testing the status of a scan that is still being parsed
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.PENDING)
+
+        self.assertEqual(self._get_status(intel_scan.hash), {"status": "pending"})
+
+    def test_returns_ready_for_parsed_scan(self):
+        """
+        Testing the status of a scan that has been parsed
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST)
+
+        self.assertEqual(self._get_status(intel_scan.hash), {"status": "ready"})
+
+    def test_returns_failed_for_invalid_or_missing_scan(self):
+        """
+        Testing the status of a scan that could not be parsed, or doesn't exist
+
+        :return:
+        :rtype:
+        """
 
-            response = get_scan_data(request, "invalid-hash", "invalid-section")
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.INVALID)
 
-            self.assertEqual(response.status_code, HTTPStatus.OK)
-            self.assertJSONEqual(response.content, {})
+        self.assertEqual(self._get_status(intel_scan.hash), {"status": "failed"})
+        self.assertEqual(self._get_status("invalid-hash"), {"status": "failed"})
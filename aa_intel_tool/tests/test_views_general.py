@@ -10,13 +10,17 @@ from unittest.mock import MagicMock, Mock, patch
 from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
 from django.shortcuts import redirect
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
 
 # AA Intel Tool
 from aa_intel_tool.exceptions import ParserError
 from aa_intel_tool.models import Scan
+from aa_intel_tool.parser.general import SCAN_ERROR_CACHE_KEY_PREFIX
 from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
 from aa_intel_tool.views import general as general_view
 from aa_intel_tool.views.general import scan
 
@@ -265,3 +269,151 @@ class TestViewScan(BaseTestCase):
                 self.assertEqual(response.status_code, HTTPStatus.OK)
                 self.assertTemplateUsed(response, "supported_template.html")
                 mock_render.assert_called_once()
+
+
+class TestViewScanHttpCaching(BaseTestCase):
+    """
+    Tests for the HTTP caching of the scan view
+    """
+
+    def test_scan_page_has_no_etag(self):
+        """
+        Testing that the scan page is always rendered, since it contains per-user
+        content (menu, notifications, messages)
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.DSCAN, raw_data="raw")
+        url = reverse("aa_intel_tool:intel_tool_scan", args=[intel_scan.hash])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(response.has_header("ETag"))
+
+        response = self.client.get(url, headers={"if-none-match": "*"})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestAsyncParsing(BaseTestCase):
+    """
+    Tests for parsing intel in the background
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty cache
+
+        :return:
+        :rtype:
+        """
+
+        super().setUp()
+
+        cache.clear()
+
+    @patch("aa_intel_tool.views.general.AppSettings.INTELTOOL_ASYNC_PARSING", True)
+    def test_queues_new_scan_and_redirects_to_it(self):
+        """
+        Testing that the intel is queued and the pending scan is shown right away
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("aa_intel_tool.views.general.parse_scan") as mock_parse_scan,
+            patch("aa_intel_tool.views.general.parse_intel") as mock_parse_intel,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                reverse("aa_intel_tool:intel_tool_index"),
+                data={"eve_intel": "Line 1"},
+            )
+
+        intel_scan = Scan.objects.get()
+
+        self.assertEqual(intel_scan.scan_type, Scan.Type.PENDING)
+        self.assertEqual(intel_scan.raw_data, "Line 1")
+        self.assertRedirects(
+            response,
+            reverse("aa_intel_tool:intel_tool_scan", args=[intel_scan.hash]),
+            fetch_redirect_response=False,
+        )
+        mock_parse_scan.delay.assert_called_once_with(scan_hash=intel_scan.hash)
+        mock_parse_intel.assert_not_called()
+
+    @patch("aa_intel_tool.views.general.AppSettings.INTELTOOL_ASYNC_PARSING", True)
+    @patch(
+        "aa_intel_tool.parser.general.AppSettings.INTELTOOL_DEDUPLICATION_WINDOW", 60
+    )
+    def test_does_not_queue_the_same_intel_twice(self):
+        """
+        Testing that the same intel, pasted again, is not queued again
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("aa_intel_tool.views.general.parse_scan") as mock_parse_scan,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for _ in range(2):
+                self.client.post(
+                    reverse("aa_intel_tool:intel_tool_index"),
+                    data={"eve_intel": "Line 1"},
+                )
+
+        self.assertEqual(Scan.objects.count(), 1)
+        mock_parse_scan.delay.assert_called_once()
+
+    def test_renders_pending_page_that_is_not_stored(self):
+        """
+        Testing that a pending scan shows the pending page, which isn't stored
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.PENDING)
+
+        response = self.client.get(
+            reverse("aa_intel_tool:intel_tool_scan", args=[intel_scan.hash])
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(response, "aa_intel_tool/views/scan/pending.html")
+        self.assertContains(
+            response,
+            reverse("aa_intel_tool:ajax_get_scan_status", args=[intel_scan.hash]),
+        )
+        self.assertContains(response, "aa-intel-pending-scan-timeout")
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_shows_the_error_of_a_failed_scan(self):
+        """
+        Testing that the error of a scan that failed in the background is shown
+
+        :return:
+        :rtype:
+        """
+
+        intel_scan = Scan.objects.create(scan_type=Scan.Type.INVALID)
+        cache.set(f"{SCAN_ERROR_CACHE_KEY_PREFIX}:{intel_scan.hash}", "Broken intel")
+
+        response = self.client.get(
+            reverse("aa_intel_tool:intel_tool_scan", args=[intel_scan.hash])
+        )
+        messages = [str(m) for m in get_messages(response.wsgi_request)]
+
+        self.assertRedirects(
+            response,
+            reverse("aa_intel_tool:intel_tool_index"),
+            fetch_redirect_response=False,
+        )
+        self.assertIn("The provided data could not be parsed. (Broken intel)", messages)
@@ -0,0 +1,97 @@
+"""
+Tests for the metrics view in aa_intel_tool.views.metrics.
+"""
+
+# Standard Library
+from http import HTTPStatus
+from unittest.mock import patch
+
+# Django
+from django.test import override_settings
+from django.urls import reverse
+
+# AA Intel Tool
+from aa_intel_tool.tests import BaseTestCase
+from aa_intel_tool.tests.test_helper_eve_character import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestMetricsView(BaseTestCase):
+    """
+    Tests for the metrics view
+    """
+
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", False)
+    def test_returns_not_found_when_disabled(self):
+        """
+        Test that the metrics are not available, unless they are enabled
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(reverse("aa_intel_tool:intel_tool_metrics"))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_TOKEN", "")
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", True)
+    def test_returns_not_found_without_a_token(self):
+        """
+        Test that the metrics are not available without a token, even when enabled
+
+        :return:
+        :rtype:
+        """
+
+        with patch("aa_intel_tool.views.metrics.logger.warning") as mock_warning:
+            response = self.client.get(reverse("aa_intel_tool:intel_tool_metrics"))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        mock_warning.assert_called_once()
+
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_TOKEN", "secret")
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", True)
+    def test_returns_the_metrics_when_enabled(self):
+        """
+        Test that the metrics are returned in the Prometheus text format, uncached
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(
+            reverse("aa_intel_tool:intel_tool_metrics"),
+            HTTP_AUTHORIZATION="Bearer secret",
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertIn(
+            b"# TYPE aa_intel_tool_scans_parsed_total counter", response.content
+        )
+
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_TOKEN", "secret")
+    @patch("aa_intel_tool.views.metrics.AppSettings.INTELTOOL_METRICS_ENABLED", True)
+    def test_requires_the_token(self):
+        """
+        Test that the bearer token is required
+
+        :return:
+        :rtype:
+        """
+
+        url = reverse("aa_intel_tool:intel_tool_metrics")
+
+        self.assertEqual(self.client.get(url).status_code, HTTPStatus.FORBIDDEN)
+        self.assertEqual(
+            self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code,
+            HTTPStatus.FORBIDDEN,
+        )
+        self.assertEqual(
+            self.client.get(url, HTTP_AUTHORIZATION="Bearer secret").status_code,
+            HTTPStatus.OK,
+        )
@@ -5,7 +5,11 @@ Helper for our tests
 # Standard Library
 import re
 import secrets
+import threading
+from collections.abc import Iterable
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
 # Django
 from django.core.handlers.wsgi import WSGIRequest
@@ -13,6 +17,11 @@ from django.template import Context, Template
 
 # Alliance Auth
 from allianceauth.authentication.models import User
+from allianceauth.eveonline.models import (
+    EveAllianceInfo,
+    EveCharacter,
+    EveCorporationInfo,
+)
 from allianceauth.tests.auth_utils import AuthUtils
 
 
@@ -161,3 +170,207 @@ def random_id(n: int = 26) -> int:
     """
 
     return secrets.randbits(n)
+
+
+def create_fake_characters(number_of_characters: int) -> list[EveCharacter]:
+    """
+    Get unsaved characters, spread over two corporations (one of them in an
+    alliance), and create these corporations and the alliance
+
+    The corporations and the alliance are created, so Alliance Auth doesn't try to
+    fetch them from ESI itself.
+
+    :param number_of_characters: Number of characters
+    :type number_of_characters: int
+    :return: The characters, not saved to the database
+    :rtype: list[EveCharacter]
+    """
+
+    alliance = EveAllianceInfo.objects.create(
+        alliance_id=99000001,
+        alliance_name="Alliance",
+        alliance_ticker="ALLY",
+        executor_corp_id=98000001,
+    )
+    EveCorporationInfo.objects.create(
+        corporation_id=98000001,
+        corporation_name="Corporation 98000001",
+        corporation_ticker="CORP",
+        member_count=1,
+        alliance=alliance,
+    )
+    EveCorporationInfo.objects.create(
+        corporation_id=98000002,
+        corporation_name="Corporation 98000002",
+        corporation_ticker="CORP",
+        member_count=1,
+    )
+
+    return [
+        EveCharacter(
+            character_id=90000000 + index,
+            character_name=f"Pilot {index:04d}",
+            corporation_id=98000001 + index % 2,
+            corporation_name=f"Corporation {98000001 + index % 2}",
+            corporation_ticker="CORP",
+            alliance_id=99000001 if index % 2 == 0 else None,
+            alliance_name="Alliance" if index % 2 == 0 else "",
+            alliance_ticker="ALLY" if index % 2 == 0 else "",
+        )
+        for index in range(number_of_characters)
+    ]
+
+
+class FakeESIHandler:
+    """
+    Stand-in for the ESIHandler methods the parsers use
+
+    Answers from the given characters, without any network access, and counts the
+    calls (also the ones made from worker threads).
+
+    Example:
+
+        .. code-block:: python
+
+            fake_esi = FakeESIHandler(characters=characters)
+
+            with fake_esi.patch():
+                parse(scan_data=scan_data)
+
+            self.assertEqual(fake_esi.calls, 3)
+    """
+
+    def __init__(self, characters: Iterable[EveCharacter]):
+        self.characters_by_name = {
+            character.character_name: character for character in characters
+        }
+        self.characters_by_id = {
+            character.character_id: character
+            for character in self.characters_by_name.values()
+        }
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count_call(self) -> None:
+        """
+        Count a call
+
+        :return:
+        :rtype:
+        """
+
+        with self._lock:
+            self.calls += 1
+
+    def patch(self):
+        """
+        Patch the ESIHandler the parsers use
+
+        :return:
+        :rtype:
+        """
+
+        return patch.multiple(
+            "aa_intel_tool.helper.eve_character.ESIHandler",
+            post_universe_ids=self.post_universe_ids,
+            post_characters_affiliation=self.post_characters_affiliation,
+            get_universe_factions=self.get_universe_factions,
+            get_corporations_corporation_id=self.get_corporations_corporation_id,
+            get_alliances_alliance_id=self.get_alliances_alliance_id,
+        )
+
+    def post_universe_ids(self, names: list[str]) -> SimpleNamespace:
+        """
+        Resolve names to character IDs
+
+        :param names:
+        :type names:
+        :return:
+        :rtype:
+        """
+
+        self._count_call()
+
+        characters = [
+            {"id": character.character_id, "name": character.character_name}
+            for name in names
+            if (character := self.characters_by_name.get(name))
+        ]
+
+        return SimpleNamespace(model_dump=lambda: {"characters": characters})
+
+    def post_characters_affiliation(self, ids: list[int]) -> list[SimpleNamespace]:
+        """
+        Get the affiliations of characters
+
+        :param ids:
+        :type ids:
+        :return:
+        :rtype:
+        """
+
+        self._count_call()
+
+        return [
+            SimpleNamespace(
+                character_id=character.character_id,
+                corporation_id=character.corporation_id,
+                alliance_id=character.alliance_id,
+                faction_id=None,
+            )
+            for character in map(self.characters_by_id.get, ids)
+        ]
+
+    def get_universe_factions(
+        self, use_etag: bool = True  # pylint: disable=unused-argument
+    ) -> list:
+        """
+        Get the factions
+
+        :param use_etag:
+        :type use_etag:
+        :return:
+        :rtype:
+        """
+
+        self._count_call()
+
+        return []
+
+    def get_corporations_corporation_id(
+        self,
+        corporation_id: int,
+        use_etag: bool = True,  # pylint: disable=unused-argument
+    ) -> SimpleNamespace:
+        """
+        Get a corporation
+
+        :param corporation_id:
+        :type corporation_id:
+        :param use_etag:
+        :type use_etag:
+        :return:
+        :rtype:
+        """
+
+        self._count_call()
+
+        return SimpleNamespace(name=f"Corporation {corporation_id}", ticker="CORP")
+
+    def get_alliances_alliance_id(
+        self, alliance_id: int, use_etag: bool = True  # pylint: disable=unused-argument
+    ) -> SimpleNamespace:
+        """
+        Get an alliance
+
+        :param alliance_id:
+        :type alliance_id:
+        :param use_etag:
+        :type use_etag:
+        :return:
+        :rtype:
+        """
+
+        self._count_call()
+
+        return SimpleNamespace(name=f"Alliance {alliance_id}", ticker="ALLY")
@@ -7,7 +7,7 @@ from django.urls import include, path
 
 # AA Intel Tool
 from aa_intel_tool.constants import INTERNAL_URL_PREFIX
-from aa_intel_tool.views import ajax, general
+from aa_intel_tool.views import ajax, general, metrics
 
 app_name: str = "aa_intel_tool"  # pylint: disable=invalid-name
 
@@ -15,14 +15,25 @@ app_name: str = "aa_intel_tool"  # pylint: disable=invalid-name
 app_urls = [
     path(route="", view=general.index, name="intel_tool_index"),
     path(route="scan/<str:scan_hash>/", view=general.scan, name="intel_tool_scan"),
+    path(route="metrics/", view=metrics.metrics, name="intel_tool_metrics"),
 ]
 
 ajax_urls = [
+    path(
+        route="get-scan-data/<str:scan_hash>/",
+        view=ajax.get_all_scan_data,
+        name="ajax_get_all_scan_data",
+    ),
     path(
         route="get-scan-data/<str:scan_hash>/<str:scan_section>/",
         view=ajax.get_scan_data,
         name="ajax_get_scan_data",
     ),
+    path(
+        route="get-scan-status/<str:scan_hash>/",
+        view=ajax.get_scan_status,
+        name="ajax_get_scan_status",
+    ),
 ]
 
 # Put it all together
@@ -2,19 +2,70 @@
 Ajax views
 """
 
+# Standard Library
+import json
+
 # Django
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
 
 # AA Intel Tool
-from aa_intel_tool.models import ScanData
+from aa_intel_tool.helper.compression import decompress
+from aa_intel_tool.helper.http_cache import cache_scan_response, scan_etag
+from aa_intel_tool.models import Scan, ScanData
+
+
+def _scan_data_etag(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+    scan_hash: str,
+    scan_section: str = "all",
+) -> str:
+    """
+    Get the ETag for the scan data of a section, or of all sections
+
+    :param request: The HTTP request object (not used in this function but included for consistency with Django view patterns)
+    :type request: WSGIRequest
+    :param scan_hash: The unique identifier for the scan whose data is being requested
+    :type scan_hash: str
+    :param scan_section: The section of the scan data being requested, "all" for all sections
+    :type scan_section: str
+    :return: The ETag
+    :rtype: str
+    """
+
+    return scan_etag(scan_hash, scan_section)
+
 
+def _json_response(content: bytes) -> HttpResponse:
+    """
+    Get a response for already serialized JSON
+
+    An empty content is treated as missing data, which browsers must not remember.
+
+    :param content: The serialized JSON, sent as it is
+    :type content: bytes
+    :return: The response
+    :rtype: HttpResponse
+    """
+
+    if not content:
+        response = HttpResponse(content=b"{}", content_type="application/json")
+
+        # Don't let browsers remember missing data
+        patch_cache_control(response, no_store=True)
+
+        return response
 
+    return HttpResponse(content=content, content_type="application/json")
+
+
+@cache_scan_response(etag_func=_scan_data_etag)
 def get_scan_data(
     request: WSGIRequest,  # pylint: disable=unused-argument
     scan_hash: str,
     scan_section: ScanData.Section,
-) -> JsonResponse:
+) -> HttpResponse:
     """
     Get scan data for a specific section
 
@@ -24,16 +75,89 @@ def get_scan_data(
     :type scan_hash: str
     :param scan_section: The specific section of the scan data being requested, defined as a member of the ScanData.Section enumeration
     :type scan_section: ScanData.Section
-    :return: A JsonResponse containing the processed data for the specified scan and section, or an empty dictionary if no data is found
-    :rtype: JsonResponse
+    :return: A JSON response containing the processed data for the specified scan and section, or an empty dictionary if no data is found
+    :rtype: HttpResponse
     """
 
-    try:
-        scan_data = ScanData.objects.filter(  # pylint: disable=no-member
+    processed_data_json = (
+        ScanData.objects.filter(  # pylint: disable=no-member
             scan_id__exact=scan_hash, section__exact=scan_section
-        ).get()
-        processed_data = scan_data.processed_data
-    except ScanData.DoesNotExist:  # pylint: disable=no-member
-        processed_data = {}
+        )
+        .values_list("processed_data_json", flat=True)
+        .first()
+    )
+
+    return _json_response(
+        content=(
+            decompress(data=processed_data_json)
+            if processed_data_json is not None
+            else b""
+        )
+    )
+
+
+@cache_scan_response(etag_func=_scan_data_etag)
+def get_all_scan_data(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+    scan_hash: str,
+) -> HttpResponse:
+    """
+    Get the scan data for all sections of a scan at once
+
+    :param request: The HTTP request object (not used in this function but included for consistency with Django view patterns)
+    :type request: WSGIRequest
+    :param scan_hash: The unique identifier for the scan whose data is being requested
+    :type scan_hash: str
+    :return: A JSON response containing the processed data for each section of the scan, keyed by section, or an empty dictionary if no data is found
+    :rtype: HttpResponse
+    """
+
+    sections = ScanData.objects.filter(  # pylint: disable=no-member
+        scan_id__exact=scan_hash
+    ).values_list("section", "processed_data_json")
+
+    # Put the stored JSON of each section together, without decoding it
+    content = b",".join(
+        json.dumps(section).encode(encoding="utf-8")
+        + b":"
+        + decompress(data=processed_data_json)
+        for section, processed_data_json in sections
+    )
+
+    return _json_response(content=b"{" + content + b"}" if content else b"")
+
+
+def get_scan_status(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+    scan_hash: str,
+) -> JsonResponse:
+    """
+    Get the status of a scan, which is polled while it is parsed in the background
+
+    :param request: The HTTP request object (not used in this function but included for consistency with Django view patterns)
+    :type request: WSGIRequest
+    :param scan_hash: The unique identifier for the scan whose status is being requested
+    :type scan_hash: str
+    :return: A JSON response with the status, either "pending", "ready" or "failed" (also for scans that don't exist)
+    :rtype: JsonResponse
+    """
+
+    scan_type = (
+        Scan.objects.filter(pk=scan_hash)  # pylint: disable=no-member
+        .values_list("scan_type", flat=True)
+        .first()
+    )
+
+    if scan_type == Scan.Type.PENDING:
+        status = "pending"
+    elif scan_type in (None, Scan.Type.INVALID):
+        status = "failed"
+    else:
+        status = "ready"
+
+    response = JsonResponse(data={"status": status})
+
+    # The status changes, so it must always be fetched again
+    patch_cache_control(response, no_store=True)
 
-    return JsonResponse(data=processed_data, safe=False)
+    return response
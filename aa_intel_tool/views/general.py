@@ -5,8 +5,10 @@ The views…
 # Django
 from django.contrib import messages
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
 from django.http import HttpResponse
 from django.shortcuts import redirect, render
+from django.utils.cache import patch_cache_control
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
@@ -18,8 +20,9 @@ from aa_intel_tool.constants import SUPPORTED_INTEL_TYPES
 from aa_intel_tool.exceptions import ParserError
 from aa_intel_tool.form import IntelForm
 from aa_intel_tool.models import Scan, ScanData
-from aa_intel_tool.parser.general import parse_intel
+from aa_intel_tool.parser.general import get_scan_error, parse_intel, queue_intel
 from aa_intel_tool.providers.applogger import AppLogger
+from aa_intel_tool.tasks import parse_scan
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
@@ -44,7 +47,16 @@ def index(request: WSGIRequest) -> HttpResponse:
             scan_data = form.cleaned_data["eve_intel"]
 
             try:
-                parsed_intel = parse_intel(form_data=scan_data)
+                if AppSettings.INTELTOOL_ASYNC_PARSING:
+                    parsed_intel, created = queue_intel(form_data=scan_data)
+
+                    # Only parse new scans, once the worker can see them
+                    if created:
+                        transaction.on_commit(
+                            lambda: parse_scan.delay(scan_hash=parsed_intel)
+                        )
+                else:
+                    parsed_intel = parse_intel(form_data=scan_data)
 
             # Catching our own parser exceptions
             except ParserError as exc:
@@ -103,15 +115,43 @@ def scan(request: WSGIRequest, scan_hash: str):
         # pylint: disable=no-member
         intel_scan = Scan.objects.exclude(scan_type=Scan.Type.INVALID).get(pk=scan_hash)
     except Scan.DoesNotExist:
-        messages.error(
-            request=request,
-            message=_("The scan you were looking for could not be found."),
-        )
+        scan_error = get_scan_error(scan_hash=scan_hash)
+
+        # The scan was parsed in the background, and that failed
+        if scan_error is not None:
+            messages.error(
+                request=request,
+                message=_("The provided data could not be parsed. ({exc})").format(
+                    exc=scan_error
+                ),
+            )
+        else:
+            messages.error(
+                request=request,
+                message=_("The scan you were looking for could not be found."),
+            )
 
         return redirect(to="aa_intel_tool:intel_tool_index")
 
     logger.debug(msg=f"Intel Type: {intel_scan.scan_type}")
 
+    # The scan is still being parsed in the background
+    if intel_scan.scan_type == Scan.Type.PENDING:
+        response = render(
+            request=request,
+            template_name="aa_intel_tool/views/scan/pending.html",
+            context={
+                "scan_hash": scan_hash,
+                "scan": {"created": intel_scan.created},
+                "app_settings": AppSettings,
+            },
+        )
+
+        # Don't let browsers remember the pending page
+        patch_cache_control(response, no_store=True)
+
+        return response
+
     scan_data = {
         "scan_type": intel_scan.scan_type,
         "created": intel_scan.created,
@@ -0,0 +1,61 @@
+"""
+Metrics view
+"""
+
+# Django
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Intel Tool
+from aa_intel_tool.app_settings import AppSettings
+from aa_intel_tool.helper.metrics import render_metrics
+from aa_intel_tool.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Content type of the Prometheus text format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics(request: WSGIRequest) -> HttpResponse:
+    """
+    Metrics in the Prometheus text format
+
+    Only available with INTELTOOL_METRICS_ENABLED and INTELTOOL_METRICS_TOKEN set.
+    The token must be sent as bearer token in the Authorization header.
+
+    :param request: The HTTP request object
+    :type request: WSGIRequest
+    :return: The metrics
+    :rtype: HttpResponse
+    """
+
+    if not AppSettings.INTELTOOL_METRICS_ENABLED:
+        raise Http404
+
+    # Never publish the metrics without a token
+    if not AppSettings.INTELTOOL_METRICS_TOKEN:
+        logger.warning(
+            "INTELTOOL_METRICS_ENABLED is set, but INTELTOOL_METRICS_TOKEN is empty. "
+            "The metrics are not available until a token is set."
+        )
+
+        raise Http404
+
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {AppSettings.INTELTOOL_METRICS_TOKEN}",
+    ):
+        return HttpResponseForbidden()
+
+    response = HttpResponse(content=render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+    # The metrics change all the time
+    patch_cache_control(response, no_store=True)
+
+    return response
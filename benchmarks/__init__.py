@@ -0,0 +1,31 @@
+"""
+Benchmarks for AA Intel Tool
+
+These are not part of the test suite. Run them from the repository root, e.g.:
+
+    python -m benchmarks.dscan_tokenizer
+
+`benchmarks.parsers` runs all parsers end-to-end on synthetic scans of several sizes
+(see `benchmarks.generators`), to catch regressions in time, memory and queries:
+
+    python -m benchmarks.parsers --json results.json
+"""
+
+# Standard Library
+import os
+
+
+def setup_django() -> None:
+    """
+    Set up Django with the test settings
+
+    :return: None
+    :rtype: None
+    """
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testauth.settings.local")
+
+    # Django
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
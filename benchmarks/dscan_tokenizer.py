@@ -0,0 +1,71 @@
+"""
+Benchmark for the D-Scan line tokenizer
+
+Reports the number of D-Scan lines per second `_get_scan_details` is able to process
+for a 10,000 line paste.
+"""
+
+# Standard Library
+import itertools
+import timeit
+from pathlib import Path
+
+# AA Intel Tool
+from benchmarks import setup_django
+
+TEST_DATA_DIR = Path(__file__).parent.parent / "aa_intel_tool/tests/test-data"
+NUMBER_OF_LINES = 10000
+REPEAT = 5
+
+
+def get_scan_data(number_of_lines: int = NUMBER_OF_LINES) -> list[str]:
+    """
+    Build a D-Scan paste with the given number of lines from our test data
+
+    :param number_of_lines: Number of lines
+    :type number_of_lines: int
+    :return: List of D-Scan lines
+    :rtype: list[str]
+    """
+
+    lines = []
+
+    for file_name in (
+        "dscan.txt",
+        "dscan-german-client.txt",
+        "dscan-russian-client.txt",
+    ):
+        lines += (TEST_DATA_DIR / file_name).read_text(encoding="utf-8").splitlines()
+
+    return list(itertools.islice(itertools.cycle(lines), number_of_lines))
+
+
+def main() -> None:
+    """
+    Run the benchmark
+
+    :return: None
+    :rtype: None
+    """
+
+    setup_django()
+
+    # AA Intel Tool
+    from aa_intel_tool.parser.module.dscan import (  # pylint: disable=import-outside-toplevel
+        _get_scan_details,
+    )
+
+    scan_data = get_scan_data()
+    timings = timeit.repeat(
+        lambda: _get_scan_details(scan_data=scan_data), number=1, repeat=REPEAT
+    )
+    best = min(timings)
+
+    print(
+        f"_get_scan_details: {len(scan_data):,} lines in {best * 1000:.2f} ms "
+        f"(best of {REPEAT}) » {len(scan_data) / best:,.0f} lines/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Synthetic scan generators for the benchmarks
+
+All generators are deterministic for a given seed, so the same sizes always produce
+the same pastes, and results of different runs can be compared.
+"""
+
+# Standard Library
+import random
+from typing import NamedTuple
+
+NUMBER_OF_CORPORATIONS = 200
+NUMBER_OF_ALLIANCES = 40
+
+# Every 8th corporation is in no alliance
+CORPORATIONS_WITHOUT_ALLIANCE_EVERY = 8
+
+SOLAR_SYSTEMS = ("1DQ1-A", "8QT-H4", "Jita", "Perimeter", "Amamake", "M-OEE8", "T5ZI-S")
+NAME_PARTS = (
+    "Al",
+    "Ar",
+    "Bel",
+    "Cor",
+    "Da",
+    "Eri",
+    "Fen",
+    "Gar",
+    "Hal",
+    "Ish",
+    "Jor",
+    "Ka",
+    "Lor",
+    "Mar",
+    "Nyx",
+    "Or",
+    "Pel",
+    "Qua",
+    "Rho",
+    "Sar",
+    "Tal",
+    "Ul",
+    "Var",
+    "Xan",
+)
+
+
+class SdeGroup(NamedTuple):
+    """
+    An SDE group
+    """
+
+    group_id: int
+    name: str
+    category_id: int
+
+
+class SdeType(NamedTuple):
+    """
+    An SDE type
+    """
+
+    type_id: int
+    name: str
+    group_id: int
+    mass: float
+
+
+class Character(NamedTuple):
+    """
+    A character, as ESI knows it
+    """
+
+    character_id: int
+    name: str
+    corporation_id: int
+    alliance_id: int | None
+
+
+SDE_CATEGORIES = {6: "Ship", 22: "Deployable", 23: "Starbase", 65: "Structure"}
+
+SDE_GROUPS = (
+    SdeGroup(group_id=25, name="Frigate", category_id=6),
+    SdeGroup(group_id=420, name="Destroyer", category_id=6),
+    SdeGroup(group_id=26, name="Cruiser", category_id=6),
+    SdeGroup(group_id=419, name="Combat Battlecruiser", category_id=6),
+    SdeGroup(group_id=27, name="Battleship", category_id=6),
+    SdeGroup(group_id=29, name="Capsule", category_id=6),
+    SdeGroup(group_id=485, name="Dreadnought", category_id=6),
+    SdeGroup(group_id=547, name="Carrier", category_id=6),
+    SdeGroup(group_id=1246, name="Mobile Depot", category_id=22),
+    SdeGroup(group_id=1250, name="Mobile Tractor Unit", category_id=22),
+    SdeGroup(group_id=365, name="Control Tower", category_id=23),
+    SdeGroup(group_id=1657, name="Citadel", category_id=65),
+    SdeGroup(group_id=1404, name="Engineering Complex", category_id=65),
+    SdeGroup(group_id=1406, name="Refinery", category_id=65),
+    SdeGroup(group_id=1408, name="Upwell Jump Gate", category_id=65),
+)
+
+SHIP_TYPES = (
+    SdeType(type_id=587, name="Rifter", group_id=25, mass=1067000),
+    SdeType(type_id=603, name="Merlin", group_id=25, mass=997000),
+    SdeType(type_id=589, name="Executioner", group_id=25, mass=1090000),
+    SdeType(type_id=594, name="Incursus", group_id=25, mass=1028000),
+    SdeType(type_id=16236, name="Coercer", group_id=420, mass=1650000),
+    SdeType(type_id=16238, name="Cormorant", group_id=420, mass=1700000),
+    SdeType(type_id=621, name="Caracal", group_id=26, mass=11910000),
+    SdeType(type_id=622, name="Stabber", group_id=26, mass=11400000),
+    SdeType(type_id=624, name="Maller", group_id=26, mass=12750000),
+    SdeType(type_id=627, name="Thorax", group_id=26, mass=11280000),
+    SdeType(type_id=24698, name="Drake", group_id=419, mass=14010000),
+    SdeType(type_id=24690, name="Hurricane", group_id=419, mass=12800000),
+    SdeType(type_id=24696, name="Harbinger", group_id=419, mass=13800000),
+    SdeType(type_id=638, name="Raven", group_id=27, mass=99300000),
+    SdeType(type_id=641, name="Megathron", group_id=27, mass=98400000),
+    SdeType(type_id=643, name="Armageddon", group_id=27, mass=105200000),
+    SdeType(type_id=670, name="Capsule", group_id=29, mass=32000),
+    SdeType(type_id=19720, name="Revelation", group_id=485, mass=1237500000),
+    SdeType(type_id=23757, name="Archon", group_id=547, mass=1113750000),
+)
+
+STRUCTURE_TYPES = (
+    SdeType(type_id=35832, name="Astrahus", group_id=1657, mass=0),
+    SdeType(type_id=35833, name="Fortizar", group_id=1657, mass=0),
+    SdeType(type_id=35834, name="Keepstar", group_id=1657, mass=0),
+    SdeType(type_id=35825, name="Raitaru", group_id=1404, mass=0),
+    SdeType(type_id=35826, name="Azbel", group_id=1404, mass=0),
+    SdeType(type_id=35835, name="Athanor", group_id=1406, mass=0),
+)
+
+ANSIBLEX_TYPE = SdeType(
+    type_id=35841, name="Ansiblex Jump Bridge", group_id=1408, mass=0
+)
+
+DEPLOYABLE_TYPES = (
+    SdeType(type_id=33474, name="Mobile Depot", group_id=1246, mass=10000),
+    SdeType(type_id=33475, name="Mobile Tractor Unit", group_id=1250, mass=10000),
+)
+
+STARBASE_TYPES = (
+    SdeType(type_id=12235, name="Amarr Control Tower", group_id=365, mass=200000000),
+    SdeType(type_id=16213, name="Caldari Control Tower", group_id=365, mass=200000000),
+)
+
+SDE_TYPES = (
+    *SHIP_TYPES,
+    *STRUCTURE_TYPES,
+    ANSIBLEX_TYPE,
+    *DEPLOYABLE_TYPES,
+    *STARBASE_TYPES,
+)
+
+SDE_GROUP_NAMES = {group.group_id: group.name for group in SDE_GROUPS}
+
+
+def character_name(index: int) -> str:
+    """
+    Get a unique, pronounceable character name for an index
+
+    :param index: Index of the character
+    :type index: int
+    :return: The character name
+    :rtype: str
+    """
+
+    first_name = (
+        NAME_PARTS[index % len(NAME_PARTS)]
+        + NAME_PARTS[index // len(NAME_PARTS) % len(NAME_PARTS)].lower()
+    )
+
+    return f"{first_name} {index:06d}"
+
+
+def get_characters(number_of_characters: int) -> list[Character]:
+    """
+    Get the characters with the given number of characters
+
+    :param number_of_characters: Number of characters
+    :type number_of_characters: int
+    :return: The characters
+    :rtype: list[Character]
+    """
+
+    characters = []
+
+    for index in range(number_of_characters):
+        corporation_index = index % NUMBER_OF_CORPORATIONS
+
+        characters.append(
+            Character(
+                character_id=90000000 + index,
+                name=character_name(index=index),
+                corporation_id=98000000 + corporation_index,
+                alliance_id=(
+                    None
+                    if corporation_index % CORPORATIONS_WITHOUT_ALLIANCE_EVERY == 0
+                    else 99000000 + corporation_index % NUMBER_OF_ALLIANCES
+                ),
+            )
+        )
+
+    return characters
+
+
+def _get_distance(rng: random.Random, on_grid: bool) -> str:
+    """
+    Get a distance as the EVE client (English) shows it
+
+    :param rng: The random number generator
+    :type rng: random.Random
+    :param on_grid: Whether the distance is on grid
+    :type on_grid: bool
+    :return: The distance
+    :rtype: str
+    """
+
+    if not on_grid:
+        return f"{rng.uniform(0.1, 40):.1f} AU"
+
+    distance = rng.randint(100, 9999000)
+
+    return f"{distance:,} m" if distance < 10000 else f"{distance // 1000:,} km"
+
+
+def generate_dscan(number_of_lines: int, seed: int = 0) -> list[str]:
+    """
+    Generate a D-Scan with mostly ships, on and off grid, plus structures,
+    Ansiblex Jump Bridges, deployables and control towers
+
+    :param number_of_lines: Number of lines
+    :type number_of_lines: int
+    :param seed: Seed of the random number generator
+    :type seed: int
+    :return: The D-Scan lines
+    :rtype: list[str]
+    """
+
+    rng = random.Random(seed)
+    lines = []
+
+    for index in range(number_of_lines):
+        roll = rng.random()
+        on_grid = rng.random() < 0.4
+
+        if roll < 0.8:
+            eve_type = rng.choice(SHIP_TYPES)
+            name = f"{character_name(index=index)}'s {eve_type.name}"
+        elif roll < 0.9:
+            eve_type = rng.choice(STRUCTURE_TYPES)
+            name = f"{rng.choice(SOLAR_SYSTEMS)} - Structure {index}"
+        elif roll < 0.93:
+            eve_type = ANSIBLEX_TYPE
+            origin, destination = rng.sample(SOLAR_SYSTEMS, k=2)
+            name = f"{origin} » {destination} - Bridge {index}"
+        elif roll < 0.97:
+            eve_type = rng.choice(DEPLOYABLE_TYPES)
+            name = f"{eve_type.name} {index}"
+        else:
+            eve_type = rng.choice(STARBASE_TYPES)
+            name = f"Tower {index}"
+
+        # Some entries (e.g. in another system) don't have a distance
+        distance = "-" if rng.random() < 0.05 else _get_distance(rng, on_grid)
+
+        lines.append(f"{eve_type.type_id}\t{name}\t{eve_type.name}\t{distance}")
+
+    return lines
+
+
+def generate_fleetcomp(
+    number_of_pilots: int, seed: int = 0
+) -> tuple[list[str], list[Character]]:
+    """
+    Generate a fleet composition, with a fleet commander, and wings of up to 5
+    squads of up to 10 pilots (as the EVE client limits them)
+
+    :param number_of_pilots: Number of pilots
+    :type number_of_pilots: int
+    :param seed: Seed of the random number generator
+    :type seed: int
+    :return: The fleet composition lines, and the characters in the fleet
+    :rtype: tuple[list[str], list[Character]]
+    """
+
+    rng = random.Random(seed)
+    characters = get_characters(number_of_characters=number_of_pilots)
+    lines = []
+
+    for index, character in enumerate(characters):
+        ship = rng.choice(SHIP_TYPES)
+        ship_class = SDE_GROUP_NAMES[ship.group_id]
+        solar_system = rng.choice(SOLAR_SYSTEMS)
+
+        if index == 0:
+            position, skills, squad = "Fleet Commander (Boss)", "5 - 5 - 5", None
+        else:
+            wing, squad_index = divmod((index - 1) // 10, 5)
+            squad = f"Wing {wing + 1} / Squad {squad_index + 1}"
+            position, skills = (
+                ("Squad Commander", "0 - 5 - 5")
+                if (index - 1) % 10 == 0
+                else ("Squad Member", "0 - 0 - 5")
+            )
+
+        line = (
+            f"{character.name}\t{solar_system}\t{ship.name}\t{ship_class}\t"
+            f"{position}\t{skills}"
+        )
+
+        lines.append(f"{line}\t{squad}" if squad else line)
+
+    return lines, characters
+
+
+def generate_chatlist(number_of_names: int) -> tuple[list[str], list[Character]]:
+    """
+    Generate a chat list
+
+    :param number_of_names: Number of names
+    :type number_of_names: int
+    :return: The chat list lines, and the characters in it
+    :rtype: tuple[list[str], list[Character]]
+    """
+
+    characters = get_characters(number_of_characters=number_of_names)
+
+    return [character.name for character in characters], characters
@@ -0,0 +1,451 @@
+"""
+End-to-end benchmark for the intel parsers
+
+Parses synthetic D-Scans, fleet compositions and chat lists of several sizes with
+`parse_intel`, against a temporary test database and a stubbed ESI, and reports the
+time (best of all runs), the peak memory, the number of queries and ESI calls.
+
+    python -m benchmarks.parsers
+    python -m benchmarks.parsers --intel-type chatlist --sizes 100 1000 5000
+    python -m benchmarks.parsers --json results.json
+
+Chat lists and fleet compositions are parsed "cold" (all characters need to be
+looked up on ESI) and "warm" (all characters are already in the database).
+"""
+
+# Standard Library
+import argparse
+import json
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# AA Intel Tool
+from benchmarks import setup_django
+from benchmarks.generators import (
+    SDE_CATEGORIES,
+    SDE_GROUPS,
+    SDE_TYPES,
+    Character,
+    generate_chatlist,
+    generate_dscan,
+    generate_fleetcomp,
+    get_characters,
+)
+
+DEFAULT_SIZES = {
+    "dscan": (100, 1000, 5000),
+    "fleetcomp": (10, 100, 256),
+    "chatlist": (100, 1000, 5000),
+}
+REPEAT = 3
+
+
+class StubESI:
+    """
+    Stand-in for the ESIHandler methods the parsers use, answering from the
+    synthetic characters, without any network access
+    """
+
+    def __init__(self, characters: list[Character], latency: float = 0.0) -> None:
+        self.characters_by_name = {
+            character.name: character for character in characters
+        }
+        self.characters_by_id = {
+            character.character_id: character for character in characters
+        }
+        self.latency = latency
+        self.calls = Counter()
+
+    def _call(self, operation: str) -> None:
+        """
+        Count a call, and simulate the network latency
+
+        :param operation: The ESI operation
+        :type operation: str
+        :return: None
+        :rtype: None
+        """
+
+        self.calls[operation] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+    def post_universe_ids(self, names: list[str]) -> SimpleNamespace:
+        """
+        Resolve names to IDs
+
+        :param names: The names
+        :type names: list[str]
+        :return: Response with a model_dump method, like the ESI client's
+        :rtype: SimpleNamespace
+        """
+
+        self._call(operation="PostUniverseIds")
+
+        characters = [
+            {"id": character.character_id, "name": character.name}
+            for name in names
+            if (character := self.characters_by_name.get(name))
+        ]
+
+        return SimpleNamespace(model_dump=lambda: {"characters": characters})
+
+    def post_characters_affiliation(self, ids: list[int]) -> list[SimpleNamespace]:
+        """
+        Get the affiliations of characters
+
+        :param ids: The character IDs
+        :type ids: list[int]
+        :return: The affiliations
+        :rtype: list[SimpleNamespace]
+        """
+
+        self._call(operation="PostCharactersAffiliation")
+
+        return [
+            SimpleNamespace(
+                character_id=character.character_id,
+                corporation_id=character.corporation_id,
+                alliance_id=character.alliance_id,
+                faction_id=None,
+            )
+            for character in map(self.characters_by_id.get, ids)
+        ]
+
+    def get_universe_factions(
+        self, use_etag: bool = True  # pylint: disable=unused-argument
+    ) -> list[SimpleNamespace]:
+        """
+        Get the factions
+
+        :param use_etag: Not used
+        :type use_etag: bool
+        :return: The factions
+        :rtype: list[SimpleNamespace]
+        """
+
+        self._call(operation="GetUniverseFactions")
+
+        return [SimpleNamespace(faction_id=500001, name="Caldari State")]
+
+    def get_corporations_corporation_id(
+        self,
+        corporation_id: int,
+        use_etag: bool = True,  # pylint: disable=unused-argument
+    ) -> SimpleNamespace:
+        """
+        Get a corporation
+
+        :param corporation_id: The corporation ID
+        :type corporation_id: int
+        :param use_etag: Not used
+        :type use_etag: bool
+        :return: The corporation
+        :rtype: SimpleNamespace
+        """
+
+        self._call(operation="GetCorporationsCorporationId")
+
+        return SimpleNamespace(
+            name=f"Corporation {corporation_id}", ticker=str(corporation_id)[-5:]
+        )
+
+    def get_alliances_alliance_id(
+        self, alliance_id: int, use_etag: bool = True  # pylint: disable=unused-argument
+    ) -> SimpleNamespace:
+        """
+        Get an alliance
+
+        :param alliance_id: The alliance ID
+        :type alliance_id: int
+        :param use_etag: Not used
+        :type use_etag: bool
+        :return: The alliance
+        :rtype: SimpleNamespace
+        """
+
+        self._call(operation="GetAlliancesAllianceId")
+
+        return SimpleNamespace(
+            name=f"Alliance {alliance_id}", ticker=str(alliance_id)[-5:]
+        )
+
+
+def create_sde() -> None:
+    """
+    Create the SDE categories, groups and types the generators use
+
+    :return: None
+    :rtype: None
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # Third Party
+    from eve_sde.models import ItemCategory, ItemGroup, ItemType
+
+    ItemCategory.objects.bulk_create(
+        [ItemCategory(id=pk, name=name) for pk, name in SDE_CATEGORIES.items()]
+    )
+    ItemGroup.objects.bulk_create(
+        [
+            ItemGroup(id=group.group_id, name=group.name, category_id=group.category_id)
+            for group in SDE_GROUPS
+        ]
+    )
+    ItemType.objects.bulk_create(
+        [
+            ItemType(
+                id=eve_type.type_id,
+                name=eve_type.name,
+                group_id=eve_type.group_id,
+                mass=eve_type.mass,
+            )
+            for eve_type in SDE_TYPES
+        ]
+    )
+
+
+def create_affiliations(characters: list[Character]) -> None:
+    """
+    Create the corporations and alliances of the characters, which Alliance Auth
+    would otherwise fetch from ESI itself
+
+    :param characters: The characters
+    :type characters: list[Character]
+    :return: None
+    :rtype: None
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # Alliance Auth
+    from allianceauth.eveonline.models import EveAllianceInfo, EveCorporationInfo
+
+    EveAllianceInfo.objects.bulk_create(
+        [
+            EveAllianceInfo(
+                alliance_id=alliance_id,
+                alliance_name=f"Alliance {alliance_id}",
+                alliance_ticker=str(alliance_id)[-5:],
+                executor_corp_id=0,
+            )
+            for alliance_id in {
+                character.alliance_id
+                for character in characters
+                if character.alliance_id
+            }
+        ]
+    )
+    EveCorporationInfo.objects.bulk_create(
+        [
+            EveCorporationInfo(
+                corporation_id=corporation_id,
+                corporation_name=f"Corporation {corporation_id}",
+                corporation_ticker=str(corporation_id)[-5:],
+                member_count=1,
+            )
+            for corporation_id in {character.corporation_id for character in characters}
+        ]
+    )
+
+
+def reset(cold: bool) -> None:
+    """
+    Reset everything a previous run left behind
+
+    :param cold: Remove the characters and their resolved names, so they need to be looked up on ESI again
+    :type cold: bool
+    :return: None
+    :rtype: None
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # Alliance Auth
+    from allianceauth.eveonline.models import EveCharacter
+
+    # AA Intel Tool
+    from aa_intel_tool.helper.affiliation_cache import alliance_cache, corporation_cache
+    from aa_intel_tool.models import CharacterName, Scan
+
+    Scan.objects.all().delete()  # pylint: disable=no-member
+
+    if cold:
+        EveCharacter.objects.all().delete()
+        CharacterName.objects.all().delete()  # pylint: disable=no-member
+        corporation_cache.clear()
+        alliance_cache.clear()
+
+
+def measure(run: Callable[[], str], prepare: Callable[[], None], repeat: int) -> dict:
+    """
+    Measure a parser run
+
+    The time is the best of all runs. The peak memory, queries and ESI calls are
+    measured in an extra run, since tracing the memory slows it down.
+
+    :param run: Runs the parser
+    :type run: Callable[[], str]
+    :param prepare: Prepares a run, not measured
+    :type prepare: Callable[[], None]
+    :param repeat: Number of timed runs
+    :type repeat: int
+    :return: The results
+    :rtype: dict
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # Django
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+
+    for _ in range(repeat):
+        prepare()
+        start_time = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start_time)
+
+    prepare()
+    tracemalloc.start()
+
+    with CaptureQueriesContext(connection=connection) as queries:
+        run()
+
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ms": round(min(timings) * 1000, 2),
+        "peak_memory_kib": round(peak / 1024),
+        "queries": len(queries),
+    }
+
+
+def main() -> None:  # pylint: disable=too-many-locals
+    """
+    Run the benchmark
+
+    :return: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--intel-type", choices=list(DEFAULT_SIZES), action="append", default=[]
+    )
+    parser.add_argument("--sizes", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--esi-latency", type=float, default=0.0, help="Simulated latency in ms"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    setup_django()
+
+    # pylint: disable=import-outside-toplevel
+    # Django
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    # AA Intel Tool
+    from aa_intel_tool.app_settings import AppSettings
+    from aa_intel_tool.parser.general import parse_intel
+    from aa_intel_tool.providers.esi import ESIHandler
+
+    intel_types = args.intel_type or list(DEFAULT_SIZES)
+    characters = get_characters(number_of_characters=max(args.sizes or [5000]))
+    stub_esi = StubESI(characters=characters, latency=args.esi_latency / 1000)
+    results = []
+
+    setup_test_environment()
+    old_database_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        create_sde()
+        create_affiliations(characters=characters)
+
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch.multiple(
+                    AppSettings,
+                    INTELTOOL_ENABLE_MODULE_CHATSCAN=True,
+                    INTELTOOL_ENABLE_MODULE_DSCAN=True,
+                    INTELTOOL_ENABLE_MODULE_FLEETCOMP=True,
+                    INTELTOOL_CHATSCAN_MAX_PILOTS=0,
+                    INTELTOOL_DEDUPLICATION_WINDOW=0,
+                    INTELTOOL_UNRESOLVABLE_NAME_CACHE_TTL=0,
+                )
+            )
+            stack.enter_context(
+                patch.multiple(
+                    ESIHandler,
+                    post_universe_ids=stub_esi.post_universe_ids,
+                    post_characters_affiliation=stub_esi.post_characters_affiliation,
+                    get_universe_factions=stub_esi.get_universe_factions,
+                    get_corporations_corporation_id=(
+                        stub_esi.get_corporations_corporation_id
+                    ),
+                    get_alliances_alliance_id=stub_esi.get_alliances_alliance_id,
+                )
+            )
+
+            for intel_type in intel_types:
+                for size in args.sizes or DEFAULT_SIZES[intel_type]:
+                    if intel_type == "dscan":
+                        lines = generate_dscan(number_of_lines=size, seed=args.seed)
+                    elif intel_type == "fleetcomp":
+                        lines, _characters = generate_fleetcomp(
+                            number_of_pilots=size, seed=args.seed
+                        )
+                    else:
+                        lines, _characters = generate_chatlist(number_of_names=size)
+
+                    form_data = "\n".join(lines)
+
+                    for cold in (True, False) if intel_type != "dscan" else (True,):
+                        stub_esi.calls.clear()
+
+                        result = {
+                            "intel_type": intel_type,
+                            "size": size,
+                            "cold": cold,
+                            **measure(
+                                run=lambda: parse_intel(form_data=form_data),
+                                prepare=lambda: reset(
+                                    cold=cold
+                                ),  # pylint: disable=cell-var-from-loop
+                                repeat=args.repeat,
+                            ),
+                        }
+
+                        # The ESI calls of a single run
+                        result["esi_calls"] = sum(stub_esi.calls.values()) // (
+                            args.repeat + 1
+                        )
+                        results.append(result)
+
+                        print(
+                            f"{intel_type:<9} {size:>6,} lines "
+                            f"{'cold' if cold else 'warm'}: {result['ms']:>10,.2f} ms, "
+                            f"{result['peak_memory_kib']:>8,} KiB peak, "
+                            f"{result['queries']:>5} queries, "
+                            f"{result['esi_calls']:>4} ESI calls"
+                        )
+    finally:
+        connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
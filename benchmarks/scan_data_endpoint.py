@@ -0,0 +1,136 @@
+"""
+Benchmark for the scan data AJAX endpoint
+
+Reports the request latency of `get_scan_data` for the pilot list section of a
+1,000 pilot chat list, compared to decoding and encoding the same data again on
+every request (what a `JSONField` needs to do).
+"""
+
+# Standard Library
+import json
+import timeit
+
+# AA Intel Tool
+from benchmarks import setup_django
+
+NUMBER_OF_PILOTS = 1000
+NUMBER = 200
+REPEAT = 5
+
+
+def get_pilot_list(number_of_pilots: int = NUMBER_OF_PILOTS) -> list[dict]:
+    """
+    Build the pilot list section of a chat list with the given number of pilots
+
+    :param number_of_pilots: Number of pilots
+    :type number_of_pilots: int
+    :return: The pilot list section
+    :rtype: list[dict]
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # Alliance Auth
+    from allianceauth.eveonline.models import EveCharacter
+
+    # AA Intel Tool
+    from aa_intel_tool.parser.module.chatlist import _parse_character_info
+
+    return [
+        _parse_character_info(
+            eve_character=EveCharacter(
+                character_id=90000000 + pilot,
+                character_name=f"Pilot {pilot}",
+                corporation_id=98000000 + pilot % 50,
+                corporation_name=f"Corporation {pilot % 50}",
+                corporation_ticker=f"C{pilot % 50}",
+                alliance_id=99000000 + pilot % 10,
+                alliance_name=f"Alliance {pilot % 10}",
+                alliance_ticker=f"A{pilot % 10}",
+            )
+        )
+        for pilot in range(number_of_pilots)
+    ]
+
+
+def report(name: str, timings: list[float]) -> None:
+    """
+    Print the latency of the best run
+
+    :param name: Name of the measured code path
+    :type name: str
+    :param timings: Timings of all runs
+    :type timings: list[float]
+    :return: None
+    :rtype: None
+    """
+
+    best = min(timings) / NUMBER
+
+    print(f"{name}: {best * 1000:.3f} ms per request (best of {REPEAT})")
+
+
+def main() -> None:
+    """
+    Run the benchmark
+
+    :return: None
+    :rtype: None
+    """
+
+    setup_django()
+
+    # pylint: disable=import-outside-toplevel
+    # Django
+    from django.db import connection
+    from django.http import JsonResponse
+    from django.test import RequestFactory
+    from django.test.utils import setup_test_environment
+
+    # AA Intel Tool
+    from aa_intel_tool.models import Scan, ScanData
+    from aa_intel_tool.views.ajax import get_scan_data
+
+    setup_test_environment()
+    old_database_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        scan = Scan.objects.create(scan_type=Scan.Type.CHATLIST, raw_data="")
+        scan_data = ScanData.objects.create(
+            scan=scan,
+            section=ScanData.Section.PILOTLIST,
+            processed_data=get_pilot_list(),
+        )
+        request = RequestFactory().get("/")
+
+        print(
+            f"Pilot list with {NUMBER_OF_PILOTS:,} pilots: "
+            f"{len(scan_data.processed_data_json):,} bytes"
+        )
+
+        def decode_and_encode() -> JsonResponse:
+            processed_data_json = (
+                ScanData.objects.filter(scan=scan, section=ScanData.Section.PILOTLIST)
+                .values_list("processed_data_json", flat=True)
+                .get()
+            )
+
+            return JsonResponse(data=json.loads(processed_data_json), safe=False)
+
+        report(
+            name="Decode and encode",
+            timings=timeit.repeat(decode_and_encode, number=NUMBER, repeat=REPEAT),
+        )
+        report(
+            name="get_scan_data",
+            timings=timeit.repeat(
+                lambda: get_scan_data(request, scan.hash, ScanData.Section.PILOTLIST),
+                number=NUMBER,
+                repeat=REPEAT,
+            ),
+        )
+    finally:
+        connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()